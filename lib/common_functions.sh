@@ -165,6 +165,198 @@ create_json() {
     } > "$output_file"
 }
 
+# Version of the result schema written by the test scripts
+# (see scripts/utils/result_schema.py for the matching Python side)
+export RESULT_SCHEMA_VERSION=1
+
+# Function to escape a string for use inside a JSON string literal, printing
+# it or, without forking a subshell, storing it in the named variable
+# Usage: json_escape <string> [variable]
+json_escape() {
+    local s=$1
+    s=${s//\\/\\\\}
+    s=${s//\"/\\\"}
+    s=${s//$'\t'/\\t}
+    s=${s//$'\n'/\\n}
+    s=${s//$'\r'/\\r}
+    if [ -n "$2" ]; then
+        printf -v "$2" '%s' "$s"
+    else
+        printf '%s' "$s"
+    fi
+}
+
+# Function to register a result artifact in the run manifest
+# Usage: manifest_add <results_dir> <type> <phase> <file> [target]
+manifest_add() {
+    local results_dir=$1
+    local type=$2
+    local phase=$3
+    local file=$4
+    local target=${5:-}
+
+    # Entries written inside a suite step carry its name so --resume can drop them
+    local step=""
+    [ -n "${SUITE_STEP:-}" ] && step=", \"step\": \"$(json_escape "$SUITE_STEP")\""
+
+    # One JSON object per line; short appends keep parallel writers safe
+    printf '{"schema_version": %s, "type": "%s", "file": "%s", "host": "%s", "phase": "%s", "target": "%s", "timestamp": "%s"%s}\n' \
+        "$RESULT_SCHEMA_VERSION" "$(json_escape "$type")" "$(json_escape "$(basename "$file")")" \
+        "$(json_escape "$(hostname)")" "$(json_escape "$phase")" "$(json_escape "$target")" \
+        "$(date -u +%Y-%m-%dT%H:%M:%SZ)" "$step" >> "$results_dir/manifest.jsonl"
+}
+
+# Function to drop the manifest entries written by a suite step
+# Usage: manifest_prune <results_dir> <step>
+manifest_prune() {
+    local manifest="$1/manifest.jsonl"
+    [ -f "$manifest" ] || return 0
+
+    # Exact match on the trailing step field written by manifest_add; the name
+    # goes through the environment so awk doesn't interpret its backslashes
+    STEP_FIELD="\"step\": \"$(json_escape "$2")\"}" awk '
+        BEGIN { field = ENVIRON["STEP_FIELD"] }
+        substr($0, length($0) - length(field) + 1) != field
+    ' "$manifest" > "$manifest.tmp"
+    mv "$manifest.tmp" "$manifest"
+}
+
+# Function to print the SHA-256 checksum of a file ("-" for stdin)
+# Usage: file_sha256 <file>
+file_sha256() {
+    if command_exists sha256sum; then
+        sha256sum "$1" | cut -d' ' -f1
+    else
+        shasum -a 256 "$1" | cut -d' ' -f1
+    fi
+}
+
+# Function to fingerprint the inputs of a suite step
+# Usage: inputs_hash <description> [files...]
+inputs_hash() {
+    local description=$1
+    shift
+    { echo "$description"; cat "$@" 2>/dev/null; } | file_sha256 -
+}
+
+# Run journal: one line per completed suite step, so an interrupted run can be
+# resumed. Lines are only trusted when complete, so a torn write reads as "not done"
+# Usage: journal_record <results_dir> <step> <inputs_hash>
+journal_record() {
+    printf '{"step": "%s", "inputs": "%s", "status": "done", "timestamp": "%s"}\n' \
+        "$2" "$3" "$(date -u +%Y-%m-%dT%H:%M:%SZ)" >> "$1/run_journal.jsonl"
+}
+
+# Usage: journal_is_done <results_dir> <step> <inputs_hash>
+journal_is_done() {
+    [ -f "$1/run_journal.jsonl" ] || return 1
+    grep -q "^{\"step\": \"$2\", \"inputs\": \"$3\", \"status\": \"done\", \"timestamp\": \"[^\"]*\"}\$" \
+        "$1/run_journal.jsonl"
+}
+
+# Function to check a cached file against the checksum stored next to it
+# Usage: cache_is_valid <file>
+cache_is_valid() {
+    [ -f "$1" ] && [ -f "$1.sha256" ] && [ "$(file_sha256 "$1")" = "$(cat "$1.sha256")" ]
+}
+
+# Function to record the checksum of a file that was just written to the cache
+# Usage: cache_commit <file>
+cache_commit() {
+    file_sha256 "$1" > "$1.sha256.tmp" && mv "$1.sha256.tmp" "$1.sha256"
+}
+
+# Span tracing in Chrome trace-event format (chrome://tracing, ui.perfetto.dev)
+# Enabled when YABS_TRACE_FILE is set; every call is a no-op otherwise.
+# Spans nest per shell: trace_begin <name> [category] ... trace_end
+_TRACE_NAMES=()
+_TRACE_CATS=()
+_TRACE_STARTS=()
+_TRACE_CPU=()
+_TRACE_RCHAR=()
+_TRACE_READ=()
+
+# Set TRACE_NOW to the current time in microseconds (no fork on bash 5)
+_trace_now() {
+    if [ -n "$EPOCHREALTIME" ]; then
+        TRACE_NOW=${EPOCHREALTIME/[.,]/}
+    else
+        TRACE_NOW=$(( $(date +%s) * 1000000 ))
+    fi
+}
+
+# Set TRACE_CPU_MS, TRACE_RCHAR, TRACE_READ_BYTES and TRACE_RSS_KB for this
+# shell; CPU and I/O include reaped children, RSS is the shell's own
+_trace_usage() {
+    local pid=${BASHPID:-$$}
+    TRACE_CPU_MS=0 TRACE_RCHAR=0 TRACE_READ_BYTES=0 TRACE_RSS_KB=0
+    [ -r "/proc/$pid/stat" ] || return 0
+
+    local stat
+    read -r stat < "/proc/$pid/stat"
+    # Fields after the ")" of comm: utime stime cutime cstime are 12-15
+    local -a fields=(${stat##*) })
+    local ticks=$(( fields[11] + fields[12] + fields[13] + fields[14] ))
+    TRACE_CPU_MS=$(( ticks * 1000 / ${TRACE_CLK_TCK:-100} ))
+
+    local key value rest
+    while read -r key value rest; do
+        case $key in
+            rchar:) TRACE_RCHAR=$value ;;
+            read_bytes:) TRACE_READ_BYTES=$value ;;
+        esac
+    done < "/proc/$pid/io" 2>/dev/null
+    while read -r key value rest; do
+        [ "$key" = "VmRSS:" ] && TRACE_RSS_KB=$value && break
+    done < "/proc/$pid/status"
+}
+
+# Function to start a trace file (writes the opening bracket once)
+# Usage: trace_init <trace_file>
+trace_init() {
+    export YABS_TRACE_FILE=$1
+    export TRACE_CLK_TCK=${TRACE_CLK_TCK:-$(getconf CLK_TCK 2>/dev/null || echo 100)}
+    # The closing bracket is optional in the trace-event format, which lets
+    # every process append events without coordination
+    [ -s "$YABS_TRACE_FILE" ] || echo "[" > "$YABS_TRACE_FILE"
+}
+
+# Function to open a span
+# Usage: trace_begin <name> [category]
+trace_begin() {
+    [ -n "$YABS_TRACE_FILE" ] || return 0
+    _trace_usage
+    _trace_now
+    _TRACE_NAMES+=("$1")
+    _TRACE_CATS+=("${2:-suite}")
+    _TRACE_STARTS+=("$TRACE_NOW")
+    _TRACE_CPU+=("$TRACE_CPU_MS")
+    _TRACE_RCHAR+=("$TRACE_RCHAR")
+    _TRACE_READ+=("$TRACE_READ_BYTES")
+}
+
+# Function to close the innermost span and append it to the trace file
+trace_end() {
+    [ -n "$YABS_TRACE_FILE" ] || return 0
+    local top=$(( ${#_TRACE_NAMES[@]} - 1 ))
+    [ "$top" -ge 0 ] || return 0
+    _trace_now
+    _trace_usage
+    local pid=${BASHPID:-$$}
+    local span_name span_cat
+    json_escape "${_TRACE_NAMES[$top]}" span_name
+    json_escape "${_TRACE_CATS[$top]}" span_cat
+
+    printf '{"name": "%s", "cat": "%s", "ph": "X", "ts": %s, "dur": %s, "pid": %s, "tid": %s, "args": {"cpu_ms": %s, "rchar": %s, "read_bytes": %s, "rss_kb": %s}},\n' \
+        "$span_name" "$span_cat" "${_TRACE_STARTS[$top]}" \
+        "$(( TRACE_NOW - _TRACE_STARTS[top] ))" "$$" "$pid" \
+        "$(( TRACE_CPU_MS - _TRACE_CPU[top] ))" "$(( TRACE_RCHAR - _TRACE_RCHAR[top] ))" \
+        "$(( TRACE_READ_BYTES - _TRACE_READ[top] ))" "$TRACE_RSS_KB" >> "$YABS_TRACE_FILE"
+
+    unset "_TRACE_NAMES[$top]" "_TRACE_CATS[$top]" "_TRACE_STARTS[$top]"
+    unset "_TRACE_CPU[$top]" "_TRACE_RCHAR[$top]" "_TRACE_READ[$top]"
+}
+
 # Function to log messages
 log_message() {
     local log_file=$1
@@ -217,5 +409,7 @@ export -f print_color print_error print_success print_warning print_info
 export -f command_exists is_root get_os_type
 export -f get_timestamp get_short_timestamp ensure_dir
 export -f is_valid_ip is_valid_hostname check_network
-export -f format_bytes calculate_percentage create_json
-export -f log_message show_progress check_required_deps
\ No newline at end of file
+export -f format_bytes calculate_percentage create_json json_escape manifest_add manifest_prune
+export -f file_sha256 inputs_hash journal_record journal_is_done cache_is_valid cache_commit
+export -f log_message show_progress check_required_deps
+export -f _trace_now _trace_usage trace_init trace_begin trace_end
\ No newline at end of file
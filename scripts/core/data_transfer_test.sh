@@ -147,10 +147,24 @@ fi
 create_test_file() {
     local size=$1
     local test_file="$OUTPUT_DIR/test_file_${TIMESTAMP}.dat"
-    
-    echo "Creating test file of size $size..."
+
+    # Random payloads are kept in the suite cache and reused while their checksum matches
+    if [ -n "$YABS_CACHE_DIR" ]; then
+        test_file="$YABS_CACHE_DIR/payloads/test_file_${size}.dat"
+        if cache_is_valid "$test_file"; then
+            echo "Using cached test file: $test_file" >&2
+            echo "$test_file"
+            return 0
+        fi
+        mkdir -p "$YABS_CACHE_DIR/payloads"
+        rm -f "$test_file.sha256"
+    fi
+
+    # Progress goes to stderr; stdout is the file path for the caller
+    echo "Creating test file of size $size..." >&2
     
     # Use dd to create a file with random data
+    trace_begin "transfer.create_test_file" "setup"
     if [[ "$OSTYPE" == "darwin"* ]]; then
         # macOS
         dd if=/dev/urandom of="$test_file" bs=1048576 count=$(echo "$size" | sed 's/[^0-9]*//g') 2>/dev/null
@@ -158,12 +172,14 @@ create_test_file() {
         # Linux
         dd if=/dev/urandom of="$test_file" bs=1M count=$(echo "$size" | sed 's/[^0-9]*//g') 2>/dev/null
     fi
+    trace_end
     
     if [ -f "$test_file" ]; then
-        echo "Test file created: $test_file"
+        [ -n "$YABS_CACHE_DIR" ] && cache_commit "$test_file"
+        echo "Test file created: $test_file" >&2
         echo "$test_file"
     else
-        echo "Error: Failed to create test file"
+        echo "Error: Failed to create test file" >&2
         return 1
     fi
 }
@@ -179,7 +195,9 @@ calculate_speed() {
     fi
     
     # Calculate MB/s
+    trace_begin "transfer.calculate_speed" "parse"
     local mbps=$(echo "scale=2; $bytes / 1048576 / $seconds" | bc 2>/dev/null || echo "0")
+    trace_end
     echo "$mbps"
 }
 
@@ -197,7 +215,8 @@ run_scp_test() {
         if [ $? -ne 0 ]; then
             return 1
         fi
-        CLEANUP_FILE=true
+        # Cached payloads stay for the next run
+        [[ -n "$YABS_CACHE_DIR" && "$LOCAL_FILE" == "$YABS_CACHE_DIR"/* ]] && CLEANUP_FILE=false || CLEANUP_FILE=true
     else
         CLEANUP_FILE=false
     fi
@@ -208,6 +227,7 @@ run_scp_test() {
     # Run SCP with timing
     echo "Uploading file..."
     local start_time=$(date +%s.%N)
+    trace_begin "transfer.scp" "measure"
     
     if [ "$USE_PARALLEL" = true ] && command -v pscp >/dev/null 2>&1; then
         # Use parallel SCP if available
@@ -218,6 +238,7 @@ run_scp_test() {
     fi
     
     local scp_result=$?
+    trace_end
     local end_time=$(date +%s.%N)
     local duration=$(echo "$end_time - $start_time" | bc)
     
@@ -227,6 +248,8 @@ run_scp_test() {
         # Create JSON output
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "scp",
     "timestamp": "$TIMESTAMP",
     "remote_host": "$REMOTE_HOST",
@@ -238,6 +261,7 @@ run_scp_test() {
     "status": "success"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$REMOTE_HOST"
         
         echo ""
         echo -e "${GREEN}✓ SCP upload completed successfully${NC}"
@@ -259,12 +283,15 @@ EOF
         echo "SCP transfer failed. Check $output_file for details."
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "scp",
     "timestamp": "$TIMESTAMP",
     "remote_host": "$REMOTE_HOST",
     "status": "failed"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$REMOTE_HOST"
     fi
     
     # Cleanup test file if we created it
@@ -293,7 +320,8 @@ run_rsync_test() {
         if [ $? -ne 0 ]; then
             return 1
         fi
-        CLEANUP_FILE=true
+        # Cached payloads stay for the next run
+        [[ -n "$YABS_CACHE_DIR" && "$LOCAL_FILE" == "$YABS_CACHE_DIR"/* ]] && CLEANUP_FILE=false || CLEANUP_FILE=true
     else
         CLEANUP_FILE=false
     fi
@@ -304,6 +332,7 @@ run_rsync_test() {
     # Run rsync with timing and progress
     echo "Synchronizing file..."
     local start_time=$(date +%s.%N)
+    trace_begin "transfer.rsync" "measure"
     
     if [ "$USE_PARALLEL" = true ]; then
         # Use parallel rsync transfers
@@ -317,6 +346,7 @@ run_rsync_test() {
     fi
     
     local rsync_result=$?
+    trace_end
     local end_time=$(date +%s.%N)
     local duration=$(echo "$end_time - $start_time" | bc)
     
@@ -329,6 +359,8 @@ run_rsync_test() {
         # Create JSON output
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "rsync",
     "timestamp": "$TIMESTAMP",
     "remote_host": "$REMOTE_HOST",
@@ -341,6 +373,7 @@ run_rsync_test() {
     "status": "success"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$REMOTE_HOST"
         
         echo ""
         echo -e "${GREEN}✓ rsync completed successfully${NC}"
@@ -363,12 +396,15 @@ EOF
         echo "rsync transfer failed. Check $output_file for details."
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "rsync",
     "timestamp": "$TIMESTAMP",
     "remote_host": "$REMOTE_HOST",
     "status": "failed"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$REMOTE_HOST"
     fi
     
     # Cleanup test file if we created it
@@ -395,6 +431,7 @@ run_wget_test() {
     
     # Run wget with timing
     local start_time=$(date +%s.%N)
+    trace_begin "transfer.wget" "measure"
     
     if [ "$USE_PARALLEL" = true ] && command -v aria2c >/dev/null 2>&1; then
         # Use aria2c for parallel downloads
@@ -407,6 +444,7 @@ run_wget_test() {
         local wget_result=$?
     fi
     
+    trace_end
     local end_time=$(date +%s.%N)
     local duration=$(echo "$end_time - $start_time" | bc)
     
@@ -417,6 +455,8 @@ run_wget_test() {
         # Create JSON output
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "wget",
     "timestamp": "$TIMESTAMP",
     "url": "$url",
@@ -427,6 +467,7 @@ run_wget_test() {
     "status": "success"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$url"
         
         echo ""
         echo -e "${GREEN}✓ wget download completed successfully${NC}"
@@ -451,12 +492,15 @@ EOF
         echo "wget download failed. Check $output_file for details."
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "wget",
     "timestamp": "$TIMESTAMP",
     "url": "$url",
     "status": "failed"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$url"
     fi
 }
 
@@ -478,6 +522,7 @@ run_curl_test() {
     
     # Run curl with timing and progress
     local start_time=$(date +%s.%N)
+    trace_begin "transfer.curl" "measure"
     
     # curl with detailed timing information
     curl -L --progress-bar -o "$download_file" -w "@-" "$url" <<'EOF' 2>&1 | tee "$output_file"
@@ -494,6 +539,7 @@ Speed: %{speed_download} bytes/sec
 EOF
     
     local curl_result=$?
+    trace_end
     local end_time=$(date +%s.%N)
     local duration=$(echo "$end_time - $start_time" | bc)
     
@@ -508,6 +554,8 @@ EOF
         # Create JSON output
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "curl",
     "timestamp": "$TIMESTAMP",
     "url": "$url",
@@ -518,6 +566,7 @@ EOF
     "status": "success"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$url"
         
         echo ""
         echo -e "${GREEN}✓ curl download completed successfully${NC}"
@@ -542,12 +591,15 @@ EOF
         echo "curl download failed. Check $output_file for details."
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
+    "host": "$(hostname)",
     "test_type": "curl",
     "timestamp": "$TIMESTAMP",
     "url": "$url",
     "status": "failed"
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "transfer" "$PRE_POST" "$json_file" "$url"
     fi
 }
 
@@ -154,7 +154,9 @@ test_dns_with_dig() {
     
     # JSON array start
     echo "{" > "$json_file"
+    echo "  \"schema_version\": $RESULT_SCHEMA_VERSION," >> "$json_file"
     echo "  \"test_type\": \"dns_dig\"," >> "$json_file"
+    echo "  \"host\": \"$(hostname)\"," >> "$json_file"
     echo "  \"timestamp\": \"$TIMESTAMP\"," >> "$json_file"
     echo "  \"dns_server\": \"$server\"," >> "$json_file"
     echo "  \"query_type\": \"$QUERY_TYPE\"," >> "$json_file"
@@ -171,8 +173,12 @@ test_dns_with_dig() {
         
         for i in $(seq 1 $QUERY_COUNT); do
             # Run dig and capture output
+            trace_begin "dns.dig_query" "measure"
             local dig_output=$(dig +time=$TIMEOUT +tries=1 +stats @"$server" "$domain" "$QUERY_TYPE" 2>&1)
+            trace_end
+            trace_begin "dns.dig_parse" "parse"
             local query_time=$(echo "$dig_output" | grep "Query time:" | awk '{print $4}')
+            trace_end
             
             if [ ! -z "$query_time" ] && [ "$query_time" -ne 0 ]; then
                 # Successful query
@@ -249,6 +255,7 @@ test_dns_with_dig() {
         echo "    \"max_response_time_ms\": $max_time" >> "$json_file"
         echo "  }" >> "$json_file"
         echo "}" >> "$json_file"
+        manifest_add "$OUTPUT_DIR" "dns_dig" "$PRE_POST" "$json_file" "$server"
         
         # Calculate success rate
         local success_rate=$(echo "scale=2; $successful_queries * 100 / $total_queries" | bc)
@@ -341,7 +348,9 @@ test_dns_with_dnsperf() {
         # Create JSON output
         cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
     "test_type": "dnsperf",
+    "host": "$(hostname)",
     "timestamp": "$TIMESTAMP",
     "dns_server": "$server",
     "query_type": "$QUERY_TYPE",
@@ -353,6 +362,7 @@ test_dns_with_dnsperf() {
     "max_latency_ms": $max_latency
 }
 EOF
+        manifest_add "$OUTPUT_DIR" "dnsperf" "$PRE_POST" "$json_file" "$server"
         
         echo ""
         echo "DNSPerf Test Summary:"
@@ -1,7 +1,8 @@
 #!/bin/bash
 
 # Network Performance Test Script
-# Tests: ping, traceroute, iperf3 (with reverse and parallel options)
+# Tests: ping, traceroute, iperf3 (with reverse and parallel options),
+#        loopback network-stack benchmark (no remote host needed)
 # Part of the comprehensive performance testing suite
 
 SCRIPT_VERSION="v2.0.0"
@@ -31,6 +32,8 @@ TRACEROUTE_HOPS=${TRACE_HOPS:-$DEFAULT_TRACEROUTE_HOPS}
 IPERF_DURATION=${IPERF_TIME:-$DEFAULT_IPERF_DURATION}
 IPERF_REVERSE=${IPERF_REVERSE:-false}
 IPERF_PARALLEL=${IPERF_PARALLEL:-1}
+LOOPBACK_TIME=${LOOPBACK_TIME:-2}
+LOOPBACK_NETNS=${LOOPBACK_NETNS:-false}
 PRE_POST=""
 
 # Function to display usage
@@ -38,7 +41,7 @@ usage() {
     echo "Usage: $0 -t <test_type> -d <destination> [-s <iperf_server>] [options]"
     echo ""
     echo "Options:"
-    echo "  -t <test_type>       Test type: ping, traceroute, iperf, or all"
+    echo "  -t <test_type>       Test type: ping, traceroute, iperf, loopback, or all"
     echo "  -d <destination>     Destination IP or hostname for ping/traceroute"
     echo "  -s <iperf_server>    iPerf server IP (required for iperf test)"
     echo "  -c <ping_count>      Number of ping packets (default: 100)"
@@ -47,22 +50,27 @@ usage() {
     echo "  -p <pre|post>        Test phase: pre or post (for result naming)"
     echo "  -R                   Run iPerf in reverse mode (server sends)"
     echo "  -P <streams>         Number of parallel iPerf streams (default: 1)"
+    echo "  -l <seconds>         Seconds per loopback benchmark test (default: 2)"
+    echo "  -n                   Run the loopback benchmark between network namespaces (root)"
     echo "  -h                   Display this help message"
     echo ""
     echo "Examples:"
     echo "  $0 -t all -d 8.8.8.8 -s 192.168.1.100 -p pre"
     echo "  $0 -t ping -d google.com -c 50 -p post"
     echo "  $0 -t iperf -s 10.0.0.1 -i 30 -R -P 4"
+    echo "  $0 -t loopback -n -p pre"
     echo ""
     echo "Environment variables:"
     echo "  IPERF_REVERSE        Set to 'true' for reverse mode"
     echo "  IPERF_PARALLEL       Number of parallel streams"
     echo "  IPERF_TIME          Test duration (overrides -i)"
+    echo "  LOOPBACK_TIME        Seconds per loopback benchmark test"
+    echo "  LOOPBACK_NETNS       Set to 'true' to use network namespaces"
     exit 1
 }
 
 # Parse command line arguments
-while getopts "t:d:s:c:m:i:p:P:Rh" opt; do
+while getopts "t:d:s:c:m:i:p:P:l:nRh" opt; do
     case ${opt} in
         t )
             TEST_TYPE=$OPTARG
@@ -91,6 +99,12 @@ while getopts "t:d:s:c:m:i:p:P:Rh" opt; do
         P )
             IPERF_PARALLEL=$OPTARG
             ;;
+        l )
+            LOOPBACK_TIME=$OPTARG
+            ;;
+        n )
+            LOOPBACK_NETNS=true
+            ;;
         h )
             usage
             ;;
@@ -140,15 +154,19 @@ run_ping_test() {
     echo "Output will be saved to: $output_file"
     
     # Run ping and save raw output
+    trace_begin "network.ping" "measure"
     ping -c $PING_COUNT "$dest" > "$output_file" 2>&1
+    trace_end
     
     # Parse results and create JSON
     if [ -f "$output_file" ]; then
         # Extract statistics
+        trace_begin "network.ping_parse" "parse"
         local transmitted=$(grep "packets transmitted" "$output_file" | awk '{print $1}')
         local received=$(grep "packets transmitted" "$output_file" | awk '{print $4}')
         local loss=$(grep "packets transmitted" "$output_file" | awk -F'[,%]' '{print $3}' | tr -d ' ')
         local min_avg_max=$(grep "min/avg/max" "$output_file" | awk -F'=' '{print $2}' | tr -d ' ms')
+        trace_end
         
         if [ ! -z "$min_avg_max" ]; then
             IFS='/' read -r min avg max stddev <<< "$min_avg_max"
@@ -156,7 +174,9 @@ run_ping_test() {
             # Create JSON output
             cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
     "test_type": "ping",
+    "host": "$(hostname)",
     "destination": "$dest",
     "timestamp": "$(date -u +%Y-%m-%dT%H:%M:%SZ)",
     "packets_transmitted": $transmitted,
@@ -170,6 +190,7 @@ run_ping_test() {
     "output_file": "$output_file"
 }
 EOF
+            manifest_add "$OUTPUT_DIR" "ping" "$PRE_POST" "$json_file" "$dest"
             echo ""
             echo -e "${GREEN}✓ Ping test completed${NC}"
             echo ""
@@ -199,20 +220,25 @@ run_traceroute_test() {
     echo "Output will be saved to: $output_file"
     
     # Check if traceroute is available, otherwise use tracepath
+    trace_begin "network.traceroute" "measure"
     if command -v traceroute >/dev/null 2>&1; then
         traceroute -m $TRACEROUTE_HOPS "$dest" > "$output_file" 2>&1
     elif command -v tracepath >/dev/null 2>&1; then
         tracepath -m $TRACEROUTE_HOPS "$dest" > "$output_file" 2>&1
     else
+        trace_end
         echo "Error: Neither traceroute nor tracepath found"
         return 1
     fi
+    trace_end
     
     # Create basic JSON output
     local hop_count=$(grep -E "^[[:space:]]*[0-9]+" "$output_file" | wc -l)
     cat > "$json_file" <<EOF
 {
+    "schema_version": $RESULT_SCHEMA_VERSION,
     "test_type": "traceroute",
+    "host": "$(hostname)",
     "destination": "$dest",
     "timestamp": "$(date -u +%Y-%m-%dT%H:%M:%SZ)",
     "max_hops": $TRACEROUTE_HOPS,
@@ -220,6 +246,7 @@ run_traceroute_test() {
     "output_file": "$output_file"
 }
 EOF
+    manifest_add "$OUTPUT_DIR" "traceroute" "$PRE_POST" "$json_file" "$dest"
 
     echo "Traceroute test completed. Results saved to $output_file and $json_file"
 }
@@ -248,10 +275,14 @@ run_iperf_test() {
     [ "$IPERF_PARALLEL" -gt 1 ] && iperf_cmd="$iperf_cmd -P $IPERF_PARALLEL"
     
     # Run iperf3 TCP test with JSON output
+    trace_begin "network.iperf_tcp" "measure"
     eval "$iperf_cmd" > "$json_file" 2>"$output_file"
+    trace_end
     
     # Extract summary from JSON if successful
     if [ -s "$json_file" ] && grep -q "bits_per_second" "$json_file"; then
+        manifest_add "$OUTPUT_DIR" "iperf_tcp" "$PRE_POST" "$json_file" "$server"
+
         # Extract key metrics using basic tools
         local bitrate=$(grep -o '"bits_per_second"[[:space:]]*:[[:space:]]*[0-9.]*' "$json_file" | tail -1 | awk -F':' '{print $2}' | tr -d ' ')
         local bitrate_mbps=$(echo "scale=2; $bitrate / 1000000" | bc 2>/dev/null || echo "N/A")
@@ -296,10 +327,14 @@ run_iperf_udp_test() {
     [ "$IPERF_PARALLEL" -gt 1 ] && iperf_cmd="$iperf_cmd -P $IPERF_PARALLEL"
     
     # Run iperf3 UDP test with JSON output
+    trace_begin "network.iperf_udp" "measure"
     eval "$iperf_cmd" > "$json_file" 2>"$output_file"
+    trace_end
     
     # Extract UDP-specific metrics from JSON if successful
     if [ -s "$json_file" ] && grep -q "bits_per_second" "$json_file"; then
+        manifest_add "$OUTPUT_DIR" "iperf_udp" "$PRE_POST" "$json_file" "$server"
+
         # Extract jitter and packet loss using jq if available
         if command -v jq >/dev/null 2>&1; then
             local jitter=$(jq -r '.end.sum.jitter_ms' "$json_file" 2>/dev/null || echo "N/A")
@@ -338,6 +373,33 @@ run_iperf_udp_test() {
     fi
 }
 
+# Function to benchmark the local network stack (no remote host needed)
+run_loopback_test() {
+    local json_file="${OUTPUT_DIR}/${FILE_PREFIX}loopback_${TIMESTAMP}.json"
+    local bench_args="-t $LOOPBACK_TIME -o $json_file"
+    [ "$LOOPBACK_NETNS" = true ] && bench_args="$bench_args -n"
+
+    echo "Running loopback network-stack benchmark (${LOOPBACK_TIME}s per test)..."
+    [ "$LOOPBACK_NETNS" = true ] && echo "Mode: network namespaces over veth"
+
+    if ! command -v python3 >/dev/null 2>&1; then
+        echo "Error: python3 not found. The loopback benchmark requires Python 3."
+        return 1
+    fi
+
+    trace_begin "network.loopback" "measure"
+    python3 "$PROJECT_ROOT/scripts/utils/loopback_benchmark.py" $bench_args
+    local status=$?
+    trace_end
+
+    if [ $status -eq 0 ] && [ -s "$json_file" ]; then
+        manifest_add "$OUTPUT_DIR" "loopback" "$PRE_POST" "$json_file"
+        echo -e "${GREEN}✓ Loopback benchmark completed${NC}"
+    else
+        echo "Warning: Loopback benchmark failed."
+    fi
+}
+
 # Main execution
 echo "Starting network performance tests..."
 echo "Test type: $TEST_TYPE"
@@ -354,6 +416,9 @@ case $TEST_TYPE in
     "iperf")
         run_iperf_test "$IPERF_SERVER"
         ;;
+    "loopback")
+        run_loopback_test
+        ;;
     "all")
         run_ping_test "$DESTINATION"
         echo ""
@@ -362,6 +427,8 @@ case $TEST_TYPE in
         if [ ! -z "$IPERF_SERVER" ]; then
             run_iperf_test "$IPERF_SERVER"
         fi
+        echo ""
+        run_loopback_test
         ;;
     *)
         echo "Error: Invalid test type: $TEST_TYPE"
@@ -24,11 +24,13 @@ RUN_YABS=true
 RUN_NETWORK=true
 RUN_DNS=true
 RUN_TRANSFER=true
+RUN_CPUMEM=true
 USE_WORKTREE=false
 WORKTREE_NAME=""
 CONFIG_FILE=""
 PARALLEL_EXECUTION=false
 RESULTS_DIR=""  # Will be set after parsing arguments
+RESULTS_DIR_ARG=""  # --results-dir
 
 # Test configuration defaults
 DESTINATION_IP="8.8.8.8"
@@ -46,8 +48,16 @@ DOWNLOAD_FILE=""
 PING_COUNT=20
 TRACE_HOPS=30
 DNS_QUERIES=20
+LOOPBACK_TIME=2
+LOOPBACK_NETNS=false
 QUICK_MODE=false
 VERBOSE=false
+GATE_MODE=false
+TRACE_ENABLED=false
+RESUME=false
+YABS_CACHE_DIR="${YABS_CACHE_DIR:-$PROJECT_ROOT/results/.cache}"
+GATE_BUDGETS="$PROJECT_ROOT/configs/gate_budgets_template.conf"
+GATE_MIN_SAMPLES=8
 
 # Function to display usage
 usage() {
@@ -63,9 +73,10 @@ BASIC OPTIONS:
 
 TEST SELECTION:
   -Y                   Skip YABS benchmark
-  -N                   Skip network tests (ping, traceroute, iperf)
+  -N                   Skip network tests (ping, traceroute, iperf, loopback)
   -D                   Skip DNS tests
   -T                   Skip data transfer tests
+  -C                   Skip offline CPU/memory benchmark
 
 NETWORK TEST OPTIONS:
   --server <ip>        iPerf3 server IP address
@@ -74,6 +85,8 @@ NETWORK TEST OPTIONS:
   --time <seconds>     iPerf3 test duration (default: 10)
   --ping-count <n>     Number of ping packets (default: 20)
   --trace-hops <n>     Max traceroute hops (default: 30)
+  --netns              Run the loopback benchmark between network namespaces
+                       instead of over lo (requires root)
 
 DNS TEST OPTIONS:
   --dns <server>       DNS server to test (default: 8.8.8.8)
@@ -89,12 +102,25 @@ FILE TRANSFER OPTIONS:
 EXECUTION OPTIONS:
   -P                   Run tests in parallel (requires GNU parallel)
   -w <worktree>        Use git worktree for isolated execution
+  --trace              Record a Chrome trace of the run (trace.json in results)
+  --resume             Continue the latest unfinished run of this phase, skipping
+                       tests that completed with unchanged parameters
+  --no-cache           Download binaries and test payloads again instead of
+                       reusing the verified copies in results/.cache
+  --results-dir <dir>  Write results to <dir> instead of a new timestamped
+                       directory (used by scripts/utils/fleet_controller.py)
+
+REGRESSION GATE:
+  --gate               Check the latest pre/post results against budgets
+                       (exit 0 pass, 1 regression, 2 error, 3 no data)
+  --budgets <file>     Budget file (default: configs/gate_budgets_template.conf)
 
 QUICK COMMANDS:
   $0 --quick           Run quick test with defaults
   $0 --full            Run full test suite
   $0 --network-only    Run only network tests
   $0 --compare         Compare pre/post results
+  $0 --gate            Fail on regressions beyond the budgets
 
 EXAMPLES:
   # Quick test with custom iPerf server
@@ -119,6 +145,8 @@ CONFIG FILE FORMAT:
   REMOTE_HOST=server.example.com
   REMOTE_USER=username
   DOWNLOAD_URL=http://example.com/testfile.zip
+  GATE_BUDGETS=configs/gate_budgets_template.conf
+  GATE_MIN_SAMPLES=8
 
 EOF
     exit 0
@@ -167,6 +195,28 @@ load_config() {
     fi
 }
 
+# Function to gate the latest pre/post results on the configured budgets
+run_regression_gate() {
+    local pre_dir=$(ls -dt "$PROJECT_ROOT"/results/pre_* 2>/dev/null | head -1)
+    local post_dir=$(ls -dt "$PROJECT_ROOT"/results/post_* 2>/dev/null | head -1)
+
+    if [ -z "$pre_dir" ] || [ -z "$post_dir" ]; then
+        print_error "Need both pre and post results to run the regression gate"
+        return 2
+    fi
+    if [ ! -f "$GATE_BUDGETS" ]; then
+        print_error "Budget file not found: $GATE_BUDGETS"
+        return 2
+    fi
+
+    print_color "$BLUE" "Regression gate: $(basename "$pre_dir") → $(basename "$post_dir")"
+    python3 "$PROJECT_ROOT/scripts/utils/regression_gate.py" "$pre_dir" "$post_dir" \
+        -b "$GATE_BUDGETS" \
+        -m "$GATE_MIN_SAMPLES" \
+        -j "$post_dir/regression_gate.json" \
+        -x "$post_dir/regression_gate.xml"
+}
+
 # Parse command line arguments
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -203,12 +253,17 @@ while [[ $# -gt 0 ]]; do
             RUN_TRANSFER=false
             shift
             ;;
+        -C)
+            RUN_CPUMEM=false
+            shift
+            ;;
         -q)
             QUICK_MODE=true
             PING_COUNT=10
             TRACE_HOPS=15
             DNS_QUERIES=10
             IPERF_TIME=5
+            LOOPBACK_TIME=1
             # Use smaller download file for quick mode
             DOWNLOAD_URL="http://speedtest.tele2.net/1MB.zip"
             shift
@@ -278,6 +333,7 @@ while [[ $# -gt 0 ]]; do
             TRACE_HOPS=15
             DNS_QUERIES=10
             IPERF_TIME=5
+            LOOPBACK_TIME=1
             shift
             ;;
         --full)
@@ -291,12 +347,41 @@ while [[ $# -gt 0 ]]; do
             RUN_YABS=false
             RUN_DNS=false
             RUN_TRANSFER=false
+            RUN_CPUMEM=false
             shift
             ;;
         --compare)
             compare_results
             exit 0
             ;;
+        --gate)
+            GATE_MODE=true
+            shift
+            ;;
+        --trace)
+            TRACE_ENABLED=true
+            shift
+            ;;
+        --netns)
+            LOOPBACK_NETNS=true
+            shift
+            ;;
+        --resume)
+            RESUME=true
+            shift
+            ;;
+        --no-cache)
+            YABS_CACHE_DIR=""
+            shift
+            ;;
+        --results-dir)
+            RESULTS_DIR_ARG="$2"
+            shift 2
+            ;;
+        --budgets)
+            GATE_BUDGETS="$2"
+            shift 2
+            ;;
         --create-config)
             create_default_config
             exit 0
@@ -313,22 +398,56 @@ if [ ! -z "$CONFIG_FILE" ]; then
     load_config "$CONFIG_FILE"
 fi
 
+# Gate mode only evaluates existing results
+if [ "$GATE_MODE" = true ]; then
+    run_regression_gate
+    exit $?
+fi
+
 # Validate test phase
 if [[ "$TEST_PHASE" != "pre" && "$TEST_PHASE" != "post" ]]; then
     echo "Error: Invalid test phase. Must be 'pre' or 'post'."
     exit 1
 fi
 
-# Set results directory with test phase
-RESULTS_DIR="$PROJECT_ROOT/results/${TEST_PHASE}_${TIMESTAMP}-Extended-Test-Suite-Results"
+# Set results directory with test phase (only --results-dir overrides it,
+# not a RESULTS_DIR from the environment or the config file)
+RESULTS_DIR=""
+if [ -n "$RESULTS_DIR_ARG" ]; then
+    mkdir -p "$RESULTS_DIR_ARG" && RESULTS_DIR="$(cd "$RESULTS_DIR_ARG" && pwd)"
+elif [ "$RESUME" = true ]; then
+    # Resume the latest run of this phase unless it already finished
+    last_dir=$(ls -dt "$PROJECT_ROOT"/results/${TEST_PHASE}_*-Extended-Test-Suite-Results 2>/dev/null | head -1)
+    if [ -z "$last_dir" ]; then
+        echo "No previous $TEST_PHASE run found, starting a new one"
+        RESUME=false
+    elif journal_is_done "$last_dir" suite complete; then
+        echo "Previous $TEST_PHASE run completed, starting a new one"
+        RESUME=false
+    else
+        RESULTS_DIR="$last_dir"
+        echo "Resuming run: $RESULTS_DIR"
+    fi
+fi
+[ -z "$RESULTS_DIR" ] && RESULTS_DIR="$PROJECT_ROOT/results/${TEST_PHASE}_${TIMESTAMP}-Extended-Test-Suite-Results"
 
 # Create results directory
 mkdir -p "$RESULTS_DIR"
 
+# Spans from this script, the test scripts, yabs.sh and the Python tools all
+# go to one trace file (open it in chrome://tracing or ui.perfetto.dev)
+if [ "$TRACE_ENABLED" = true ]; then
+    trace_init "$RESULTS_DIR/trace.json"
+fi
+
 # Export variables for child scripts
 export TEST_PHASE DESTINATION_IP IPERF_SERVER DNS_SERVER REMOTE_HOST REMOTE_USER REMOTE_PATH
 export DOWNLOAD_URL UPLOAD_FILE DOWNLOAD_FILE PING_COUNT TRACE_HOPS DNS_QUERIES
 export IPERF_TIME IPERF_PARALLEL IPERF_REVERSE VERBOSE RESULTS_DIR
+export LOOPBACK_TIME LOOPBACK_NETNS RESUME YABS_CACHE_DIR
+# Steps run by GNU parallel (-P) compute step_inputs in a child shell, which
+# must hash the same parameters and scripts as the parent's resume_prepare
+export QUICK_MODE PROJECT_ROOT SCRIPT_DIR
 
 # Function to check dependencies
 check_dependencies() {
@@ -350,10 +469,87 @@ check_dependencies() {
     fi
 }
 
+# Function to fingerprint everything a suite step's results depend on
+# (its parameters and scripts), so --resume reruns steps whose inputs changed
+step_inputs() {
+    local core="$PROJECT_ROOT/scripts/core"
+    case $1 in
+        yabs)
+            inputs_hash "yabs $QUICK_MODE $DESTINATION_IP $DNS_SERVER $IPERF_SERVER" \
+                "$PROJECT_ROOT/yabs_extended.sh" "$PROJECT_ROOT/yabs.sh" ;;
+        cpu_memory)
+            inputs_hash "cpu_memory $QUICK_MODE" "$PROJECT_ROOT/scripts/utils/cpu_memory_benchmark.py" ;;
+        network.ping)
+            inputs_hash "ping $DESTINATION_IP $PING_COUNT" "$core/network_performance_test.sh" ;;
+        network.traceroute)
+            inputs_hash "traceroute $DESTINATION_IP $TRACE_HOPS" "$core/network_performance_test.sh" ;;
+        network.iperf)
+            inputs_hash "iperf $IPERF_SERVER $IPERF_TIME $IPERF_PARALLEL $IPERF_REVERSE" \
+                "$core/network_performance_test.sh" ;;
+        network.loopback)
+            inputs_hash "loopback $LOOPBACK_TIME $LOOPBACK_NETNS" "$core/network_performance_test.sh" \
+                "$PROJECT_ROOT/scripts/utils/loopback_benchmark.py" ;;
+        dns)
+            inputs_hash "dns $DNS_SERVER $DNS_QUERIES" "$core/dns_performance_test.sh" ;;
+        transfer)
+            inputs_hash "transfer $DOWNLOAD_URL $UPLOAD_FILE $REMOTE_HOST $REMOTE_USER $REMOTE_PATH" \
+                "$core/data_transfer_test.sh" ;;
+    esac
+}
+
+# Function to run a suite step, recording it in the run journal once it succeeds
+# Usage: run_step <step> <command> [args...]
+run_step() {
+    local step=$1
+    shift
+    local inputs=$(step_inputs "$step")
+
+    if [ "$RESUME" = true ] && journal_is_done "$RESULTS_DIR" "$step" "$inputs"; then
+        echo -e "\n${GREEN}✓ $step already completed (resumed)${NC}"
+        return 0
+    fi
+
+    SUITE_STEP="$step" STEP_INPUTS="$inputs" "$@" || return $?
+    journal_record "$RESULTS_DIR" "$step" "$inputs"
+}
+
+# Function to drop the manifest entries of steps that will run again, so an
+# interrupted attempt does not leave duplicate or partial entries behind
+resume_prepare() {
+    local step
+    for step in yabs cpu_memory network.ping network.traceroute network.iperf network.loopback dns transfer; do
+        journal_is_done "$RESULTS_DIR" "$step" "$(step_inputs "$step")" || manifest_prune "$RESULTS_DIR" "$step"
+    done
+}
+
+# Function to list the selected steps that did not complete, judged by the run
+# journal so steps run by GNU parallel (-P) are covered too
+failed_steps() {
+    local steps=()
+    local step
+    [ "$RUN_YABS" = true ] && steps+=(yabs)
+    [ "$RUN_CPUMEM" = true ] && steps+=(cpu_memory)
+    if [ "$RUN_NETWORK" = true ]; then
+        steps+=(network.ping network.traceroute)
+        [ ! -z "$IPERF_SERVER" ] && steps+=(network.iperf)
+        steps+=(network.loopback)
+    fi
+    [ "$RUN_DNS" = true ] && steps+=(dns)
+    [ "$RUN_TRANSFER" = true ] && steps+=(transfer)
+
+    for step in "${steps[@]}"; do
+        journal_is_done "$RESULTS_DIR" "$step" "$(step_inputs "$step")" || echo "$step"
+    done
+}
+
 # Function to run YABS benchmark
 run_yabs_test() {
     echo -e "\n${BLUE}=== Running YABS Benchmark ===${NC}"
     local yabs_output="$RESULTS_DIR/yabs_${TEST_PHASE}_results.txt"
+
+    # yabs.sh saves each finished fio/iperf/Geekbench test here, so a resumed
+    # run only repeats the tests that were interrupted
+    export YABS_CHECKPOINT_DIR="$RESULTS_DIR/.checkpoints/yabs_${STEP_INPUTS:0:12}"
     
     # Detect macOS and use appropriate script
     if [[ "$(uname)" == "Darwin" ]]; then
@@ -365,10 +561,12 @@ run_yabs_test() {
             yabs_args="-p $TEST_PHASE"
             [ "$QUICK_MODE" = true ] && yabs_args="$yabs_args -I"
             bash "${PROJECT_ROOT}/yabs_extended.sh" $yabs_args | tee "$yabs_output"
+            [ "${PIPESTATUS[0]}" -eq 0 ] || return 1
         else
             echo "Error: yabs_extended.sh not found"
             return 1
         fi
+        manifest_add "$RESULTS_DIR" "yabs" "$TEST_PHASE" "$yabs_output"
     else
         # Run YABS Extended on Linux
         if [ -f "${PROJECT_ROOT}/yabs_extended.sh" ]; then
@@ -379,13 +577,37 @@ run_yabs_test() {
             yabs_args="-p $TEST_PHASE"
             [ "$QUICK_MODE" = true ] && yabs_args="$yabs_args -I"
             bash "${PROJECT_ROOT}/yabs_extended.sh" $yabs_args | tee "$yabs_output"
+            [ "${PIPESTATUS[0]}" -eq 0 ] || return 1
         elif [ -f "${PROJECT_ROOT}/yabs.sh" ]; then
             echo "Warning: yabs_extended.sh not found, using standard yabs.sh"
             bash "${PROJECT_ROOT}/yabs.sh" -j | tee "$yabs_output"
+            [ "${PIPESTATUS[0]}" -eq 0 ] || return 1
         else
             echo "Error: No YABS script found"
             return 1
         fi
+        manifest_add "$RESULTS_DIR" "yabs" "$TEST_PHASE" "$yabs_output"
+    fi
+}
+
+# Function to run the offline CPU/memory benchmark
+run_cpu_memory_test() {
+    echo -e "\n${BLUE}=== Running CPU/Memory Benchmark ===${NC}"
+    local bench_script="$PROJECT_ROOT/scripts/utils/cpu_memory_benchmark.py"
+    local bench_output="$RESULTS_DIR/cpu_memory_${TEST_PHASE}_results.json"
+
+    if ! command -v python3 >/dev/null 2>&1; then
+        echo "Warning: python3 not found, skipping CPU/memory benchmark"
+        return 1
+    fi
+
+    local bench_args="-o $bench_output"
+    [ "$QUICK_MODE" = true ] && bench_args="$bench_args -q"
+    if python3 "$bench_script" $bench_args; then
+        manifest_add "$RESULTS_DIR" "cpu_memory" "$TEST_PHASE" "$bench_output"
+    else
+        echo "Error: CPU/memory benchmark failed (requires numpy)"
+        return 1
     fi
 }
 
@@ -397,11 +619,11 @@ run_network_tests() {
     if [ -f "$network_script" ]; then
         # Run ping test
         [ "$VERBOSE" = true ] && echo "Running ping test to $DESTINATION_IP..."
-        "$network_script" -t ping -d "$DESTINATION_IP" -c "$PING_COUNT" -p "$TEST_PHASE"
+        run_step network.ping "$network_script" -t ping -d "$DESTINATION_IP" -c "$PING_COUNT" -p "$TEST_PHASE"
         
         # Run traceroute test
         [ "$VERBOSE" = true ] && echo "Running traceroute to $DESTINATION_IP..."
-        "$network_script" -t traceroute -d "$DESTINATION_IP" -m "$TRACE_HOPS" -p "$TEST_PHASE"
+        run_step network.traceroute "$network_script" -t traceroute -d "$DESTINATION_IP" -m "$TRACE_HOPS" -p "$TEST_PHASE"
         
         # Run iperf tests if server is specified
         if [ ! -z "$IPERF_SERVER" ]; then
@@ -418,10 +640,14 @@ run_network_tests() {
             fi
             
             [ "$VERBOSE" = true ] && echo "Running iPerf3 test to $IPERF_SERVER..."
-            "$network_script" -t iperf $iperf_args
+            run_step network.iperf "$network_script" -t iperf $iperf_args
         else
             echo "Skipping iPerf tests - no server specified"
         fi
+        
+        # Host-only baseline to tell network stack changes from path changes
+        [ "$VERBOSE" = true ] && echo "Running loopback network-stack benchmark..."
+        run_step network.loopback "$network_script" -t loopback -p "$TEST_PHASE"
     else
         echo "Error: Network test script not found: $network_script"
         return 1
@@ -518,13 +744,15 @@ run_parallel_tests() {
     
     # Create list of test functions to run
     local test_functions=()
-    [ "$RUN_YABS" = true ] && test_functions+=("run_yabs_test")
+    [ "$RUN_YABS" = true ] && test_functions+=("run_step yabs run_yabs_test")
+    [ "$RUN_CPUMEM" = true ] && test_functions+=("run_step cpu_memory run_cpu_memory_test")
     [ "$RUN_NETWORK" = true ] && test_functions+=("run_network_tests")
-    [ "$RUN_DNS" = true ] && test_functions+=("run_dns_tests")
-    [ "$RUN_TRANSFER" = true ] && test_functions+=("run_transfer_tests")
+    [ "$RUN_DNS" = true ] && test_functions+=("run_step dns run_dns_tests")
+    [ "$RUN_TRANSFER" = true ] && test_functions+=("run_step transfer run_transfer_tests")
     
     # Export functions for parallel
-    export -f run_yabs_test run_network_tests run_dns_tests run_transfer_tests
+    export -f run_yabs_test run_cpu_memory_test run_network_tests run_dns_tests run_transfer_tests
+    export -f step_inputs run_step
     
     # Run tests in parallel
     printf '%s\n' "${test_functions[@]}" | parallel -j0 --tag {}
@@ -588,6 +816,18 @@ show_final_summary() {
         echo ""
     fi
     
+    # CPU/memory benchmark results
+    local cpumem_json=$(find "$RESULTS_DIR" -name "cpu_memory_*.json" -type f 2>/dev/null | head -1)
+    if [ ! -z "$cpumem_json" ] && [ -f "$cpumem_json" ]; then
+        echo -e "  ${BOLD}${CYAN}CPU/MEMORY:${NC}"
+        local metric value
+        for metric in int_1t_mops int_mt_mops float_mt_gflops stream_triad_mbps aes_256_gcm_mbps; do
+            value=$(grep -o "\"$metric\"[[:space:]]*:[[:space:]]*[0-9.]*" "$cpumem_json" 2>/dev/null | awk -F':' '{print $2}' | tr -d ' ')
+            [ ! -z "$value" ] && echo -e "    ${metric}: ${GREEN}${value}${NC}"
+        done
+        echo ""
+    fi
+
     # Data transfer results
     local wget_json=$(find "$RESULTS_DIR" -name "*wget*.json" -type f 2>/dev/null | head -1)
     local curl_json=$(find "$RESULTS_DIR" -name "*curl*.json" -type f 2>/dev/null | head -1)
@@ -619,12 +859,14 @@ main() {
     echo "Phase: $TEST_PHASE"
     echo "Results Directory: $RESULTS_DIR"
     echo "Parallel Execution: $PARALLEL_EXECUTION"
+    [ "$RESUME" = true ] && echo "Resume: skipping tests completed in the previous attempt"
     [ "$QUICK_MODE" = true ] && echo "Mode: Quick (reduced iterations)"
     echo ""
     
     echo "Tests to run:"
     [ "$RUN_YABS" = true ] && echo "  ✓ YABS System Benchmark"
-    [ "$RUN_NETWORK" = true ] && echo "  ✓ Network Performance (ping, traceroute, iperf)"
+    [ "$RUN_CPUMEM" = true ] && echo "  ✓ CPU/Memory Benchmark (offline)"
+    [ "$RUN_NETWORK" = true ] && echo "  ✓ Network Performance (ping, traceroute, iperf, loopback)"
     [ "$RUN_DNS" = true ] && echo "  ✓ DNS Performance"
     [ "$RUN_TRANSFER" = true ] && echo "  ✓ Data Transfer Tests"
     echo ""
@@ -642,28 +884,71 @@ main() {
     echo "  Download URL: $DOWNLOAD_URL"
     echo ""
     
+    trace_begin "suite"
+
+    [ "$RESUME" = true ] && resume_prepare
+
     # Check dependencies
+    trace_begin "suite.check_dependencies" "setup"
     check_dependencies
+    trace_end
     
     # Run tests
     if [ "$PARALLEL_EXECUTION" = true ]; then
+        trace_begin "suite.parallel_tests"
         run_parallel_tests
+        trace_end
     else
         echo "Running tests sequentially..."
-        [ "$RUN_YABS" = true ] && run_yabs_test
-        [ "$RUN_NETWORK" = true ] && run_network_tests
-        [ "$RUN_DNS" = true ] && run_dns_tests
-        [ "$RUN_TRANSFER" = true ] && run_transfer_tests
+        if [ "$RUN_YABS" = true ]; then
+            trace_begin "suite.yabs"
+            run_step yabs run_yabs_test
+            trace_end
+        fi
+        if [ "$RUN_CPUMEM" = true ]; then
+            trace_begin "suite.cpu_memory"
+            run_step cpu_memory run_cpu_memory_test
+            trace_end
+        fi
+        if [ "$RUN_NETWORK" = true ]; then
+            trace_begin "suite.network"
+            run_network_tests
+            trace_end
+        fi
+        if [ "$RUN_DNS" = true ]; then
+            trace_begin "suite.dns"
+            run_step dns run_dns_tests
+            trace_end
+        fi
+        if [ "$RUN_TRANSFER" = true ]; then
+            trace_begin "suite.transfer"
+            run_step transfer run_transfer_tests
+            trace_end
+        fi
     fi
     
     # Generate summary report
+    trace_begin "suite.summary" "analysis"
     echo -e "\n${BLUE}=== Generating Summary Report ===${NC}"
     local summary_file="$RESULTS_DIR/test_summary.txt"
+    local tests=""
+    [ "$RUN_YABS" = true ] && tests+=" yabs"
+    [ "$RUN_CPUMEM" = true ] && tests+=" cpu_memory"
+    [ "$RUN_NETWORK" = true ] && tests+=" network"
+    [ "$RUN_DNS" = true ] && tests+=" dns"
+    [ "$RUN_TRANSFER" = true ] && tests+=" transfer"
+    
+    # Runs sharing a --results-dir (fleet_controller.py runs the local and the
+    # bandwidth-heavy tests separately) add a section each instead of replacing it
+    if [ -n "$RESULTS_DIR_ARG" ] && [ -s "$summary_file" ]; then
+        echo "" >> "$summary_file"
+    else
+        printf 'Performance Test Summary\n========================\n' > "$summary_file"
+    fi
     
-    cat > "$summary_file" <<EOF
-Performance Test Summary
-========================
+    cat >> "$summary_file" <<EOF
 Test Phase: $TEST_PHASE
+Tests:$tests
 Date: $(date)
 Configuration:
   Destination: $DESTINATION_IP
@@ -673,12 +958,21 @@ Configuration:
   
 Results Directory: $RESULTS_DIR
 EOF
-    
+
+    local failed=$(failed_steps | tr '\n' ' ')
+    [ -n "$failed" ] && echo "Failed: ${failed% }" >> "$summary_file"
+
     echo ""
     echo ""
-    echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-    echo -e "${BOLD}  ✓ ALL TESTS COMPLETED SUCCESSFULLY${NC}"
-    echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    if [ -n "$failed" ]; then
+        echo -e "${RED}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+        echo -e "${BOLD}  ✗ TESTS FAILED: ${failed% }${NC}"
+        echo -e "${RED}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    else
+        echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+        echo -e "${BOLD}  ✓ ALL TESTS COMPLETED SUCCESSFULLY${NC}"
+        echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    fi
     echo ""
     echo -e "  ${BOLD}Results Directory:${NC}"
     echo -e "  $RESULTS_DIR"
@@ -689,6 +983,19 @@ EOF
     
     # Always show key metrics summary
     show_final_summary
+    trace_end
+    trace_end
+
+    # A run with failed steps stays unfinished, so --resume retries just those
+    [ -z "$failed" ] && journal_record "$RESULTS_DIR" suite complete
+
+    if [ -n "$YABS_TRACE_FILE" ]; then
+        echo ""
+        echo -e "  ${BOLD}Trace:${NC} $YABS_TRACE_FILE"
+        python3 "$PROJECT_ROOT/scripts/utils/tracing.py" summary "$YABS_TRACE_FILE" -n 10
+    fi
+
+    [ -z "$failed" ]
 }
 
 # Execute main function
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+
+"""
+Anomaly detection over scheduled-run history
+Keeps seasonal (hour-of-day) EWMA baselines per host, test, target and metric,
+updated in O(1) per new point, and alerts on fio IOPS drops, iperf throughput
+drops and DNS latency spikes
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import socket
+import sqlite3
+import argparse
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+from result_schema import iter_records, metric_unit, YABS_IPERF_METRIC_RE
+from export_results import find_run_dirs
+from tracing import span, trace_startup
+
+RESULTS_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'results')
+DEFAULT_STATE = os.path.join(RESULTS_ROOT, 'anomaly_state.db')
+DEFAULT_ALERTS = os.path.join(RESULTS_ROOT, 'anomaly_alerts.jsonl')
+SYSLOG_SOCKET = '/dev/log'
+
+# Direction of a bad change: throughput drops, latency spikes
+DROP = 'drop'
+SPIKE = 'spike'
+
+# (test prefix, metric pattern, direction) of the watched metrics
+WATCHED_METRICS = [
+    ('yabs', re.compile(r'^disk_\w+_iops$'), DROP),
+    ('yabs', YABS_IPERF_METRIC_RE, DROP),
+    ('iperf_', re.compile(r'^(sender|receiver|throughput)_mbps$'), DROP),
+    ('dns', re.compile(r'^avg_response_time_ms$'), SPIKE),
+]
+
+# Baseline over all hours, used until the hour-of-day bucket has warmed up
+ALL_HOURS = -1
+
+DEFAULT_ALPHA = 0.1
+DEFAULT_Z = 4.0
+DEFAULT_MIN_CHANGE = 20.0
+DEFAULT_MIN_SAMPLES = 8
+
+# Floor for the baseline stddev, as a fraction of the mean, so perfectly
+# steady series don't alert on noise-level changes
+MIN_RELATIVE_STDDEV = 0.01
+
+EXIT_OK = 0
+EXIT_ANOMALY = 1
+EXIT_ERROR = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS baselines (
+    host TEXT NOT NULL,
+    test TEXT NOT NULL,
+    target TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    var REAL NOT NULL,
+    last_timestamp TEXT NOT NULL,
+    PRIMARY KEY (host, test, target, metric, hour)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT PRIMARY KEY,
+    ingested TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    alerts INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    host TEXT NOT NULL,
+    test TEXT NOT NULL,
+    target TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    value REAL NOT NULL,
+    baseline REAL NOT NULL,
+    stddev REAL NOT NULL,
+    z_score REAL NOT NULL,
+    change_percent REAL NOT NULL,
+    hour INTEGER NOT NULL,
+    source TEXT NOT NULL
+);
+'''
+
+
+def watch_direction(test, metric):
+    """Return the alerting direction for a metric, or None if it is not watched"""
+    for prefix, pattern, direction in WATCHED_METRICS:
+        if test.startswith(prefix) and pattern.match(metric):
+            return direction
+    return None
+
+
+def ewma_update(count, mean, var, value, alpha):
+    """Add one point to an exponentially weighted mean and variance in O(1)"""
+    count += 1
+    # 1/count while warming up gives the plain mean/variance of the first points
+    weight = max(alpha, 1.0 / count)
+    delta = value - mean
+    increment = weight * delta
+    mean += increment
+    var = (1 - weight) * (var + delta * increment)
+    return count, mean, var
+
+
+def hour_of_day(timestamp):
+    """Return the UTC hour of a schema timestamp (YYYY-MM-DDTHH:MM:SSZ)"""
+    return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ').hour
+
+
+class AlertSink:
+    """Writes alerts as JSON lines and optionally to syslog"""
+
+    def __init__(self, path=DEFAULT_ALERTS, use_syslog=False):
+        self.path = path
+        self.logger = None
+        if use_syslog:
+            if not os.path.exists(SYSLOG_SOCKET):
+                print(f"Warning: syslog socket {SYSLOG_SOCKET} not found, not sending alerts to syslog",
+                      file=sys.stderr)
+            else:
+                handler = logging.handlers.SysLogHandler(address=SYSLOG_SOCKET)
+                handler.setFormatter(logging.Formatter('yabs-anomaly: %(message)s'))
+                self.logger = logging.getLogger('yabs-anomaly')
+                self.logger.addHandler(handler)
+                self.logger.propagate = False
+
+    def emit(self, alert):
+        """Append one alert to the sinks"""
+        if self.path == '-':
+            print(json.dumps(alert, sort_keys=True))
+        elif self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(alert, sort_keys=True) + '\n')
+        if self.logger:
+            self.logger.warning(format_alert(alert))
+
+
+def format_alert(alert):
+    """Return a one-line description of an alert"""
+    target = f"[{alert['target']}]" if alert['target'] else ''
+    return (f"{alert['host']} {alert['test']}{target} {alert['metric']} {alert['direction']}: "
+            f"{alert['value']:.2f} {alert['unit']} vs baseline {alert['baseline']:.2f} "
+            f"({alert['change_percent']:+.1f}%, z={alert['z_score']:+.1f}, hour {alert['hour']:02d})")
+
+
+class AnomalyDetector:
+    """SQLite-backed seasonal baselines for scheduled runs"""
+
+    def __init__(self, path=DEFAULT_STATE, alpha=DEFAULT_ALPHA, z_threshold=DEFAULT_Z,
+                 min_change=DEFAULT_MIN_CHANGE, min_samples=DEFAULT_MIN_SAMPLES):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_change = min_change
+        self.min_samples = min_samples
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        """Commit and close the state database"""
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _baseline(self, key, hour):
+        """Return (count, mean, var, last_timestamp) of one bucket, or None"""
+        return self.db.execute('''
+            SELECT count, mean, var, last_timestamp FROM baselines
+            WHERE host = ? AND test = ? AND target = ? AND metric = ? AND hour = ?''', key + (hour,)).fetchone()
+
+    def _stddev(self, mean, var):
+        """Return the baseline stddev with the relative floor applied"""
+        return max(math.sqrt(max(var, 0.0)), abs(mean) * MIN_RELATIVE_STDDEV)
+
+    def _score(self, buckets, value):
+        """Compare a value against the warmest usable bucket, returning (mean, stddev, z, change) or None"""
+        for bucket in buckets:
+            if bucket and bucket[0] >= self.min_samples:
+                count, mean, var, _ = bucket
+                stddev = self._stddev(mean, var)
+                if stddev == 0:
+                    return None
+                change = (value - mean) / abs(mean) * 100 if mean else 0.0
+                return mean, stddev, (value - mean) / stddev, change
+        return None
+
+    def is_anomalous(self, direction, z, change):
+        """Return True if a scored point is a bad change beyond both thresholds"""
+        sign = 1 if direction == SPIKE else -1
+        return sign * z >= self.z_threshold and sign * change >= self.min_change
+
+    def add_point(self, key, timestamp, value, direction):
+        """Score one point against its baselines and fold it in; returns an alert dict, None, or False if stale"""
+        hour = hour_of_day(timestamp)
+        hour_bucket = self._baseline(key, hour)
+        all_bucket = self._baseline(key, ALL_HOURS)
+        if all_bucket and timestamp <= all_bucket[3]:
+            return False
+
+        alert = None
+        scored = self._score([hour_bucket, all_bucket], value)
+        if scored:
+            mean, stddev, z, change = scored
+            if self.is_anomalous(direction, z, change):
+                host, test, target, metric = key
+                alert = {
+                    'timestamp': timestamp, 'host': host, 'test': test, 'target': target, 'metric': metric,
+                    'direction': direction, 'value': value, 'unit': metric_unit(metric), 'baseline': mean,
+                    'stddev': stddev, 'z_score': z, 'change_percent': change, 'hour': hour,
+                }
+
+        for bucket_hour, bucket in [(hour, hour_bucket), (ALL_HOURS, all_bucket)]:
+            count, mean, var, _ = bucket or (0, 0.0, 0.0, '')
+            point = value
+            if count >= self.min_samples:
+                # Winsorize so a single outlier barely moves the baseline,
+                # while a lasting level shift is still absorbed over time
+                limit = self.z_threshold * self._stddev(mean, var)
+                point = min(max(value, mean - limit), mean + limit)
+            count, mean, var = ewma_update(count, mean, var, point, self.alpha)
+            self.db.execute('INSERT OR REPLACE INTO baselines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            key + (bucket_hour, count, mean, var, timestamp))
+        return alert
+
+    def is_ingested(self, results_dir):
+        """Return True if a run directory was already ingested"""
+        return self.db.execute('SELECT 1 FROM runs WHERE path = ?',
+                               (os.path.abspath(results_dir),)).fetchone() is not None
+
+    def ingest(self, run_dirs, sink, host=None, force=False):
+        """Ingest new run directories in time order, returning (runs, points, alerts)"""
+        points = []
+        new_runs = []
+        for run_dir in run_dirs:
+            if not force and self.is_ingested(run_dir):
+                continue
+            new_runs.append(run_dir)
+            for record in iter_records(run_dir):
+                record_host = host or record['host'] or socket.gethostname()
+                for metric, value in record['metrics'].items():
+                    direction = watch_direction(record['test'], metric)
+                    if direction:
+                        key = (record_host, record['test'], record['target'], metric)
+                        points.append((record['timestamp'], key, float(value), direction,
+                                       run_dir, record['source']))
+
+        # Run directory names don't sort chronologically; baselines need time order
+        points.sort(key=lambda p: (p[0], p[1]))
+        added = 0
+        alerts = []
+        run_counts = {run_dir: [0, 0] for run_dir in new_runs}
+        for timestamp, key, value, direction, run_dir, source in points:
+            alert = self.add_point(key, timestamp, value, direction)
+            if alert is False:
+                continue
+            added += 1
+            run_counts[run_dir][0] += 1
+            if alert:
+                alert['source'] = os.path.join(run_dir, source)
+                self.db.execute('''
+                    INSERT INTO alerts (timestamp, host, test, target, metric, direction, value, baseline,
+                                        stddev, z_score, change_percent, hour, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                                tuple(alert[k] for k in ['timestamp', 'host', 'test', 'target', 'metric',
+                                                         'direction', 'value', 'baseline', 'stddev',
+                                                         'z_score', 'change_percent', 'hour', 'source']))
+                sink.emit(alert)
+                alerts.append(alert)
+                run_counts[run_dir][1] += 1
+
+        ingested = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        for run_dir, (run_points, run_alerts) in run_counts.items():
+            self.db.execute('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)',
+                            (os.path.abspath(run_dir), ingested, run_points, run_alerts))
+        self.db.commit()
+        return len(new_runs), added, alerts
+
+    def baselines(self, host=None, metric=None):
+        """Return baseline buckets, optionally filtered by host and metric"""
+        query = 'SELECT host, test, target, metric, hour, count, mean, var, last_timestamp FROM baselines WHERE 1 = 1'
+        params = []
+        if host:
+            query += ' AND host = ?'
+            params.append(host)
+        if metric:
+            query += ' AND metric = ?'
+            params.append(metric)
+        query += ' ORDER BY host, test, target, metric, hour'
+        columns = ['host', 'test', 'target', 'metric', 'hour', 'count', 'mean', 'stddev', 'last_timestamp']
+        return [dict(zip(columns, row[:7] + (math.sqrt(max(row[7], 0.0)), row[8])))
+                for row in self.db.execute(query, params).fetchall()]
+
+    def recent_alerts(self, limit=20):
+        """Return the most recent alerts, newest first"""
+        rows = self.db.execute('SELECT * FROM alerts ORDER BY timestamp DESC, id DESC LIMIT ?', (limit,))
+        columns = [d[0] for d in rows.description]
+        alerts = [dict(zip(columns, row)) for row in rows.fetchall()]
+        for alert in alerts:
+            alert['unit'] = metric_unit(alert['metric'])
+        return alerts
+
+
+def main():
+    trace_startup('anomaly_detector')
+    parser = argparse.ArgumentParser(description='Detect anomalies in scheduled runs against seasonal baselines')
+    parser.add_argument('-d', '--db', default=DEFAULT_STATE, help='State database (default: results/anomaly_state.db)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Score new runs and update the baselines')
+    ingest.add_argument('results_dirs', nargs='+', help='Directories containing test results')
+    ingest.add_argument('-r', '--recursive', action='store_true',
+                        help='Ingest every run directory below the given directories')
+    ingest.add_argument('--host', help='Host name for runs without a manifest (default: this host)')
+    ingest.add_argument('-a', '--alerts', default=DEFAULT_ALERTS,
+                        help="JSON lines alert file, '-' for stdout (default: results/anomaly_alerts.jsonl)")
+    ingest.add_argument('--syslog', action='store_true', help='Also send alerts to syslog')
+    ingest.add_argument('-z', '--z-threshold', type=float, default=DEFAULT_Z,
+                        help=f'Baseline stddevs a point must deviate by (default: {DEFAULT_Z})')
+    ingest.add_argument('-c', '--min-change', type=float, default=DEFAULT_MIN_CHANGE,
+                        help=f'Minimum change from the baseline in percent (default: {DEFAULT_MIN_CHANGE})')
+    ingest.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help=f'EWMA smoothing factor (default: {DEFAULT_ALPHA})')
+    ingest.add_argument('--min-samples', type=int, default=DEFAULT_MIN_SAMPLES,
+                        help=f'Points before a baseline is used (default: {DEFAULT_MIN_SAMPLES})')
+    ingest.add_argument('--force', action='store_true', help='Re-read runs that were already ingested')
+
+    baselines = subparsers.add_parser('baselines', help='List baselines')
+    baselines.add_argument('--host', help='Only this host')
+    baselines.add_argument('--metric', help='Only this metric')
+
+    alerts = subparsers.add_parser('alerts', help='List recent alerts')
+    alerts.add_argument('-n', '--limit', type=int, default=20, help='Number of alerts (default: 20)')
+
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        if not 0 < args.alpha <= 1:
+            print("Error: --alpha must be in (0, 1]")
+            sys.exit(EXIT_ERROR)
+        for results_dir in args.results_dirs:
+            if not os.path.isdir(results_dir):
+                print(f"Error: Results directory not found: {results_dir}")
+                sys.exit(EXIT_ERROR)
+
+    with AnomalyDetector(args.db) as detector:
+        if args.command == 'ingest':
+            detector.alpha = args.alpha
+            detector.z_threshold = args.z_threshold
+            detector.min_change = args.min_change
+            detector.min_samples = args.min_samples
+            sink = AlertSink(args.alerts, args.syslog)
+            with span('anomaly_detector.ingest', 'parse'):
+                runs, points, flagged = detector.ingest(find_run_dirs(args.results_dirs, args.recursive), sink,
+                                                        args.host, args.force)
+            if args.json:
+                print(json.dumps({'runs': runs, 'points': points, 'alerts': flagged}, indent=2))
+            elif args.alerts != '-':
+                for alert in flagged:
+                    print(f"  ⚠ {format_alert(alert)}")
+                print(f"{runs} run(s), {points} point(s), {len(flagged)} anomaly(ies)")
+            sys.exit(EXIT_ANOMALY if flagged else EXIT_OK)
+
+        elif args.command == 'baselines':
+            rows = detector.baselines(args.host, args.metric)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            print(f"  {'Host':<16} {'Test':<10} {'Target':<16} {'Metric':<22} {'Hour':>4} {'N':>5} "
+                  f"{'Mean':>12} {'Stddev':>10}")
+            for b in rows:
+                hour = 'all' if b['hour'] == ALL_HOURS else f"{b['hour']:02d}"
+                print(f"  {b['host']:<16} {b['test']:<10} {b['target'] or '-':<16} {b['metric']:<22} {hour:>4} "
+                      f"{b['count']:>5} {b['mean']:>12.2f} {b['stddev']:>10.2f}")
+
+        elif args.command == 'alerts':
+            recent = detector.recent_alerts(args.limit)
+            if args.json:
+                print(json.dumps(recent, indent=2))
+                return
+            for alert in recent:
+                print(f"  {alert['timestamp']}  {format_alert(alert)}")
+            print(f"{len(recent)} alert(s)")
+
+if __name__ == "__main__":
+    main()
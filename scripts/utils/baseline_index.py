@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+
+"""
+Cross-host baseline index for fleet benchmarking
+Groups YABS results by hardware fingerprint, keeps incremental per-group
+aggregates and compares hosts against their peer group distribution
+"""
+
+import os
+import re
+import sys
+import math
+import json
+import sqlite3
+import hashlib
+import argparse
+
+from result_schema import iter_records
+from tracing import span, trace_startup
+
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'results', 'baseline_index.db')
+
+# Metrics that describe the hardware rather than its performance
+FINGERPRINT_METRICS = {'cpu_cores', 'ram_kib', 'swap_kib', 'disk_kb'}
+
+# Peer groups smaller than this are not used for outlier detection
+MIN_GROUP_SIZE = 5
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS groups (
+    fingerprint TEXT PRIMARY KEY,
+    cpu_model TEXT, cpu_cores INTEGER, ram_gib INTEGER, disk_gib INTEGER,
+    virt_type TEXT, kernel TEXT
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    timestamp TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS host_metrics (
+    host TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (host, metric)
+);
+CREATE INDEX IF NOT EXISTS host_metrics_group ON host_metrics (fingerprint, metric, value);
+CREATE TABLE IF NOT EXISTS group_stats (
+    fingerprint TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    PRIMARY KEY (fingerprint, metric)
+);
+'''
+
+# Leave-one-out z^2 for every host metric in groups with enough peers.
+# Excluding the host from its own baseline avoids masking: with the host
+# included, |z| can never exceed (n - 1) / sqrt(n).
+OUTLIER_QUERY = '''
+SELECT host, fingerprint, metric, value, mean_loo, var_loo FROM (
+    SELECT h.host, h.fingerprint, h.metric, h.value,
+           (s.count * s.mean - h.value) / (s.count - 1) AS mean_loo,
+           (s.m2 - (h.value - (s.count * s.mean - h.value) / (s.count - 1)) * (h.value - s.mean))
+               / (s.count - 2) AS var_loo
+    FROM host_metrics h JOIN group_stats s USING (fingerprint, metric)
+    WHERE s.count >= ?
+)
+WHERE var_loo > 0 AND (value - mean_loo) * (value - mean_loo) > ? * var_loo
+'''
+
+
+def _size_bucket(kib):
+    """Round a size in KiB to the nearest power-of-two GiB (hosts report less than nominal)"""
+    gib = kib / 1024 ** 2
+    if gib <= 0:
+        return 0
+    return 2 ** max(0, round(math.log2(gib)))
+
+
+def hardware_fingerprint(record):
+    """Return (fingerprint, fields) for a yabs record"""
+    metrics = record['metrics']
+    attributes = record['attributes']
+    kernel = re.match(r'(\d+\.\d+)', attributes.get('kernel', ''))
+    fields = {
+        'cpu_model': ' '.join(attributes.get('cpu_model', '').split()),
+        'cpu_cores': int(metrics.get('cpu_cores', 0)),
+        'ram_gib': _size_bucket(metrics.get('ram_kib', 0)),
+        'disk_gib': _size_bucket(metrics.get('disk_kb', 0)),
+        'virt_type': attributes.get('virt_type', ''),
+        'kernel': kernel.group(1) if kernel else '',
+    }
+    key = '|'.join(str(fields[name]) for name in sorted(fields))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12], fields
+
+
+class BaselineIndex:
+    """SQLite-backed index of the latest YABS result per host"""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        """Commit and close the index"""
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stats_add(self, fingerprint, metric, value):
+        """Add one value to a group aggregate (Welford update)"""
+        row = self.db.execute('SELECT count, mean, m2 FROM group_stats WHERE fingerprint = ? AND metric = ?',
+                              (fingerprint, metric)).fetchone()
+        count, mean, m2 = row or (0, 0.0, 0.0)
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        self.db.execute('INSERT OR REPLACE INTO group_stats VALUES (?, ?, ?, ?, ?)',
+                        (fingerprint, metric, count, mean, m2))
+
+    def _stats_remove(self, fingerprint, metric, value):
+        """Remove one value from a group aggregate (reverse Welford update)"""
+        row = self.db.execute('SELECT count, mean, m2 FROM group_stats WHERE fingerprint = ? AND metric = ?',
+                              (fingerprint, metric)).fetchone()
+        if row is None:
+            return
+        count, mean, m2 = row
+        if count <= 1:
+            self.db.execute('DELETE FROM group_stats WHERE fingerprint = ? AND metric = ?', (fingerprint, metric))
+            return
+        new_mean = (count * mean - value) / (count - 1)
+        m2 = max(0.0, m2 - (value - new_mean) * (value - mean))
+        self.db.execute('UPDATE group_stats SET count = ?, mean = ?, m2 = ? WHERE fingerprint = ? AND metric = ?',
+                        (count - 1, new_mean, m2, fingerprint, metric))
+
+    def add_record(self, record, host=None):
+        """Index a yabs record as the host's latest result; returns False if an equal or newer one exists"""
+        host = host or record['host']
+        if not host:
+            raise ValueError(f"{record['source']}: no host name (pass --host)")
+
+        existing = self.db.execute('SELECT fingerprint, timestamp FROM hosts WHERE host = ?', (host,)).fetchone()
+        if existing and existing[1] >= record['timestamp']:
+            return False
+
+        fingerprint, fields = hardware_fingerprint(record)
+        if existing:
+            for metric, value in self.db.execute('SELECT metric, value FROM host_metrics WHERE host = ?',
+                                                 (host,)).fetchall():
+                self._stats_remove(existing[0], metric, value)
+            self.db.execute('DELETE FROM host_metrics WHERE host = ?', (host,))
+
+        self.db.execute('INSERT OR IGNORE INTO groups VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (fingerprint, fields['cpu_model'], fields['cpu_cores'], fields['ram_gib'],
+                         fields['disk_gib'], fields['virt_type'], fields['kernel']))
+        self.db.execute('INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?)',
+                        (host, fingerprint, record['timestamp'], record['source']))
+        for metric, value in record['metrics'].items():
+            if metric in FINGERPRINT_METRICS:
+                continue
+            self.db.execute('INSERT INTO host_metrics VALUES (?, ?, ?, ?)', (host, fingerprint, metric, float(value)))
+            self._stats_add(fingerprint, metric, float(value))
+        return True
+
+    def ingest(self, results_dir, host=None):
+        """Index every yabs result in a run directory, returning the number of hosts updated"""
+        updated = 0
+        for record in iter_records(results_dir):
+            if record['test'] != 'yabs':
+                continue
+            if self.add_record(record, host):
+                updated += 1
+        self.db.commit()
+        return updated
+
+    def rebuild(self):
+        """Recompute all group aggregates from the stored host metrics"""
+        self.db.execute('DELETE FROM group_stats')
+        rows = self.db.execute('SELECT fingerprint, metric, value FROM host_metrics ORDER BY fingerprint, metric')
+        for fingerprint, metric, value in rows.fetchall():
+            self._stats_add(fingerprint, metric, value)
+        self.db.execute('DELETE FROM groups WHERE fingerprint NOT IN (SELECT fingerprint FROM hosts)')
+        self.db.commit()
+
+    def groups(self):
+        """Return all peer groups with their host counts"""
+        rows = self.db.execute('''
+            SELECT g.*, COUNT(h.host) FROM groups g JOIN hosts h USING (fingerprint)
+            GROUP BY g.fingerprint ORDER BY COUNT(h.host) DESC''')
+        columns = [d[0] for d in rows.description[:-1]] + ['hosts']
+        return [dict(zip(columns, row)) for row in rows.fetchall()]
+
+    def compare(self, host):
+        """Compare one host's metrics against its peer group (host excluded)"""
+        row = self.db.execute('SELECT fingerprint FROM hosts WHERE host = ?', (host,)).fetchone()
+        if row is None:
+            raise KeyError(f"Host not in index: {host}")
+        fingerprint = row[0]
+
+        comparison = []
+        for metric, value, count, mean, m2 in self.db.execute('''
+                SELECT h.metric, h.value, s.count, s.mean, s.m2
+                FROM host_metrics h JOIN group_stats s USING (fingerprint, metric)
+                WHERE h.host = ? ORDER BY h.metric''', (host,)).fetchall():
+            result = {'metric': metric, 'value': value, 'peers': count - 1}
+            if count > 1:
+                peer_mean = (count * mean - value) / (count - 1)
+                result['peer_mean'] = peer_mean
+                below = self.db.execute('''
+                    SELECT COUNT(*) FROM host_metrics
+                    WHERE fingerprint = ? AND metric = ? AND value < ? AND host != ?''',
+                                        (fingerprint, metric, value, host)).fetchone()[0]
+                result['percentile'] = 100.0 * below / (count - 1)
+            if count > 2:
+                peer_var = (m2 - (value - peer_mean) * (value - mean)) / (count - 2)
+                if peer_var > 0:
+                    result['peer_stddev'] = math.sqrt(peer_var)
+                    result['z_score'] = (value - peer_mean) / result['peer_stddev']
+            comparison.append(result)
+        return fingerprint, comparison
+
+    def outliers(self, z_threshold=3.0, min_group=MIN_GROUP_SIZE):
+        """Return host metrics more than z_threshold peer stddevs from the peer mean"""
+        outliers = []
+        for host, fingerprint, metric, value, mean_loo, var_loo in self.db.execute(
+                OUTLIER_QUERY, (max(min_group, 3), z_threshold ** 2)).fetchall():
+            outliers.append({
+                'host': host,
+                'fingerprint': fingerprint,
+                'metric': metric,
+                'value': value,
+                'peer_mean': mean_loo,
+                'z_score': (value - mean_loo) / math.sqrt(var_loo),
+            })
+        outliers.sort(key=lambda o: -abs(o['z_score']))
+        return outliers
+
+
+def main():
+    trace_startup('baseline_index')
+    parser = argparse.ArgumentParser(description='Index YABS results by hardware fingerprint and compare hosts')
+    parser.add_argument('-d', '--db', default=DEFAULT_INDEX, help='Index database (default: results/baseline_index.db)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Add the yabs results from run directories')
+    ingest.add_argument('results_dirs', nargs='+', help='Directories containing test results')
+    ingest.add_argument('--host', help='Host name for runs without a manifest')
+
+    subparsers.add_parser('groups', help='List hardware peer groups')
+
+    compare = subparsers.add_parser('compare', help="Compare a host against its peer group")
+    compare.add_argument('host', help='Host name')
+
+    outliers = subparsers.add_parser('outliers', help='Flag hosts far from their peer group')
+    outliers.add_argument('-z', '--z-threshold', type=float, default=3.0, help='Z-score threshold (default: 3.0)')
+    outliers.add_argument('-m', '--min-group', type=int, default=MIN_GROUP_SIZE,
+                          help=f'Minimum peer group size (default: {MIN_GROUP_SIZE})')
+
+    subparsers.add_parser('rebuild', help='Recompute group aggregates from stored host metrics')
+
+    args = parser.parse_args()
+
+    with BaselineIndex(args.db) as index:
+        if args.command == 'ingest':
+            for results_dir in args.results_dirs:
+                if not os.path.exists(results_dir):
+                    print(f"Error: Results directory not found: {results_dir}")
+                    sys.exit(1)
+                try:
+                    with span('baseline_index.ingest', 'parse', results_dir=results_dir):
+                        updated = index.ingest(results_dir, args.host)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    sys.exit(1)
+                print(f"{results_dir}: {updated} host(s) updated")
+
+        elif args.command == 'groups':
+            groups = index.groups()
+            if args.json:
+                print(json.dumps(groups, indent=2))
+                return
+            for group in groups:
+                print(f"{group['fingerprint']}  {group['hosts']:>5} hosts  {group['cpu_model']} x{group['cpu_cores']}, "
+                      f"{group['ram_gib']} GiB RAM, {group['disk_gib']} GiB disk, "
+                      f"{group['virt_type'] or 'unknown virt'}, kernel {group['kernel'] or '?'}")
+
+        elif args.command == 'compare':
+            try:
+                fingerprint, comparison = index.compare(args.host)
+            except KeyError as e:
+                print(f"Error: {e.args[0]}")
+                sys.exit(1)
+            if args.json:
+                print(json.dumps({'host': args.host, 'fingerprint': fingerprint, 'metrics': comparison}, indent=2))
+            else:
+                print(f"{args.host} (group {fingerprint})")
+                print(f"  {'Metric':<24} {'Value':>12} {'Peer mean':>12} {'Z':>7} {'Pctl':>6} {'Peers':>6}")
+                for m in comparison:
+                    z = f"{m['z_score']:+.2f}" if 'z_score' in m else '-'
+                    peer_mean = f"{m['peer_mean']:.2f}" if 'peer_mean' in m else '-'
+                    pctl = f"{m['percentile']:.0f}" if 'percentile' in m else '-'
+                    print(f"  {m['metric']:<24} {m['value']:>12.2f} {peer_mean:>12} {z:>7} {pctl:>6} {m['peers']:>6}")
+
+        elif args.command == 'outliers':
+            flagged = index.outliers(args.z_threshold, args.min_group)
+            if args.json:
+                print(json.dumps(flagged, indent=2))
+            else:
+                for o in flagged:
+                    print(f"  ⚠ {o['host']} [{o['fingerprint']}] {o['metric']}: {o['value']:.2f} "
+                          f"(peer mean {o['peer_mean']:.2f}, z={o['z_score']:+.2f})")
+                print(f"{len(flagged)} outlier metric(s)")
+
+        elif args.command == 'rebuild':
+            index.rebuild()
+            print(f"Rebuilt aggregates in {index.path}")
+
+if __name__ == "__main__":
+    main()
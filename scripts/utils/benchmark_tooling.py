@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the Python result tooling against synthetic result sets
+Tracks ingestion throughput, peak RSS and chart render time across versions
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import argparse
+import platform
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from tracing import span, trace_startup, max_rss_kb
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(SCRIPT_DIR, '..', '..', 'results', 'tooling_benchmarks.jsonl')
+GENERATOR = os.path.join(SCRIPT_DIR, 'generate_synthetic_results.py')
+TOOLS = ('processor', 'visualizer')
+
+EXIT_PASS = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+
+# Compared against the previous version: (field, label, higher is better)
+COMPARED_FIELDS = [
+    ('total_s', 'Total time', False),
+    ('files_per_s', 'Ingestion', True),
+    ('peak_rss_kb', 'Peak RSS', False),
+]
+
+# Entries are only compared when all of these match: the same workload, on
+# the same machine and interpreter
+WORKLOAD_FIELDS = ('tool', 'files', 'hosts', 'legacy', 'host', 'python_version')
+
+
+def _timed(phases, name, func, *args):
+    """Run func, recording its wall-clock time in seconds under phases[name]"""
+    start = time.perf_counter()
+    func(*args)
+    phases[name] = time.perf_counter() - start
+
+
+def run_processor(results_dir, scratch_dir):
+    """Time each stage of TestResultsProcessor on a results directory"""
+    from process_results import TestResultsProcessor
+
+    phases = {}
+    idle_rss = max_rss_kb()
+    processor = TestResultsProcessor(results_dir)
+    _timed(phases, 'load', processor.load_all_results)
+    _timed(phases, 'compare', processor.calculate_changes)
+    _timed(phases, 'export', processor.export_to_csv, os.path.join(scratch_dir, 'comparison.csv'))
+    _timed(phases, 'report', processor.generate_report)
+    return phases, idle_rss
+
+
+def run_visualizer(results_dir, scratch_dir):
+    """Time loading, rendering and saving charts with TestResultsVisualizer"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from visualize_results import TestResultsVisualizer
+
+    phases = {}
+    idle_rss = max_rss_kb()
+    visualizer = TestResultsVisualizer(results_dir)
+    _timed(phases, 'load', visualizer.load_json_results)
+
+    start = time.perf_counter()
+    visualizer.create_ping_comparison()
+    visualizer.create_throughput_comparison()
+    visualizer.create_dns_performance_chart()
+    visualizer.create_summary_dashboard()
+    phases['render'] = time.perf_counter() - start
+
+    _timed(phases, 'save', visualizer.save_all_figures, scratch_dir)
+    return phases, idle_rss
+
+
+def worker(tool, results_dir):
+    """Benchmark one tool in this (fresh) process and print the result as JSON"""
+    runner = run_processor if tool == 'processor' else run_visualizer
+    scratch_dir = tempfile.mkdtemp(prefix='yabs_tooling_')
+    try:
+        # Tools print progress and reports; keep stdout for the result line
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            phases, idle_rss = runner(results_dir, scratch_dir)
+        result = {'phases': phases, 'idle_rss_kb': idle_rss, 'peak_rss_kb': max_rss_kb()}
+    except ImportError as e:
+        result = {'skipped': f"{e.name or e} not installed"}
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def measure(tool, results_dir, repeats):
+    """Run a tool in fresh interpreters, returning median phase times and peak RSS"""
+    runs = []
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', tool, results_dir],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{tool} worker failed: {proc.stderr.strip().splitlines()[-1:]}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if 'skipped' in result:
+            return result
+        runs.append(result)
+
+    phases = {}
+    for name in runs[0]['phases']:
+        samples = sorted(run['phases'][name] for run in runs)
+        phases[name] = samples[len(samples) // 2]
+    return {
+        'phases': phases,
+        'total_s': sum(phases.values()),
+        'idle_rss_kb': min(run['idle_rss_kb'] for run in runs),
+        'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+    }
+
+
+def dataset_size(results_dir):
+    """Return (file count, total bytes) of result artifacts in a directory"""
+    files = 0
+    total = 0
+    for entry in os.scandir(results_dir):
+        if entry.is_file() and entry.name.endswith(('.json', '.txt')):
+            files += 1
+            total += entry.stat().st_size
+    return files, total
+
+
+def prepare_dataset(data_dir, files, hosts, seed, legacy):
+    """Generate (or reuse) a flat synthetic results directory with the given file count"""
+    results_dir = os.path.join(data_dir, f"synthetic_{files}_{hosts}h_{seed}{'_legacy' if legacy else ''}")
+    if os.path.isdir(results_dir) and dataset_size(results_dir)[0] == files:
+        return results_dir
+    shutil.rmtree(results_dir, ignore_errors=True)
+    cmd = [sys.executable, GENERATOR, results_dir, '--flat', '-n', str(files),
+           '--hosts', str(hosts), '--seed', str(seed)]
+    if legacy:
+        cmd.append('--no-manifest')
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    return results_dir
+
+
+def tooling_version():
+    """Describe the checked-out version of the tooling (git describe, else 'unknown')"""
+    try:
+        proc = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return 'unknown'
+    return proc.stdout.strip() or 'unknown'
+
+
+def load_history(path):
+    """Load previous benchmark entries, skipping unreadable lines"""
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def previous_entry(history, entry):
+    """Return the latest history entry for the same workload and machine from another version"""
+    for old in reversed(history):
+        if (old.get('version') != entry['version'] and 'skipped' not in old
+                and all(old.get(field) == entry[field] for field in WORKLOAD_FIELDS)):
+            return old
+    return None
+
+
+def compare(entry, old, threshold):
+    """Return [(label, old, new, percent change, regressed)] against a previous entry"""
+    changes = []
+    for field, label, higher_is_better in COMPARED_FIELDS:
+        before, after = old.get(field), entry.get(field)
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        worse = -change if higher_is_better else change
+        changes.append((label, before, after, change, worse > threshold))
+    return changes
+
+
+def main():
+    trace_startup('benchmark_tooling')
+    parser = argparse.ArgumentParser(description='Benchmark process_results and visualize_results on synthetic data')
+    parser.add_argument('-s', '--scales', default='10,1000,10000',
+                        help='Comma-separated result file counts to benchmark (default: 10,1000,10000)')
+    parser.add_argument('--hosts', type=int, default=16, help='Synthetic hosts per dataset (default: 16)')
+    parser.add_argument('-t', '--tools', default=','.join(TOOLS), help='Tools to benchmark (default: processor,visualizer)')
+    parser.add_argument('-r', '--repeats', type=int, default=3, help='Runs per measurement; the median is kept (default: 3)')
+    parser.add_argument('--legacy', action='store_true', help='Benchmark file-name discovery (no manifest.jsonl)')
+    parser.add_argument('--data-dir', help='Keep generated datasets here and reuse them (default: temporary)')
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help='History file to append results to (default: results/tooling_benchmarks.jsonl)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record results in the history file')
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help='Percent slowdown or RSS growth versus the previous version that counts as a regression (default: 20)')
+    parser.add_argument('--seed', type=int, default=42, help='Dataset random seed (default: 42)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--worker', nargs=2, metavar=('TOOL', 'RESULTS_DIR'), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    try:
+        scales = [int(s) for s in args.scales.split(',') if s]
+    except ValueError:
+        print(f"Error: Invalid scales: {args.scales}")
+        sys.exit(EXIT_ERROR)
+    tools = [t for t in args.tools.split(',') if t]
+    if not scales or min(scales) < 1 or args.hosts < 1 or args.repeats < 1:
+        print("Error: --scales, --hosts and --repeats must be positive")
+        sys.exit(EXIT_ERROR)
+    if any(t not in TOOLS for t in tools):
+        print(f"Error: Unknown tool in '{args.tools}' (choose from {', '.join(TOOLS)})")
+        sys.exit(EXIT_ERROR)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='yabs_synthetic_')
+    os.makedirs(data_dir, exist_ok=True)
+    version = tooling_version()
+    history = [] if args.no_history else load_history(args.history)
+    entries = []
+    regressed = False
+
+    try:
+        for files in scales:
+            with span('benchmark_tooling.generate', 'io', files=files):
+                results_dir = prepare_dataset(data_dir, files, args.hosts, args.seed, args.legacy)
+            count, total_bytes = dataset_size(results_dir)
+
+            for tool in tools:
+                with span(f'benchmark_tooling.{tool}', 'measure', files=count):
+                    try:
+                        result = measure(tool, results_dir, args.repeats)
+                    except (RuntimeError, ValueError) as e:
+                        print(f"Error: {e}")
+                        sys.exit(EXIT_ERROR)
+
+                entry = {
+                    'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'version': version,
+                    'host': socket.gethostname(),
+                    'python_version': platform.python_version(),
+                    'tool': tool,
+                    'files': count,
+                    'bytes': total_bytes,
+                    'hosts': args.hosts,
+                    'legacy': args.legacy,
+                    'repeats': args.repeats,
+                }
+                entry.update(result)
+                if 'skipped' not in entry:
+                    load = entry['phases']['load'] or 1e-9
+                    entry['files_per_s'] = count / load
+                    entry['mb_per_s'] = total_bytes / 1e6 / load
+                    old = previous_entry(history, entry)
+                    if old:
+                        entry['previous_version'] = old['version']
+                        entry['changes'] = compare(entry, old, args.threshold)
+                        regressed = regressed or any(c[4] for c in entry['changes'])
+                entries.append(entry)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if not args.no_history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a') as f:
+            for entry in entries:
+                f.write(json.dumps({k: v for k, v in entry.items() if k != 'changes'}) + '\n')
+
+    if args.json:
+        print(json.dumps(entries, indent=2))
+        sys.exit(EXIT_REGRESSION if regressed else EXIT_PASS)
+
+    print(f"Tooling benchmark ({version}, median of {args.repeats} run(s))\n")
+    print(f"  {'Tool':<11} {'Files':>7} {'MB':>8} {'Load (s)':>9} {'Files/s':>9} {'MB/s':>7} "
+          f"{'Render (s)':>10} {'Total (s)':>9} {'RSS MB':>7}")
+    for entry in entries:
+        if 'skipped' in entry:
+            print(f"  {entry['tool']:<11} {entry['files']:>7} {entry['bytes'] / 1e6:>8.1f}  skipped: {entry['skipped']}")
+            continue
+        phases = entry['phases']
+        render = f"{phases['render'] + phases['save']:>10.3f}" if 'render' in phases else f"{'-':>10}"
+        print(f"  {entry['tool']:<11} {entry['files']:>7} {entry['bytes'] / 1e6:>8.1f} {phases['load']:>9.3f} "
+              f"{entry['files_per_s']:>9.0f} {entry['mb_per_s']:>7.1f} "
+              f"{render} {entry['total_s']:>9.3f} {entry['peak_rss_kb'] / 1024:>7.1f}")
+
+    compared = [e for e in entries if e.get('changes')]
+    if compared:
+        print(f"\nChange versus previous version (regression threshold {args.threshold:g}%):")
+        for entry in compared:
+            for label, before, after, change, worse in entry['changes']:
+                flag = '  REGRESSION' if worse else ''
+                print(f"  {entry['tool']:<11} {entry['files']:>7} {label:<11} {entry['previous_version']:>12} "
+                      f"{change:>+7.1f}%{flag}")
+
+    sys.exit(EXIT_REGRESSION if regressed else EXIT_PASS)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+
+"""
+Offline CPU and memory benchmark
+Runs fixed-work integer, floating point, compression, hash/AES, STREAM memory
+bandwidth and cache latency kernels without network access or Geekbench
+"""
+
+import os
+
+# Pin the BLAS/OpenMP pools to one thread before numpy loads, so that a
+# single-core run uses one core and all-core runs scale by process count.
+# Only when run as a script (pool workers inherit it), and never over a
+# limit the caller already set
+if __name__ == "__main__":
+    for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS'):
+        os.environ.setdefault(_var, '1')
+
+import re
+import sys
+import json
+import time
+import zlib
+import socket
+import hashlib
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from array import array
+from functools import lru_cache
+from datetime import datetime, timezone
+
+import numpy as np
+
+from result_schema import SCHEMA_VERSION
+from tracing import span, trace_startup
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    # Falls back to `openssl speed`, then skips the AES metric
+    AESGCM = None
+
+# Bump whenever a kernel or its work size changes; scores are only
+# comparable between runs with the same benchmark_version
+BENCHMARK_VERSION = 2
+SEED = 20240607
+DEFAULT_REPEATS = 5
+QUICK_REPEATS = 3
+BARRIER_TIMEOUT = 300
+
+# Integer kernel: xorshift/multiply rounds over an L2-sized uint64 array
+INT_ELEMENTS = 1 << 15
+INT_ROUNDS = 400
+INT_OPS_PER_ROUND = 7
+INT_MULT = np.uint64(0x2545F4914F6CDD1D)
+
+# Float kernel: repeated float64 matrix multiply
+FLOAT_N = 192
+FLOAT_ROUNDS = 40
+
+# Compression and hash kernels work on one deterministic buffer
+ZLIB_BYTES = 4 << 20
+HASH_BYTES = 64 << 20
+HASH_ALGORITHMS = ('sha256', 'sha1', 'blake2b', 'md5')
+AES_BYTES = 64 << 20
+AES_BLOCK = 16384
+
+# STREAM arrays must be well beyond the last-level cache (4x, as in STREAM);
+# the cap holds the three arrays to 768 MiB on large server parts
+STREAM_MIN_ELEMENTS = 1 << 23
+STREAM_MAX_ELEMENTS = 1 << 25
+STREAM_SCALAR = 3.0
+# Bytes moved per element, counted the way STREAM does
+STREAM_BYTES = {'copy': 16, 'scale': 16, 'add': 24, 'triad': 24}
+
+# Pointer-chase working sets
+LATENCY_SIZES = (('32k', 32 << 10), ('256k', 256 << 10), ('2m', 2 << 20),
+                 ('8m', 8 << 20), ('32m', 32 << 20), ('128m', 128 << 20))
+LATENCY_STEPS = 1 << 21
+
+_barrier = None
+
+
+def _init_worker(barrier):
+    """Store the start barrier in each pool worker"""
+    global _barrier
+    _barrier = barrier
+
+
+def _sync():
+    """Wait until every worker is ready so all-core kernels overlap"""
+    if _barrier is not None:
+        _barrier.wait(BARRIER_TIMEOUT)
+
+
+def integer_kernel():
+    """Run xorshift64* rounds, returning the number of integer operations"""
+    x = np.arange(1, INT_ELEMENTS + 1, dtype=np.uint64) * INT_MULT
+    tmp = np.empty_like(x)
+    for _ in range(INT_ROUNDS):
+        np.left_shift(x, np.uint64(13), out=tmp)
+        np.bitwise_xor(x, tmp, out=x)
+        np.right_shift(x, np.uint64(7), out=tmp)
+        np.bitwise_xor(x, tmp, out=x)
+        np.left_shift(x, np.uint64(17), out=tmp)
+        np.bitwise_xor(x, tmp, out=x)
+        np.multiply(x, INT_MULT, out=x)
+    return INT_ELEMENTS * INT_ROUNDS * INT_OPS_PER_ROUND
+
+
+def float_kernel():
+    """Run float64 matrix multiplies, returning the number of flops"""
+    rng = np.random.default_rng(SEED)
+    a = rng.standard_normal((FLOAT_N, FLOAT_N))
+    b = rng.standard_normal((FLOAT_N, FLOAT_N)) / FLOAT_N
+    c = np.empty_like(a)
+    for _ in range(FLOAT_ROUNDS):
+        np.matmul(a, b, out=c)
+        a, c = c, a
+    return 2 * FLOAT_N ** 3 * FLOAT_ROUNDS
+
+
+@lru_cache(maxsize=None)
+def _text_buffer(size):
+    """Return a deterministic, moderately compressible byte buffer"""
+    rng = np.random.default_rng(SEED)
+    words = [bytes(rng.integers(97, 123, n, dtype=np.uint8)) for n in rng.integers(2, 10, 4096)]
+    picks = rng.integers(0, len(words), size // 4)
+    return b' '.join(words[i] for i in picks)[:size]
+
+
+def zlib_kernel():
+    """Compress a text buffer with zlib level 6, returning input bytes"""
+    data = _text_buffer(ZLIB_BYTES)
+    zlib.compress(data, 6)
+    return len(data)
+
+
+KERNELS = {
+    'int': integer_kernel,
+    'float': float_kernel,
+    'zlib': zlib_kernel,
+}
+
+
+def _run_timed(kernel):
+    """Run one kernel after the start barrier, returning (work, seconds)"""
+    _sync()
+    start = time.perf_counter()
+    work = KERNELS[kernel]()
+    return work, time.perf_counter() - start
+
+
+def measure_kernel(kernel, repeats, pool=None, workers=1):
+    """Return the median throughput (work per second) of a kernel"""
+    # Warm-up run (and worker start-up for the pool)
+    if pool is None:
+        _run_timed(kernel)
+    else:
+        pool.map(_run_timed, [kernel] * workers, chunksize=1)
+    rates = []
+    for _ in range(repeats):
+        if pool is None:
+            work, elapsed = _run_timed(kernel)
+            rates.append(work / elapsed)
+        else:
+            results = pool.map(_run_timed, [kernel] * workers, chunksize=1)
+            # Aggregate throughput over the slowest worker's wall time
+            rates.append(sum(r[0] for r in results) / max(r[1] for r in results))
+    return float(np.median(rates))
+
+
+def _stream_run(elements, repeats):
+    """Run STREAM copy/scale/add/triad, returning per-kernel seconds per repeat"""
+    a = np.full(elements, 1.0)
+    b = np.full(elements, 2.0)
+    c = np.zeros(elements)
+    times = {name: [] for name in STREAM_BYTES}
+    for _ in range(repeats + 1):
+        for name in STREAM_BYTES:
+            _sync()
+            start = time.perf_counter()
+            if name == 'copy':
+                np.copyto(c, a)
+            elif name == 'scale':
+                np.multiply(c, STREAM_SCALAR, out=b)
+            elif name == 'add':
+                np.add(a, b, out=c)
+            else:
+                # NumPy has no fused triad; the two passes move more bytes
+                # than the STREAM count, so scores trail the C reference
+                np.multiply(c, STREAM_SCALAR, out=a)
+                np.add(a, b, out=a)
+            times[name].append(time.perf_counter() - start)
+    # The first pass only faults the pages in
+    return {name: t[1:] for name, t in times.items()}
+
+
+def measure_stream(elements, repeats, pool=None, workers=1):
+    """Return the best STREAM bandwidth per kernel in MB/s"""
+    if pool is None:
+        runs = [_stream_run(elements, repeats)]
+    else:
+        share = elements // workers
+        runs = pool.starmap(_stream_run, [(share, repeats)] * workers, chunksize=1)
+        elements = share * workers
+
+    bandwidth = {}
+    for name, per_element in STREAM_BYTES.items():
+        # Like STREAM, report the best repeat; all workers share its wall time
+        slowest = [max(run[name][i] for run in runs) for i in range(repeats)]
+        bandwidth[name] = per_element * elements / min(slowest) / 1e6
+    return bandwidth
+
+
+def _chain(size_bytes, rng):
+    """Build a single random cycle over size_bytes worth of int64 slots"""
+    slots = size_bytes // 8
+    order = rng.permutation(slots)
+    nxt = np.empty(slots, dtype=np.int64)
+    nxt[order] = np.roll(order, -1)
+    chain = array('q')
+    chain.frombytes(nxt.tobytes())
+    return chain
+
+
+def _chase(chain, steps):
+    """Follow the chain for steps dependent loads, returning seconds"""
+    i = 0
+    start = time.perf_counter()
+    for _ in range(steps // 8):
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+        i = chain[i]
+    return time.perf_counter() - start
+
+
+def measure_latency(sizes, repeats):
+    """Return the time per dependent load of each working set in ns"""
+    # Each load is a bytecode-loop iteration, so the results are
+    # interpreter-bound: cache-resident sets report the dispatch floor and
+    # larger sets add their miss latency on top of it. They track the host's
+    # memory only between runs with the same python_version
+    rng = np.random.default_rng(SEED)
+    steps = LATENCY_STEPS
+
+    latency = {}
+    for label, size in sizes:
+        chain = _chain(size, rng)
+        _chase(chain, steps)  # warm-up
+        best = min(_chase(chain, steps) for _ in range(repeats))
+        latency[label] = best / steps * 1e9
+        del chain
+    return latency
+
+
+def measure_hashes(repeats):
+    """Return hashlib throughput in MB/s per algorithm"""
+    data = bytes(np.random.default_rng(SEED).integers(0, 256, HASH_BYTES, dtype=np.uint8))
+    rates = {}
+    for name in HASH_ALGORITHMS:
+        elapsed = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            hashlib.new(name, data).digest()
+            elapsed.append(time.perf_counter() - start)
+        rates[name] = HASH_BYTES / float(np.median(elapsed)) / 1e6
+    return rates
+
+
+def measure_aes(repeats):
+    """Return AES-256-GCM throughput in MB/s and the implementation used"""
+    if AESGCM is not None:
+        aead = AESGCM(bytes(range(32)))
+        block = bytes(AES_BLOCK)
+        nonce = bytes(12)
+        elapsed = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(AES_BYTES // AES_BLOCK):
+                aead.encrypt(nonce, block, None)
+            elapsed.append(time.perf_counter() - start)
+        return AES_BYTES / float(np.median(elapsed)) / 1e6, 'cryptography'
+
+    try:
+        output = subprocess.run(
+            ['openssl', 'speed', '-mr', '-evp', 'aes-256-gcm', '-bytes', str(AES_BLOCK), '-seconds', '1'],
+            capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None, ''
+    # Machine-readable result line: +F:<n>:<cipher>:<bytes per second>
+    match = re.search(r'^\+F:\d+:[^:]+:([\d.]+)', output, re.MULTILINE)
+    if not match:
+        return None, ''
+    return float(match.group(1)) / 1e6, 'openssl'
+
+
+def cpu_count():
+    """Return the number of CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _read_first(path, pattern):
+    """Return the first regex group matched in a file, or None"""
+    try:
+        with open(path, 'r') as f:
+            match = re.search(pattern, f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def last_level_cache_bytes():
+    """Return the size of the largest CPU cache, or 0 if unknown"""
+    largest = 0
+    cache_dir = '/sys/devices/system/cpu/cpu0/cache'
+    if os.path.isdir(cache_dir):
+        for index in os.listdir(cache_dir):
+            size = _read_first(os.path.join(cache_dir, index, 'size'), r'^(\d+)K')
+            if size:
+                largest = max(largest, int(size) * 1024)
+    return largest
+
+
+def available_memory_bytes():
+    """Return available memory in bytes, or None if unknown"""
+    available = _read_first('/proc/meminfo', r'^MemAvailable:\s+(\d+) kB')
+    if available:
+        return int(available) * 1024
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def stream_elements():
+    """Pick the STREAM array length: 4x the cache, bounded by free memory"""
+    elements = max(STREAM_MIN_ELEMENTS, 4 * last_level_cache_bytes() // 8)
+    elements = min(elements, STREAM_MAX_ELEMENTS)
+    available = available_memory_bytes()
+    if available:
+        # Three float64 arrays in at most a quarter of free memory
+        elements = min(elements, available // 4 // 24)
+    return int(elements)
+
+
+def blas_name():
+    """Return the BLAS library numpy was built against"""
+    try:
+        config = np.show_config(mode='dicts')
+        return str(config['Build Dependencies']['blas']['name'])
+    except (TypeError, KeyError, ValueError):
+        return 'unknown'
+
+
+def cpu_model():
+    """Return the CPU model string"""
+    model = _read_first('/proc/cpuinfo', r'^model name\s*:\s*(.+)$')
+    return (model or platform.processor() or platform.machine()).strip()
+
+
+def run_benchmark(quick=False, workers=None, skip_latency=False):
+    """Run every kernel and return the result document"""
+    repeats = QUICK_REPEATS if quick else DEFAULT_REPEATS
+    workers = workers or cpu_count()
+    sizes = LATENCY_SIZES[:-1] if quick else LATENCY_SIZES
+    elements = stream_elements()
+    results = {}
+
+    with span('cpu_memory.single_core', 'measure'):
+        print("Running single-core kernels...", file=sys.stderr)
+        results['int_1t_mops'] = measure_kernel('int', repeats) / 1e6
+        results['float_1t_gflops'] = measure_kernel('float', repeats) / 1e9
+        results['zlib_1t_mbps'] = measure_kernel('zlib', repeats) / 1e6
+
+    with span('cpu_memory.crypto', 'measure'):
+        print("Running hash and AES kernels...", file=sys.stderr)
+        for name, rate in measure_hashes(repeats).items():
+            results[f'{name}_mbps'] = rate
+        aes_rate, aes_impl = measure_aes(repeats)
+        if aes_rate is not None:
+            results['aes_256_gcm_mbps'] = aes_rate
+
+    with span('cpu_memory.stream_1t', 'measure'):
+        print("Running single-core STREAM...", file=sys.stderr)
+        results['stream_triad_1t_mbps'] = measure_stream(elements, repeats)['triad']
+
+    if not skip_latency:
+        with span('cpu_memory.latency', 'measure'):
+            print("Running cache latency pointer chase...", file=sys.stderr)
+            for label, ns in measure_latency(sizes, repeats).items():
+                results[f'mem_latency_{label}_ns'] = ns
+
+    barrier = multiprocessing.Barrier(workers)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(barrier,)) as pool:
+        with span('cpu_memory.all_core', 'measure', workers=workers):
+            print(f"Running all-core kernels on {workers} workers...", file=sys.stderr)
+            results['int_mt_mops'] = measure_kernel('int', repeats, pool, workers) / 1e6
+            results['float_mt_gflops'] = measure_kernel('float', repeats, pool, workers) / 1e9
+            results['zlib_mt_mbps'] = measure_kernel('zlib', repeats, pool, workers) / 1e6
+
+        with span('cpu_memory.stream', 'measure', workers=workers):
+            print("Running all-core STREAM...", file=sys.stderr)
+            for name, rate in measure_stream(elements, repeats, pool, workers).items():
+                results[f'stream_{name}_mbps'] = rate
+
+    results['bench_workers'] = workers
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'test_type': 'cpu_memory',
+        'benchmark_version': BENCHMARK_VERSION,
+        'host': socket.gethostname(),
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'seed': SEED,
+        'repeats': repeats,
+        'quick': quick,
+        'stream_elements': elements,
+        'cpu_model': cpu_model(),
+        'arch': platform.machine(),
+        'python_version': platform.python_version(),
+        'numpy_version': np.__version__,
+        'blas': blas_name(),
+        'aes_implementation': aes_impl,
+        'results': {name: round(value, 3) for name, value in results.items()},
+    }
+
+
+def print_results(doc):
+    """Print a short table of the benchmark results"""
+    print(f"\nCPU/Memory Benchmark v{doc['benchmark_version']} ({doc['cpu_model']}, "
+          f"{doc['results']['bench_workers']} workers)")
+    print("-" * 50)
+    for name, value in doc['results'].items():
+        if name != 'bench_workers':
+            print(f"  {name:<28} {value:>14,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline CPU and memory benchmark')
+    parser.add_argument('-o', '--output', help='Write the JSON result to this file')
+    parser.add_argument('-q', '--quick', action='store_true', help='Fewer repeats and no 128 MiB latency set')
+    parser.add_argument('-w', '--workers', type=int, help='Processes for all-core kernels (default: all CPUs)')
+    parser.add_argument('--no-latency', action='store_true', help='Skip the (interpreter-bound) pointer-chase latency test')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+
+    args = parser.parse_args()
+    trace_startup('cpu_memory_benchmark')
+
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+
+    with span('cpu_memory_benchmark.run', 'measure'):
+        doc = run_benchmark(args.quick, args.workers, args.no_latency)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, indent=2)
+        print(f"Results saved to: {args.output}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(doc, indent=2))
+    else:
+        print_results(doc)
+
+if __name__ == "__main__":
+    main()
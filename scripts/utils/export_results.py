@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Streaming long-format export of normalized results
+Writes one row per metric (host, run, phase, test, target, metric, value, unit,
+timestamp) as CSV or NDJSON, optionally gzipped, in constant memory
+"""
+
+import os
+import sys
+import csv
+import gzip
+import json
+import argparse
+
+from result_schema import iter_records, metric_unit, MANIFEST_NAME, classify_filename
+from tracing import span, trace_startup
+
+COLUMNS = ('host', 'run', 'phase', 'test', 'target', 'metric', 'value', 'unit', 'timestamp')
+
+FORMATS = ('csv', 'ndjson')
+# Output file extensions, checked after an optional .gz
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'ndjson'}
+
+
+def is_run_dir(path):
+    """Return True if a directory holds the results of a run"""
+    if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+        return True
+    with os.scandir(path) as entries:
+        return any(e.is_file() and classify_filename(e.name) for e in entries)
+
+
+def find_run_dirs(paths, recursive=False):
+    """Yield run directories under the given paths in a stable order"""
+    for path in paths:
+        if not recursive:
+            yield path
+            continue
+        for root, dirs, _ in os.walk(path):
+            # Skip caches and checkpoints (results/.cache, .checkpoints)
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            if is_run_dir(root):
+                yield root
+
+
+def iter_rows(run_dirs, host=None):
+    """Yield one long-format row per metric of every record"""
+    for run_dir in run_dirs:
+        run = os.path.basename(os.path.normpath(run_dir))
+        for record in iter_records(run_dir):
+            # A host recorded in the run's manifest wins over the --host fallback
+            row_host = record['host'] or host
+            for metric, value in sorted(record['metrics'].items()):
+                yield (row_host, run, record['phase'], record['test'], record['target'],
+                       metric, value, metric_unit(metric), record['timestamp'])
+
+
+def detect_format(output):
+    """Return (format, gzip) implied by an output file name, or (None, False)"""
+    name = output.lower()
+    compressed = name.endswith('.gz')
+    if compressed:
+        name = name[:-3]
+    return EXTENSIONS.get(os.path.splitext(name)[1]), compressed
+
+
+def open_output(output, compressed):
+    """Open the output for text writing ('-' is stdout)"""
+    if output == '-':
+        if compressed:
+            return gzip.open(sys.stdout.buffer, 'wt', newline='')
+        return open(sys.stdout.fileno(), 'w', newline='', closefd=False)
+    if compressed:
+        return gzip.open(output, 'wt', newline='')
+    return open(output, 'w', newline='')
+
+
+def write_rows(rows, out, fmt):
+    """Write rows to an open text file, returning the number written"""
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(dict(zip(COLUMNS, row))) + '\n')
+            count += 1
+    return count
+
+
+def main():
+    trace_startup('export_results')
+    parser = argparse.ArgumentParser(description='Export results as long-format CSV or NDJSON (one row per metric)')
+    parser.add_argument('results_dirs', nargs='+', help='Directories containing test results')
+    parser.add_argument('-o', '--output', default='-',
+                        help='Output file; .csv, .ndjson or .jsonl, optionally .gz (default: stdout)')
+    parser.add_argument('-f', '--format', choices=FORMATS, help='Output format (default: from the file name, else csv)')
+    parser.add_argument('-z', '--gzip', action='store_true', help='Gzip the output (implied by a .gz file name)')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='Export every run directory below the given directories')
+    parser.add_argument('--host', help='Host name for runs without a manifest')
+
+    args = parser.parse_args()
+
+    for results_dir in args.results_dirs:
+        if not os.path.isdir(results_dir):
+            print(f"Error: Results directory not found: {results_dir}", file=sys.stderr)
+            sys.exit(1)
+
+    fmt, compressed = detect_format(args.output)
+    fmt = args.format or fmt or 'csv'
+    compressed = compressed or args.gzip
+
+    rows = iter_rows(find_run_dirs(args.results_dirs, args.recursive), args.host)
+    with span('export_results.write', 'io', format=fmt, gzip=compressed):
+        with open_output(args.output, compressed) as out:
+            count = write_rows(rows, out, fmt)
+
+    if args.output != '-':
+        print(f"Exported {count} rows to: {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
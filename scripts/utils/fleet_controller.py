@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+
+"""
+Multi-node controller for the performance test suite
+Pushes the scripts to every host in an inventory over multiplexed SSH, runs the
+suite on several hosts at once and indexes the fetched results in one store
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shlex
+import shutil
+import sqlite3
+import hashlib
+import tarfile
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from result_schema import iter_records
+from tracing import span, trace_startup
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+DEFAULT_STORE = os.path.join(PROJECT_ROOT, 'results', 'fleet_index.db')
+DEFAULT_FETCH_DIR = os.path.join(PROJECT_ROOT, 'results', 'fleet')
+DEFAULT_REMOTE_DIR = 'yabs-fleet'
+
+# Everything the suite needs on a remote host, relative to the project root
+PUSH_PATHS = ('yabs.sh', 'yabs_extended.sh', 'lib', 'scripts/core', 'scripts/utils', 'configs')
+PUSH_EXCLUDE = ('__pycache__', '.pyc')
+
+# Inventory keys besides name and address
+HOST_KEYS = ('user', 'port', 'identity', 'remote_dir')
+
+# Suite test selection flags: the local part (CPU/memory, DNS) runs on every
+# host at once, the bandwidth-heavy part (YABS, network, transfer) waits for an
+# uplink slot
+LOCAL_TEST_FLAGS = ['-Y', '-N', '-T']
+HEAVY_TEST_FLAGS = ['-C', '-D']
+
+# The suite's run journal; it records 'suite complete' once every test it was
+# asked to run succeeded
+JOURNAL_NAME = 'run_journal.jsonl'
+
+SSH_CONNECT_TIMEOUT = 10
+# How long an idle master connection is kept open (seconds)
+SSH_CONTROL_PERSIST = 600
+
+# Exit codes
+EXIT_OK = 0
+EXIT_HOST_FAILED = 1
+EXIT_ERROR = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT NOT NULL,
+    host TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started TEXT,
+    finished TEXT,
+    results_dir TEXT,
+    error TEXT,
+    PRIMARY KEY (run_id, host)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    host TEXT NOT NULL,
+    test TEXT NOT NULL,
+    target TEXT,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS metrics_host ON metrics (host, test, metric, timestamp);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id, host);
+'''
+
+
+class InventoryError(ValueError):
+    """Raised when an inventory file cannot be parsed"""
+
+
+def load_inventory(path):
+    """Parse an inventory file: one host per line as 'name address [key=value ...]'"""
+    hosts = []
+    with open(path, 'r') as f:
+        for lineno, line in enumerate(f, 1):
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            if len(fields) < 2:
+                raise InventoryError(f"{path}:{lineno}: expected 'name address [key=value ...]'")
+            host = {'name': fields[0], 'address': fields[1]}
+            for option in fields[2:]:
+                key, sep, value = option.partition('=')
+                if not sep or key not in HOST_KEYS:
+                    raise InventoryError(f"{path}:{lineno}: unknown option '{option}' "
+                                         f"(expected {', '.join(HOST_KEYS)})")
+                host[key] = value
+            if any(h['name'] == host['name'] for h in hosts):
+                raise InventoryError(f"{path}:{lineno}: duplicate host name '{host['name']}'")
+            hosts.append(host)
+    if not hosts:
+        raise InventoryError(f"{path}: no hosts")
+    return hosts
+
+
+def build_bundle():
+    """Pack the suite into a gzipped tarball, returning (bytes, content hash)"""
+    files = []
+    for path in PUSH_PATHS:
+        full = os.path.join(PROJECT_ROOT, path)
+        if os.path.isfile(full):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(full):
+            dirs[:] = sorted(d for d in dirs if d not in PUSH_EXCLUDE)
+            for name in sorted(names):
+                if not name.endswith(PUSH_EXCLUDE):
+                    files.append(os.path.relpath(os.path.join(root, name), PROJECT_ROOT))
+
+    # Hash contents and modes only, so an unchanged tree is not pushed again
+    digest = hashlib.sha256()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for path in files:
+            full = os.path.join(PROJECT_ROOT, path)
+            with open(full, 'rb') as f:
+                digest.update(path.encode() + b'\0' + f.read() + b'\0')
+            digest.update(str(os.stat(full).st_mode & 0o111).encode())
+            tar.add(full, arcname=path)
+    return buffer.getvalue(), digest.hexdigest()
+
+
+class SSHHost:
+    """One inventory host behind a persistent, multiplexed SSH master connection"""
+
+    def __init__(self, host, control_dir, ssh='ssh'):
+        self.name = host['name']
+        self.remote_dir = host.get('remote_dir', DEFAULT_REMOTE_DIR)
+        self.base = [ssh, '-o', 'BatchMode=yes', '-o', f'ConnectTimeout={SSH_CONNECT_TIMEOUT}',
+                     '-o', 'ControlMaster=auto', '-o', f'ControlPath={control_dir}/%C',
+                     '-o', f'ControlPersist={SSH_CONTROL_PERSIST}']
+        if 'user' in host:
+            self.base += ['-l', host['user']]
+        if 'port' in host:
+            self.base += ['-p', host['port']]
+        if 'identity' in host:
+            self.base += ['-i', os.path.expanduser(host['identity'])]
+        self.base.append(host['address'])
+
+    def run(self, command, **kwargs):
+        """Run a shell command on the host through the shared master connection"""
+        return subprocess.run(self.base + [command], **kwargs)
+
+    def connect(self):
+        """Open the master connection; every later command reuses it"""
+        proc = self.run('true', stdin=subprocess.DEVNULL, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"SSH connection failed: {proc.stderr.strip() or f'exit {proc.returncode}'}")
+
+    def close(self):
+        """Shut down the master connection"""
+        subprocess.run(self.base[:-1] + ['-O', 'exit', self.base[-1]],
+                       stdin=subprocess.DEVNULL, capture_output=True)
+
+    def push(self, bundle, version):
+        """Unpack the suite into the remote directory unless this version is already there"""
+        rd = shlex.quote(self.remote_dir)
+        proc = self.run(f'cat {rd}/.fleet_version 2>/dev/null', stdin=subprocess.DEVNULL,
+                        capture_output=True, text=True)
+        if proc.stdout.strip() == version:
+            return False
+        proc = self.run(f'mkdir -p {rd} && tar xzf - -C {rd} && echo {version} > {rd}/.fleet_version',
+                        input=bundle, capture_output=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"push failed: {proc.stderr.decode(errors='replace').strip()}")
+        return True
+
+    def run_suite(self, args, log):
+        """Run the suite in the remote directory, appending its output to log"""
+        command = f'cd {shlex.quote(self.remote_dir)} && bash scripts/core/performance_test_suite.sh ' + \
+            ' '.join(shlex.quote(a) for a in args)
+        log.write(f"$ {command}\n")
+        log.flush()
+        return self.run(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT).returncode
+
+    def fetch(self, remote_results, dest):
+        """Stream a remote results directory into dest"""
+        parent, name = os.path.split(remote_results)
+        command = f'cd {shlex.quote(self.remote_dir)}/{shlex.quote(parent)} && tar czf - {shlex.quote(name)}'
+        proc = subprocess.Popen(self.base + [command], stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode='r|gz') as tar:
+                if hasattr(tarfile, 'data_filter'):
+                    tar.extractall(dest, filter='data')
+                else:
+                    tar.extractall(dest)
+        except tarfile.TarError as e:
+            proc.kill()
+            raise RuntimeError(f"fetch failed: {e}") from e
+        finally:
+            stderr = proc.communicate()[1]
+        if proc.returncode != 0:
+            raise RuntimeError(f"fetch failed: {stderr.decode(errors='replace').strip()}")
+        return os.path.join(dest, name)
+
+
+class UplinkGate:
+    """Limit how many hosts run bandwidth-heavy tests at once, spacing out their starts"""
+
+    def __init__(self, slots, stagger):
+        self.slots = threading.BoundedSemaphore(slots)
+        self.stagger = stagger
+        self.lock = threading.Lock()
+        self.last_start = 0.0
+
+    def __enter__(self):
+        self.slots.acquire()
+        with self.lock:
+            wait = self.last_start + self.stagger - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.slots.release()
+
+
+class FleetStore:
+    """SQLite index of every fleet run and the metrics of its results"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        """Commit and close the store"""
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_run(self, run_id, phase, result):
+        """Record a host's run and index its results, returning the number of metrics added"""
+        self.db.execute('DELETE FROM metrics WHERE run_id = ? AND host = ?', (run_id, result['host']))
+        self.db.execute('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (run_id, result['host'], phase, result['status'], result['started'],
+                         result['finished'], result.get('results_dir'), result.get('error')))
+        added = 0
+        if result.get('results_dir'):
+            for record in iter_records(result['results_dir']):
+                rows = [(run_id, result['host'], record['test'], record['target'], metric, float(value),
+                         record['timestamp']) for metric, value in record['metrics'].items()]
+                self.db.executemany('INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                added += len(rows)
+        self.db.commit()
+        return added
+
+    def runs(self, host=None):
+        """Return recorded runs, newest first"""
+        query = 'SELECT r.*, COUNT(m.metric) FROM runs r LEFT JOIN metrics m USING (run_id, host)'
+        params = ()
+        if host:
+            query += ' WHERE r.host = ?'
+            params = (host,)
+        query += ' GROUP BY r.run_id, r.host ORDER BY r.started DESC, r.host'
+        columns = ('run_id', 'host', 'phase', 'status', 'started', 'finished', 'results_dir', 'error', 'metrics')
+        return [dict(zip(columns, row)) for row in self.db.execute(query, params).fetchall()]
+
+
+def completed_suites(results_dir):
+    """Count the suite runs the run journal in results_dir records as complete"""
+    count = 0
+    try:
+        with open(os.path.join(results_dir, JOURNAL_NAME), 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if (entry.get('step'), entry.get('inputs'), entry.get('status')) == ('suite', 'complete', 'done'):
+                    count += 1
+    except FileNotFoundError:
+        pass
+    return count
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class Controller:
+    """Runs the suite across an inventory"""
+
+    def __init__(self, hosts, args):
+        self.hosts = hosts
+        self.args = args
+        self.started = datetime.now()
+        self.run_id = self.started.strftime('%Y%m%d-%H%M%S')
+        # Same naming as the suite's own results directories
+        self.results_name = f"{args.phase}_{self.started.strftime('%b-%d-%Y_%H-%M-%S')}-Extended-Test-Suite-Results"
+        self.gate = UplinkGate(args.uplink_slots, args.stagger) if args.uplink_slots > 0 else None
+        self.print_lock = threading.Lock()
+        self.bundle = None
+        self.version = None
+
+    def log(self, host, message):
+        with self.print_lock:
+            print(f"[{host}] {message}", flush=True)
+
+    def run_host(self, host, control_dir):
+        """Push, run and fetch one host; never raises, failures are reported in the result"""
+        name = host['name']
+        result = {'host': name, 'status': 'failed', 'started': _now(), 'finished': None}
+        ssh = SSHHost(host, control_dir, self.args.ssh)
+        fetch_dir = os.path.join(self.args.fetch_dir, name)
+        os.makedirs(fetch_dir, exist_ok=True)
+        remote_results = f'results/{self.results_name}'
+        suite_args = ['-p', self.args.phase, '--results-dir', remote_results] + self.args.suite_args
+
+        try:
+            with span('fleet.connect', 'setup', host=name):
+                ssh.connect()
+            with span('fleet.push', 'setup', host=name):
+                pushed = ssh.push(self.bundle, self.version)
+            self.log(name, 'scripts pushed' if pushed else 'scripts up to date')
+
+            with open(os.path.join(fetch_dir, f'{self.run_id}.log'), 'a') as log:
+                if self.gate is None:
+                    self.log(name, 'running suite')
+                    with span('fleet.suite', 'measure', host=name):
+                        status = ssh.run_suite(suite_args, log)
+                else:
+                    self.log(name, 'running local tests')
+                    with span('fleet.suite_local', 'measure', host=name):
+                        status = ssh.run_suite(suite_args + LOCAL_TEST_FLAGS, log)
+                    self.log(name, 'waiting for an uplink slot')
+                    with self.gate:
+                        self.log(name, 'running bandwidth-heavy tests')
+                        with span('fleet.suite_heavy', 'measure', host=name):
+                            status = ssh.run_suite(suite_args + HEAVY_TEST_FLAGS, log) or status
+
+            with span('fleet.fetch', 'io', host=name):
+                result['results_dir'] = ssh.fetch(remote_results, fetch_dir)
+            # Only report results as ok when the fetched journal shows every
+            # suite run completed, not just a zero exit status
+            runs = 1 if self.gate is None else 2
+            completed = completed_suites(result['results_dir'])
+            result['status'] = 'ok' if status == 0 and completed >= runs else 'suite_failed'
+            if status != 0:
+                result['error'] = f'suite exited with status {status}'
+            elif completed < runs:
+                result['error'] = f'run journal records {completed} of {runs} suite runs as complete'
+        except (OSError, RuntimeError) as e:
+            result['error'] = str(e)
+        finally:
+            ssh.close()
+        result['finished'] = _now()
+        return result
+
+    def run(self, store):
+        """Run every host with at most --concurrency at once, indexing results as hosts finish"""
+        with span('fleet.bundle', 'setup'):
+            self.bundle, self.version = build_bundle()
+
+        results = []
+        control_dir = tempfile.mkdtemp(prefix='yabs-ssh-')
+        try:
+            with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+                futures = [pool.submit(self.run_host, host, control_dir) for host in self.hosts]
+                for future in as_completed(futures):
+                    result = future.result()
+                    with span('fleet.index', 'analysis', host=result['host']):
+                        metrics = store.add_run(self.run_id, self.args.phase, result)
+                    status = result['status'] if 'error' not in result else f"{result['status']}: {result['error']}"
+                    self.log(result['host'], f"{status} ({metrics} metrics indexed)")
+                    results.append(result)
+        finally:
+            shutil.rmtree(control_dir, ignore_errors=True)
+        return results
+
+
+def main():
+    trace_startup('fleet_controller')
+    parser = argparse.ArgumentParser(description='Run the performance test suite across many hosts over SSH')
+    parser.add_argument('-s', '--store', default=DEFAULT_STORE, help='Results store (default: results/fleet_index.db)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check = subparsers.add_parser('check', help='Check SSH access to every host')
+    check.add_argument('inventory', help='Inventory file')
+    check.add_argument('--ssh', default='ssh', help='SSH client to use (default: ssh)')
+
+    run = subparsers.add_parser('run', help='Run the suite on every host',
+                                usage='%(prog)s [options] inventory [-- suite options]')
+    run.add_argument('inventory', help='Inventory file')
+    run.add_argument('-p', '--phase', choices=['pre', 'post'], default='pre', help='Test phase (default: pre)')
+    run.add_argument('-j', '--concurrency', type=int, default=4, help='Hosts running at once (default: 4)')
+    run.add_argument('-u', '--uplink-slots', type=int, default=1,
+                     help='Hosts running bandwidth-heavy tests at once; 0 runs the suite in one go (default: 1)')
+    run.add_argument('--stagger', type=float, default=0,
+                     help='Minimum seconds between bandwidth-heavy test starts (default: 0)')
+    run.add_argument('-o', '--fetch-dir', default=DEFAULT_FETCH_DIR, help='Local results directory (default: results/fleet)')
+    run.add_argument('--ssh', default='ssh', help='SSH client to use (default: ssh)')
+
+    runs = subparsers.add_parser('runs', help='List runs in the store')
+    runs.add_argument('--host', help='Only runs of this host')
+
+    # Everything after '--' is passed to performance_test_suite.sh, e.g. -- -q --server 10.0.0.5
+    argv = sys.argv[1:]
+    suite_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, suite_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    args.suite_args = suite_args
+
+    if args.command == 'runs':
+        if not os.path.exists(args.store):
+            print(f"Error: Store not found: {args.store}")
+            sys.exit(EXIT_ERROR)
+        with FleetStore(args.store) as store:
+            recorded = store.runs(args.host)
+        if args.json:
+            print(json.dumps(recorded, indent=2))
+            return
+        for r in recorded:
+            print(f"  {r['run_id']}  {r['host']:<20} {r['phase']:<5} {r['status']:<13} {r['metrics']:>6} metrics  "
+                  f"{r['error'] or ''}")
+        return
+
+    try:
+        hosts = load_inventory(args.inventory)
+    except (OSError, InventoryError) as e:
+        print(f"Error: {e}")
+        sys.exit(EXIT_ERROR)
+
+    if args.command == 'check':
+        control_dir = tempfile.mkdtemp(prefix='yabs-ssh-')
+        failed = 0
+        for host in hosts:
+            ssh = SSHHost(host, control_dir, args.ssh)
+            try:
+                ssh.connect()
+                print(f"  ✓ {host['name']}")
+            except (OSError, RuntimeError) as e:
+                print(f"  ✗ {host['name']}: {e}")
+                failed += 1
+            finally:
+                ssh.close()
+        shutil.rmtree(control_dir, ignore_errors=True)
+        sys.exit(EXIT_HOST_FAILED if failed else EXIT_OK)
+
+    if args.concurrency < 1 or args.uplink_slots < 0:
+        print("Error: --concurrency must be at least 1 and --uplink-slots at least 0")
+        sys.exit(EXIT_ERROR)
+
+    controller = Controller(hosts, args)
+    print(f"Fleet run {controller.run_id}: {len(hosts)} host(s), concurrency {args.concurrency}, "
+          f"uplink slots {args.uplink_slots or 'unlimited'}")
+    with FleetStore(args.store) as store:
+        with span('fleet.run', 'measure', hosts=len(hosts)):
+            results = controller.run(store)
+
+    failed = [r for r in results if r['status'] != 'ok']
+    if args.json:
+        print(json.dumps({'run_id': controller.run_id, 'hosts': results}, indent=2))
+    else:
+        print(f"\n{len(results) - len(failed)}/{len(results)} host(s) ok, results indexed in {args.store}")
+    sys.exit(EXIT_HOST_FAILED if failed else EXIT_OK)
+
+if __name__ == "__main__":
+    main()
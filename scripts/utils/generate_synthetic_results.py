@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+
+"""
+Generate synthetic performance test results for benchmarking the result tooling
+Writes realistic ping, iperf3, DNS, transfer and yabs artifacts with run manifests
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from result_schema import SCHEMA_VERSION, MANIFEST_NAME
+from tracing import span, trace_startup
+
+PING_DESTINATIONS = ['8.8.8.8', '1.1.1.1']
+IPERF_SERVER = '192.168.1.100'
+DNS_SERVERS = ['8.8.8.8', '1.1.1.1']
+DNS_DOMAINS = ['google.com', 'cloudflare.com', 'github.com', 'amazon.com', 'wikipedia.org']
+TRANSFER_HOST = 'user@192.168.1.100'
+TRANSFER_URL = 'http://speedtest.tele2.net/100MB.zip'
+TRANSFER_FILE_SIZE = 100 * 1048576
+
+CPU_MODELS = [
+    ('AMD EPYC 7763 64-Core Processor', 2445.406),
+    ('Intel Xeon Platinum 8375C CPU @ 2.90GHz', 2899.998),
+    ('AMD Ryzen 9 5950X 16-Core Processor', 3400.000),
+    ('Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz', 2399.996),
+]
+DISTROS = ['Ubuntu 22.04.4 LTS', 'Debian GNU/Linux 12 (bookworm)', 'Rocky Linux 9.3 (Blue Onyx)']
+KERNELS = ['5.15.0-105-generic', '6.1.0-18-amd64', '5.14.0-362.8.1.el9_3.x86_64']
+VM_TYPES = ['KVM', 'KVM', 'VMWARE', 'NONE']
+
+# Run start times advance by this much so every file name is unique
+RUN_INTERVAL = timedelta(minutes=7)
+
+
+def host_profile(rng, index):
+    """Draw the baseline performance characteristics of one synthetic host"""
+    cpu_model, cpu_freq = CPU_MODELS[index % len(CPU_MODELS)]
+    cores = rng.choice([2, 4, 8, 16])
+    return {
+        'name': f'bench-host-{index:03d}',
+        'cpu_model': cpu_model,
+        'cpu_freq': cpu_freq,
+        'cores': cores,
+        'ram_gib': rng.choice([3.8, 7.8, 15.6, 31.3]),
+        'swap_mib': rng.choice([0, 1024, 2048]),
+        'disk_gib': rng.choice([24.5, 49.1, 98.3, 196.7]),
+        'distro': rng.choice(DISTROS),
+        'kernel': rng.choice(KERNELS),
+        'virt': rng.choice(VM_TYPES),
+        'rtt_ms': rng.uniform(2, 60),
+        'tcp_mbps': rng.uniform(200, 9000),
+        'udp_mbps': 50.0,
+        'jitter_ms': rng.uniform(0.01, 0.5),
+        'dns_ms': rng.uniform(5, 40),
+        'transfer_mbps': rng.uniform(20, 400),
+        'disk_kbps': rng.uniform(80000, 1500000),
+        'gb_single': rng.randint(800, 2200),
+    }
+
+
+def apply_drift(profile, drift):
+    """Return a copy of a host profile with performance shifted by drift percent"""
+    factor = 1 + drift / 100
+    shifted = dict(profile)
+    for key in ('tcp_mbps', 'transfer_mbps', 'disk_kbps'):
+        shifted[key] = profile[key] * factor
+    for key in ('rtt_ms', 'jitter_ms', 'dns_ms'):
+        shifted[key] = profile[key] / factor
+    shifted['gb_single'] = int(profile['gb_single'] * factor)
+    return shifted
+
+
+def ping_results(rng, profile, dest, count, clock, raw_name):
+    """Build ping JSON and the raw ping output it was parsed from"""
+    base = profile['rtt_ms'] * rng.uniform(0.8, 1.2)
+    rtts = []
+    lines = [f"PING {dest} ({dest}) 56(84) bytes of data."]
+    for seq in range(1, count + 1):
+        if rng.random() < 0.002:
+            continue
+        rtt = base + rng.expovariate(1 / max(0.05, base * 0.05))
+        rtts.append(rtt)
+        lines.append(f"64 bytes from {dest}: icmp_seq={seq} ttl=117 time={rtt:.3g} ms")
+
+    received = len(rtts)
+    loss = round(100 * (count - received) / count)
+    mean = sum(rtts) / received
+    mdev = (sum((r - mean) ** 2 for r in rtts) / received) ** 0.5
+    lines += [
+        '',
+        f"--- {dest} ping statistics ---",
+        f"{count} packets transmitted, {received} received, {loss}% packet loss, time {count * 1000 - 1}ms",
+        f"rtt min/avg/max/mdev = {min(rtts):.3f}/{mean:.3f}/{max(rtts):.3f}/{mdev:.3f} ms",
+    ]
+
+    data = {
+        'schema_version': SCHEMA_VERSION,
+        'test_type': 'ping',
+        'host': profile['name'],
+        'destination': dest,
+        'timestamp': clock.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'packets_transmitted': count,
+        'packets_received': received,
+        'packet_loss_percent': loss,
+        'rtt_min_ms': round(min(rtts), 3),
+        'rtt_avg_ms': round(mean, 3),
+        'rtt_max_ms': round(max(rtts), 3),
+        'rtt_stddev_ms': round(mdev, 3),
+        'ping_count': count,
+        'output_file': raw_name,
+    }
+    return data, '\n'.join(lines) + '\n'
+
+
+def _iperf_start(profile, clock, protocol, duration):
+    """Build the 'start' block shared by iperf3 TCP and UDP output"""
+    return {
+        'connected': [{'socket': 5, 'local_host': '192.168.1.50', 'local_port': 51724,
+                       'remote_host': IPERF_SERVER, 'remote_port': 5201}],
+        'version': 'iperf 3.12',
+        'system_info': f"Linux {profile['name']} {profile['kernel']} #1 SMP x86_64",
+        'timestamp': {'time': clock.strftime('%a, %d %b %Y %H:%M:%S GMT'),
+                      'timesecs': int(clock.timestamp())},
+        'connecting_to': {'host': IPERF_SERVER, 'port': 5201},
+        'cookie': f"{profile['name']}{int(clock.timestamp())}".ljust(36, 'x')[:36],
+        'tcp_mss_default': 1448,
+        'sock_bufsize': 0,
+        'sndbuf_actual': 16384,
+        'rcvbuf_actual': 131072,
+        'test_start': {'protocol': protocol, 'num_streams': 1,
+                       'blksize': 131072 if protocol == 'TCP' else 1448, 'omit': 0,
+                       'duration': duration, 'bytes': 0, 'blocks': 0, 'reverse': 0,
+                       'tos': 0, 'target_bitrate': 0 if protocol == 'TCP' else 50000000,
+                       'bidir': 0, 'fqrate': 0, 'interval': 1},
+    }
+
+
+def _cpu_utilization(rng):
+    """Build an iperf3 cpu_utilization_percent block"""
+    user, system = rng.uniform(0.5, 5), rng.uniform(5, 40)
+    remote_user, remote_system = rng.uniform(0.1, 2), rng.uniform(2, 20)
+    return {'host_total': user + system, 'host_user': user, 'host_system': system,
+            'remote_total': remote_user + remote_system, 'remote_user': remote_user,
+            'remote_system': remote_system}
+
+
+def iperf_tcp_results(rng, profile, duration, clock):
+    """Build iperf3 -J output for a TCP test, including per-second intervals"""
+    intervals = []
+    total_bytes = 0
+    retransmits = 0
+    for second in range(duration):
+        bps = profile['tcp_mbps'] * 1e6 * rng.uniform(0.85, 1.05)
+        nbytes = int(bps / 8)
+        retr = rng.choice([0, 0, 0, 1, 2, 5])
+        total_bytes += nbytes
+        retransmits += retr
+        interval = {'socket': 5, 'start': float(second), 'end': float(second + 1), 'seconds': 1.0,
+                    'bytes': nbytes, 'bits_per_second': nbytes * 8.0, 'retransmits': retr,
+                    'snd_cwnd': rng.randint(200000, 4000000), 'snd_wnd': 3145728,
+                    'rtt': int(profile['rtt_ms'] * 1000 * rng.uniform(0.9, 1.3)),
+                    'rttvar': rng.randint(50, 2000), 'pmtu': 1500, 'omitted': False, 'sender': True}
+        summary = {key: interval[key] for key in ('start', 'end', 'seconds', 'bytes',
+                                                  'bits_per_second', 'retransmits', 'omitted', 'sender')}
+        intervals.append({'streams': [interval], 'sum': summary})
+
+    sent = {'start': 0, 'end': float(duration), 'seconds': float(duration), 'bytes': total_bytes,
+            'bits_per_second': total_bytes * 8.0 / duration, 'retransmits': retransmits, 'sender': True}
+    received_bytes = int(total_bytes * rng.uniform(0.995, 1.0))
+    received = {'start': 0, 'end': duration + 0.04, 'seconds': duration + 0.04,
+                'bytes': received_bytes, 'bits_per_second': received_bytes * 8.0 / (duration + 0.04),
+                'sender': True}
+    return {
+        'start': _iperf_start(profile, clock, 'TCP', duration),
+        'intervals': intervals,
+        'end': {
+            'streams': [{'sender': dict(sent, socket=5, max_snd_cwnd=4000000, max_rtt=0,
+                                        min_rtt=0, mean_rtt=0),
+                         'receiver': dict(received, socket=5)}],
+            'sum_sent': sent,
+            'sum_received': received,
+            'cpu_utilization_percent': _cpu_utilization(rng),
+            'sender_tcp_congestion': 'cubic',
+            'receiver_tcp_congestion': 'cubic',
+        },
+    }
+
+
+def iperf_udp_results(rng, profile, duration, clock):
+    """Build iperf3 -u -J output for a UDP test, including per-second intervals"""
+    intervals = []
+    total_bytes = 0
+    total_packets = 0
+    for second in range(duration):
+        packets = int(profile['udp_mbps'] * 1e6 / 8 / 1448 * rng.uniform(0.98, 1.0))
+        nbytes = packets * 1448
+        total_bytes += nbytes
+        total_packets += packets
+        interval = {'socket': 5, 'start': float(second), 'end': float(second + 1), 'seconds': 1.0,
+                    'bytes': nbytes, 'bits_per_second': nbytes * 8.0, 'packets': packets,
+                    'omitted': False, 'sender': True}
+        summary = {key: interval[key] for key in ('start', 'end', 'seconds', 'bytes',
+                                                  'bits_per_second', 'packets', 'omitted', 'sender')}
+        intervals.append({'streams': [interval], 'sum': summary})
+
+    lost = int(total_packets * rng.choice([0, 0, 0.0001, 0.001, 0.01]))
+    summary = {'start': 0, 'end': float(duration), 'seconds': float(duration), 'bytes': total_bytes,
+               'bits_per_second': total_bytes * 8.0 / duration,
+               'jitter_ms': profile['jitter_ms'] * rng.uniform(0.7, 1.5),
+               'lost_packets': lost, 'packets': total_packets,
+               'lost_percent': 100.0 * lost / total_packets, 'sender': True}
+    return {
+        'start': _iperf_start(profile, clock, 'UDP', duration),
+        'intervals': intervals,
+        'end': {
+            'streams': [{'udp': dict(summary, socket=5, out_of_order=0)}],
+            'sum': summary,
+            'cpu_utilization_percent': _cpu_utilization(rng),
+        },
+    }
+
+
+def dns_dig_results(rng, profile, server, queries, clock, timestamp):
+    """Build dig-based DNS JSON as written by dns_performance_test.sh"""
+    entries = []
+    times = []
+    failed = 0
+    for domain in DNS_DOMAINS:
+        samples = [max(1, int(rng.gauss(profile['dns_ms'], profile['dns_ms'] * 0.3)))
+                   for _ in range(queries)]
+        successful = queries - (1 if rng.random() < 0.02 else 0)
+        samples = samples[:successful]
+        failed += queries - successful
+        times += samples
+        entries.append({'domain': domain, 'avg_ms': sum(samples) // len(samples),
+                        'min_ms': min(samples), 'max_ms': max(samples),
+                        'successful': successful, 'total': queries})
+
+    total = queries * len(DNS_DOMAINS)
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'test_type': 'dns_dig',
+        'host': profile['name'],
+        'timestamp': timestamp,
+        'dns_server': server,
+        'query_type': 'A',
+        'queries': entries,
+        'summary': {
+            'total_queries': total,
+            'successful_queries': len(times),
+            'failed_queries': failed,
+            'success_rate': round(len(times) * 100 / total, 2),
+            'avg_response_time_ms': sum(times) // len(times),
+            'min_response_time_ms': min(times),
+            'max_response_time_ms': max(times),
+        },
+    }
+
+
+def dnsperf_results(rng, profile, server, queries, timestamp):
+    """Build dnsperf JSON as written by dns_performance_test.sh"""
+    sent = queries * len(DNS_DOMAINS)
+    lost = int(sent * rng.choice([0, 0, 0.01]))
+    avg = profile['dns_ms'] * rng.uniform(0.9, 1.1)
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'test_type': 'dnsperf',
+        'host': profile['name'],
+        'timestamp': timestamp,
+        'dns_server': server,
+        'query_type': 'A',
+        'queries_sent': sent,
+        'queries_completed': sent - lost,
+        'queries_lost': lost,
+        'avg_latency_ms': round(avg, 3),
+        'min_latency_ms': round(avg * 0.4, 3),
+        'max_latency_ms': round(avg * 4, 3),
+    }
+
+
+def transfer_results(rng, profile, tool, timestamp, failure_rate):
+    """Build transfer JSON as written by data_transfer_test.sh"""
+    data = {'schema_version': SCHEMA_VERSION, 'host': profile['name'], 'test_type': tool,
+            'timestamp': timestamp}
+    if tool in ('scp', 'rsync'):
+        data['remote_host'] = TRANSFER_HOST
+    else:
+        data['url'] = TRANSFER_URL
+    if rng.random() < failure_rate:
+        data['status'] = 'failed'
+        return data
+
+    speed = profile['transfer_mbps'] * rng.uniform(0.7, 1.1)
+    duration = TRANSFER_FILE_SIZE / 1048576 / speed
+    if tool in ('scp', 'rsync'):
+        data['direction'] = 'upload'
+    data.update(file_size_bytes=TRANSFER_FILE_SIZE, duration_seconds=round(duration, 9),
+                speed_mbps=round(speed, 2))
+    if tool == 'rsync':
+        data.update(rsync_reported_rate=f"{speed:.2f}MB/s", compression=True)
+    elif tool == 'curl':
+        data['curl_reported_speed_mbps'] = round(speed * rng.uniform(0.98, 1.02), 2)
+    else:
+        data['parallel'] = False
+    data['status'] = 'success'
+    return data
+
+
+def _format_speed(kbps):
+    """Format a KB/s figure the way yabs.sh format_speed does"""
+    if kbps >= 1000000:
+        return f"{kbps / 1000000:.2f} GB/s"
+    if kbps >= 1000:
+        return f"{kbps / 1000:.2f} MB/s"
+    return f"{kbps:.2f} KB/s"
+
+
+def _format_iops(iops):
+    """Format an IOPS figure the way yabs.sh format_iops does"""
+    return f"{iops / 1000:.1f}k" if iops >= 1000 else str(int(iops))
+
+
+def yabs_text(rng, profile):
+    """Build yabs.sh text output (system info, fio and Geekbench sections)"""
+    lines = [
+        '',
+        'Basic System Information:',
+        '---------------------------------',
+        f"Uptime     : {rng.randint(0, 400)} days, {rng.randint(0, 23)} hours, {rng.randint(0, 59)} minutes",
+        f"Processor  : {profile['cpu_model']}",
+        f"CPU cores  : {profile['cores']} @ {profile['cpu_freq']:.3f} MHz",
+        'AES-NI     : ✔ Enabled',
+        'VM-x/AMD-V : ✔ Enabled',
+        f"RAM        : {profile['ram_gib']} GiB",
+        f"Swap       : {profile['swap_mib'] / 1024:.1f} GiB" if profile['swap_mib'] else 'Swap       : 0.0 KiB',
+        f"Disk       : {profile['disk_gib']} GiB",
+        f"Distro     : {profile['distro']}",
+        f"Kernel     : {profile['kernel']}",
+        f"VM Type    : {profile['virt']}",
+        'IPv4/IPv6  : ✔ Online / ❌ Offline',
+        '',
+        'fio Disk Speed Tests (Mixed R/W 50/50) (Partition /dev/vda1):',
+        '---------------------------------',
+    ]
+
+    # Small blocks are IOPS-bound, large blocks bandwidth-bound
+    block_sizes = [('4k', 0.12), ('64k', 0.55), ('512k', 0.9), ('1m', 1.0)]
+    for pair in range(0, len(block_sizes), 2):
+        if pair:
+            lines.append(f"{'':<10} | {'':<20} | {'':<20}")
+        cells = []
+        for size, scale in block_sizes[pair:pair + 2]:
+            read = profile['disk_kbps'] * scale * rng.uniform(0.9, 1.1) / 2
+            write = read * rng.uniform(0.95, 1.02)
+            bs_kb = int(size[:-1]) * (1024 if size.endswith('m') else 1)
+            cells.append((size, [(read + write, (read + write) / bs_kb), (read, read / bs_kb),
+                                 (write, write / bs_kb)]))
+        lines.append(f"{'Block Size':<10} | {cells[0][0]:<11} {'(IOPS)':>8} | {cells[1][0]:<11} {'(IOPS)':>8}")
+        lines.append(f"{'  ------':<10} | {'---':<11} {'---- ':>8} | {'----':<11} {'---- ':>8}")
+        for row, label in [(1, 'Read'), (2, 'Write'), (0, 'Total')]:
+            left, right = cells[0][1][row], cells[1][1][row]
+            lines.append(f"{label:<10} | {_format_speed(left[0]):<11} {'(' + _format_iops(left[1]) + ')':>8} | "
+                         f"{_format_speed(right[0]):<11} {'(' + _format_iops(right[1]) + ')':>8}")
+
+    single = int(profile['gb_single'] * rng.uniform(0.97, 1.03))
+    multi = int(single * profile['cores'] * rng.uniform(0.75, 0.92))
+    lines += [
+        '',
+        'Geekbench 6 Benchmark Test:',
+        '---------------------------------',
+        f"{'Test':<15} | {'Value':<30}",
+        f"{'':<15} | {'':<30}",
+        f"{'Single Core':<15} | {single:<30}",
+        f"{'Multi Core':<15} | {multi:<30}",
+        f"{'Full Test':<15} | {'https://browser.geekbench.com/v6/cpu/' + str(rng.randint(10 ** 6, 10 ** 7)):<30}",
+        '',
+        f"YABS completed in {rng.randint(4, 12)} min {rng.randint(0, 59)} sec",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def run_artifacts(rng, profile, phase, clock, args):
+    """Yield (type, file name, target, content) for every artifact of one suite run"""
+    stamp = clock.strftime('%b-%d-%Y_%H-%M-%S')
+    prefix = f"{phase}_"
+
+    for dest in PING_DESTINATIONS:
+        raw_name = f"{prefix}ping_{dest}_{stamp}.txt"
+        data, raw = ping_results(rng, profile, dest, args.ping_count, clock, raw_name)
+        yield None, raw_name, dest, raw
+        yield 'ping', f"{prefix}ping_{dest}_{stamp}.json", dest, data
+
+    yield ('iperf_tcp', f"{prefix}iperf_tcp_{IPERF_SERVER}_{stamp}.json", IPERF_SERVER,
+           iperf_tcp_results(rng, profile, args.iperf_duration, clock))
+    yield ('iperf_udp', f"{prefix}iperf_udp_{IPERF_SERVER}_{stamp}.json", IPERF_SERVER,
+           iperf_udp_results(rng, profile, args.iperf_duration, clock))
+
+    for server in DNS_SERVERS:
+        yield ('dns_dig', f"{prefix}dns_dig_{server}_{stamp}.json", server,
+               dns_dig_results(rng, profile, server, args.dns_queries, clock, stamp))
+    yield ('dnsperf', f"{prefix}dnsperf_{DNS_SERVERS[0]}_{stamp}.json", DNS_SERVERS[0],
+           dnsperf_results(rng, profile, DNS_SERVERS[0], args.dns_queries, stamp))
+
+    for tool in ('scp', 'rsync'):
+        yield ('transfer', f"{prefix}{tool}_{TRANSFER_HOST.split('@')[-1]}_{stamp}.json", TRANSFER_HOST,
+               transfer_results(rng, profile, tool, stamp, args.failure_rate))
+    for tool in ('wget', 'curl'):
+        yield ('transfer', f"{prefix}{tool}_{stamp}.json", TRANSFER_URL,
+               transfer_results(rng, profile, tool, stamp, args.failure_rate))
+
+    # The suite writes one yabs file per run directory; stamp it when runs share a directory
+    yabs_name = f"yabs_{phase}_{stamp}_results.txt" if args.flat else f"yabs_{phase}_results.txt"
+    yield 'yabs', yabs_name, '', yabs_text(rng, profile)
+
+
+def generate(args):
+    """Write synthetic result directories and return (files, bytes) written"""
+    rng = random.Random(args.seed)
+    profiles = [host_profile(rng, i) for i in range(args.hosts)]
+    phases = [p for p in args.phases.split(',') if p]
+    clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    files = 0
+    total_bytes = 0
+    while files < args.files:
+        for profile in profiles:
+            for phase in phases:
+                if files >= args.files:
+                    return files, total_bytes
+                shifted = apply_drift(profile, args.drift) if phase == 'post' else profile
+                stamp = clock.strftime('%b-%d-%Y_%H-%M-%S')
+                if args.flat:
+                    run_dir = args.output_dir
+                else:
+                    run_dir = os.path.join(args.output_dir, profile['name'],
+                                           f"{phase}_{stamp}-Extended-Test-Suite-Results")
+                os.makedirs(run_dir, exist_ok=True)
+
+                manifest = []
+                for artifact_type, name, target, content in run_artifacts(rng, shifted, phase, clock, args):
+                    if files >= args.files:
+                        break
+                    text = content if isinstance(content, str) else json.dumps(content, indent=2)
+                    with open(os.path.join(run_dir, name), 'w') as f:
+                        f.write(text)
+                    files += 1
+                    total_bytes += len(text)
+                    if artifact_type:
+                        manifest.append(json.dumps({
+                            'schema_version': SCHEMA_VERSION, 'type': artifact_type, 'file': name,
+                            'host': profile['name'], 'phase': phase, 'target': target,
+                            'timestamp': clock.strftime('%Y-%m-%dT%H:%M:%SZ')}))
+
+                if manifest and not args.no_manifest:
+                    with open(os.path.join(run_dir, MANIFEST_NAME), 'a') as f:
+                        f.write('\n'.join(manifest) + '\n')
+                clock += RUN_INTERVAL
+    return files, total_bytes
+
+
+def main():
+    trace_startup('generate_synthetic_results')
+    parser = argparse.ArgumentParser(description='Generate synthetic test results for benchmarking the result tooling')
+    parser.add_argument('output_dir', help='Directory to write results into')
+    parser.add_argument('-n', '--files', type=int, default=100, help='Number of result files to write (default: 100)')
+    parser.add_argument('--hosts', type=int, default=4, help='Number of synthetic hosts (default: 4)')
+    parser.add_argument('--phases', default='pre,post', help='Comma-separated test phases (default: pre,post)')
+    parser.add_argument('--drift', type=float, default=-5.0,
+                        help='Performance change in percent applied to the post phase (default: -5)')
+    parser.add_argument('--flat', action='store_true',
+                        help='Write every run into output_dir instead of <host>/<phase>_<timestamp> run directories')
+    parser.add_argument('--no-manifest', action='store_true', help='Omit manifest.jsonl (legacy file-name discovery)')
+    parser.add_argument('--ping-count', type=int, default=100, help='Ping packets per test (default: 100)')
+    parser.add_argument('--iperf-duration', type=int, default=10, help='iperf3 intervals per test (default: 10)')
+    parser.add_argument('--dns-queries', type=int, default=10, help='DNS queries per domain (default: 10)')
+    parser.add_argument('--failure-rate', type=float, default=0.02, help='Fraction of failed transfers (default: 0.02)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    args = parser.parse_args()
+
+    if args.files < 1 or args.hosts < 1 or args.ping_count < 1 or args.iperf_duration < 1 or args.dns_queries < 1:
+        print("Error: --files, --hosts, --ping-count, --iperf-duration and --dns-queries must be positive")
+        sys.exit(1)
+    if not any(args.phases.split(',')):
+        print("Error: --phases must list at least one phase")
+        sys.exit(1)
+
+    with span('generate_synthetic_results.write', 'io', files=args.files):
+        files, total_bytes = generate(args)
+    print(f"Wrote {files} files ({total_bytes / 1048576:.1f} MB) for {args.hosts} hosts to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
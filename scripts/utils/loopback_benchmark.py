@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+
+"""
+Loopback network-stack benchmark
+Runs a local server and client over loopback, or over a veth pair between
+network namespaces, to measure host TCP/UDP overhead without a remote path
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import hashlib
+import select
+import signal
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+import socketserver
+import multiprocessing
+from datetime import datetime, timezone
+
+from result_schema import SCHEMA_VERSION
+from tracing import span, trace_startup
+
+# Bump whenever a test or its parameters change; results are only
+# comparable between runs with the same benchmark_version
+BENCHMARK_VERSION = 1
+DEFAULT_DURATION = 2.0
+QUICK_DURATION = 1.0
+
+# Throughput sweeps vary one factor at a time around the base case:
+# 128 KiB messages, default socket buffers, one stream
+BASE_MESSAGE = 128 << 10
+MESSAGE_SIZES = (('1k', 1 << 10), ('16k', 16 << 10), ('128k', 128 << 10))
+BUFFER_SIZES = (('64k', 64 << 10), ('1m', 1 << 20), ('8m', 8 << 20))
+STREAM_COUNTS = (2, 4)
+UDP_SIZES = (64, 1472, 8192)
+UDP_RCVBUF = 4 << 20
+UDP_DRAIN_SECONDS = 0.2
+RR_SIZES = (1, 1024)
+RR_WARMUP = 200
+RR_TIMEOUT = 1.0
+
+# sendfile() versus read() + send() of a page-cached file
+SEND_BYTES = 256 << 20
+# The payload is kept in $YABS_CACHE_DIR/payloads when set, checked like the
+# suite's other cached payloads (SHA-256 in a .sha256 file next to it)
+CACHE_ENV = 'YABS_CACHE_DIR'
+PAYLOAD_NAME = f'loopback_payload_{SEND_BYTES >> 20}m.dat'
+SEND_REPEATS = 3
+COPY_CHUNK = 64 << 10
+RECV_CHUNK = 1 << 20
+
+# Server and client sit on either side of a veth pair in --netns mode
+NETNS_NAME = 'yabs_loopback'
+NETNS_VETH = ('yabs_lb0', 'yabs_lb1')
+NETNS_CLIENT_ADDR = '10.231.0.2'
+NETNS_SERVER_ADDR = '10.231.0.1'
+SERVER_START_TIMEOUT = 10
+
+
+class BenchmarkHandler(socketserver.StreamRequestHandler):
+    """Serve one benchmark connection; its first line selects the mode"""
+
+    # Unbuffered rfile so that payload bytes after the request line stay
+    # in the socket for recv_into
+    rbufsize = 0
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        """Dispatch on the JSON request line"""
+        request = json.loads(self.rfile.readline())
+        if request.get('rcvbuf'):
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, request['rcvbuf'])
+        getattr(self, f"serve_{request['mode']}")(request)
+
+    def reply(self, **fields):
+        """Send one JSON line back to the client"""
+        self.connection.sendall((json.dumps(fields) + '\n').encode())
+
+    def serve_sink(self, request):
+        """Discard everything until EOF and report the byte count"""
+        buf = bytearray(RECV_CHUNK)
+        total = 0
+        while True:
+            n = self.connection.recv_into(buf)
+            if not n:
+                break
+            total += n
+        self.reply(bytes=total)
+
+    def serve_echo(self, request):
+        """Echo fixed-size messages back until EOF"""
+        size = request['size']
+        buf = bytearray(size)
+        while _recv_exact(self.connection, memoryview(buf), size):
+            self.connection.sendall(buf)
+
+    def serve_send(self, request):
+        """Send the payload file with sendfile() or a userspace copy"""
+        size = min(request['bytes'], self.server.payload_bytes)
+        out = self.connection.fileno()
+        with open(self.server.payload_path, 'rb') as f:
+            if request['method'] == 'sendfile':
+                offset = 0
+                while offset < size:
+                    offset += os.sendfile(out, f.fileno(), offset, size - offset)
+            else:
+                buf = bytearray(COPY_CHUNK)
+                view = memoryview(buf)
+                remaining = size
+                while remaining:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    self.connection.sendall(view[:min(n, remaining)])
+                    remaining -= min(n, remaining)
+
+    def serve_udp(self, request):
+        """Count (or echo) datagrams on a fresh UDP port until told to stop"""
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF)
+        udp.bind((self.server.server_address[0], 0))
+        udp.setblocking(False)
+        self.reply(port=udp.getsockname()[1])
+
+        echo = request.get('echo', False)
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        total = packets = 0
+        while True:
+            readable, _, _ = select.select([udp, self.connection], [], [])
+            # Drain everything queued before going back to select()
+            while udp in readable:
+                try:
+                    n, addr = udp.recvfrom_into(buf)
+                except BlockingIOError:
+                    break
+                total += n
+                packets += 1
+                if echo:
+                    udp.sendto(view[:n], addr)
+            if self.connection in readable:
+                break
+        self.connection.recv(64)
+        udp.close()
+        self.reply(bytes=total, packets=packets)
+
+
+class BenchmarkServer(socketserver.ForkingMixIn, socketserver.TCPServer):
+    """Forking TCP server so that every stream gets its own process"""
+
+    allow_reuse_address = True
+
+    def __init__(self, address, payload_path, payload_bytes):
+        super().__init__(address, BenchmarkHandler)
+        self.payload_path = payload_path
+        self.payload_bytes = payload_bytes
+
+
+def _file_sha256(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(RECV_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_payload(f):
+    """Fill an open file with SEND_BYTES of random data"""
+    for _ in range(SEND_BYTES // (1 << 20)):
+        f.write(os.urandom(1 << 20))
+
+
+def payload_file():
+    """Return (path, temporary) of the random payload, reusing the cached copy when valid"""
+    cache_dir = os.environ.get(CACHE_ENV)
+    if not cache_dir:
+        with tempfile.NamedTemporaryFile(prefix='yabs_loopback_', delete=False) as f:
+            _write_payload(f)
+        return f.name, True
+
+    payload_dir = os.path.join(cache_dir, 'payloads')
+    path = os.path.join(payload_dir, PAYLOAD_NAME)
+    try:
+        with open(path + '.sha256', 'r') as f:
+            if os.path.getsize(path) == SEND_BYTES and f.read().strip() == _file_sha256(path):
+                return path, False
+    except OSError:
+        pass
+
+    # Written under a temporary name so concurrent servers never see a partial file
+    os.makedirs(payload_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=payload_dir, prefix=PAYLOAD_NAME, delete=False) as f:
+        _write_payload(f)
+    checksum = _file_sha256(f.name)
+    os.replace(f.name, path)
+    with open(path + '.sha256.tmp', 'w') as f:
+        f.write(checksum + '\n')
+    os.replace(path + '.sha256.tmp', path + '.sha256')
+    return path, False
+
+
+def serve(bind_address):
+    """Run the server, printing its port on the first line of stdout"""
+    payload_path, temporary = payload_file()
+    try:
+        with BenchmarkServer((bind_address, 0), payload_path, SEND_BYTES) as server:
+            print(server.server_address[1], flush=True)
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if temporary:
+            os.unlink(payload_path)
+
+
+def _recv_exact(sock, view, size):
+    """Receive exactly size bytes into view, returning False on EOF"""
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:size])
+        if not n:
+            return False
+        received += n
+    return True
+
+
+def _connect(address, request, bufsize=None):
+    """Open a benchmark connection and send its request line"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if bufsize:
+        # Buffer sizes must be set before connect() to affect window scaling
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, bufsize)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, bufsize)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.connect(address)
+    sock.sendall((json.dumps(request) + '\n').encode())
+    return sock
+
+
+def _read_reply(sock):
+    """Read one JSON reply line from the server"""
+    data = b''
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError('server closed the connection')
+        data += chunk
+    return json.loads(data)
+
+
+def tcp_stream(address, message, duration, bufsize=None, start_at=None):
+    """Send for duration seconds, returning (bytes received by the server, seconds)"""
+    sock = _connect(address, {'mode': 'sink', 'rcvbuf': bufsize}, bufsize)
+    payload = bytes(message)
+    # Only read the clock every ~1 MiB so small messages are not timer-bound
+    batch = max(1, RECV_CHUNK // message)
+    if start_at:
+        time.sleep(max(0.0, start_at - time.time()))
+
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        for _ in range(batch):
+            sock.sendall(payload)
+    sock.shutdown(socket.SHUT_WR)
+    received = _read_reply(sock)['bytes']
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return received, elapsed
+
+
+def measure_streams(address, streams, duration):
+    """Return the aggregate throughput of parallel streams in Mbps"""
+    with multiprocessing.Pool(streams) as pool:
+        # A shared start time lines the streams up after pool start-up
+        start_at = time.time() + 0.5
+        results = pool.starmap(tcp_stream, [(address, BASE_MESSAGE, duration, None, start_at)] * streams)
+    return sum(r[0] for r in results) * 8 / max(r[1] for r in results) / 1e6
+
+
+def udp_stream(address, size, duration):
+    """Blast datagrams for duration seconds, returning (Mbps, loss percent)"""
+    ctl = _connect(address, {'mode': 'udp'})
+    port = _read_reply(ctl)['port']
+    udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp.connect((address[0], port))
+    payload = bytes(size)
+
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        for _ in range(64):
+            try:
+                udp.send(payload)
+                sent += 1
+            except OSError as e:
+                # A full local queue drops the datagram, like a lossy link
+                if e.errno not in (errno.ENOBUFS, errno.EAGAIN):
+                    raise
+    elapsed = time.perf_counter() - start
+
+    time.sleep(UDP_DRAIN_SECONDS)
+    ctl.sendall(b'done\n')
+    stats = _read_reply(ctl)
+    ctl.close()
+    udp.close()
+    loss = 100.0 * (1 - stats['packets'] / sent) if sent else 0.0
+    return stats['bytes'] * 8 / elapsed / 1e6, max(0.0, loss)
+
+
+def _percentile(ordered, pct):
+    """Return a percentile of a sorted list (nearest rank)"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _rr_stats(latencies, duration):
+    """Summarize round-trip times as p50/p99 in microseconds and transactions/s"""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    return {
+        'p50_us': _percentile(ordered, 50) * 1e6,
+        'p99_us': _percentile(ordered, 99) * 1e6,
+        'tps': len(ordered) / duration,
+    }
+
+
+def tcp_rr(address, size, duration):
+    """Ping-pong size-byte messages over TCP, returning latency statistics"""
+    sock = _connect(address, {'mode': 'echo', 'size': size})
+    payload = bytes(size)
+    view = memoryview(bytearray(size))
+    for _ in range(RR_WARMUP):
+        sock.sendall(payload)
+        _recv_exact(sock, view, size)
+
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        sock.sendall(payload)
+        _recv_exact(sock, view, size)
+        latencies.append(time.perf_counter() - start)
+    sock.close()
+    return _rr_stats(latencies, duration)
+
+
+def udp_rr(address, size, duration):
+    """Ping-pong size-byte datagrams, returning latency statistics"""
+    ctl = _connect(address, {'mode': 'udp', 'echo': True})
+    port = _read_reply(ctl)['port']
+    udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp.connect((address[0], port))
+    udp.settimeout(RR_TIMEOUT)
+    payload = bytes(size)
+    buf = bytearray(65536)
+
+    latencies = []
+    lost = 0
+    deadline = time.perf_counter() + duration
+    for i in range(sys.maxsize):
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        udp.send(payload)
+        try:
+            udp.recv_into(buf)
+        except socket.timeout:
+            lost += 1
+            continue
+        if i >= RR_WARMUP:
+            latencies.append(time.perf_counter() - start)
+
+    ctl.sendall(b'done\n')
+    _read_reply(ctl)
+    ctl.close()
+    udp.close()
+    stats = _rr_stats(latencies, duration)
+    if stats:
+        stats['lost'] = lost
+    return stats
+
+
+def tcp_receive(address, method, size):
+    """Receive size bytes sent with the given method, returning Mbps"""
+    sock = _connect(address, {'mode': 'send', 'method': method, 'bytes': size})
+    buf = bytearray(RECV_CHUNK)
+    total = 0
+    start = time.perf_counter()
+    while True:
+        n = sock.recv_into(buf)
+        if not n:
+            break
+        total += n
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return total * 8 / elapsed / 1e6
+
+
+def measure_send_methods(address):
+    """Return the median throughput of sendfile() and userspace copy in Mbps"""
+    methods = ['copy'] + (['sendfile'] if hasattr(os, 'sendfile') else [])
+    # Warm-up pulls the payload into the page cache
+    tcp_receive(address, 'copy', SEND_BYTES)
+    results = {}
+    for method in methods:
+        rates = sorted(tcp_receive(address, method, SEND_BYTES) for _ in range(SEND_REPEATS))
+        results[method] = rates[len(rates) // 2]
+    return results
+
+
+def _ip(*args, netns=None):
+    """Run an ip(8) command, optionally inside the benchmark namespace"""
+    cmd = ['ip'] + (['netns', 'exec', netns, 'ip'] if netns else []) + list(args)
+    subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+
+def setup_netns():
+    """Create the server namespace and a veth pair to reach it"""
+    teardown_netns()
+    host_if, ns_if = NETNS_VETH
+    _ip('netns', 'add', NETNS_NAME)
+    _ip('link', 'add', host_if, 'type', 'veth', 'peer', 'name', ns_if)
+    _ip('link', 'set', ns_if, 'netns', NETNS_NAME)
+    _ip('addr', 'add', f'{NETNS_CLIENT_ADDR}/30', 'dev', host_if)
+    _ip('link', 'set', host_if, 'up')
+    _ip('addr', 'add', f'{NETNS_SERVER_ADDR}/30', 'dev', ns_if, netns=NETNS_NAME)
+    _ip('link', 'set', ns_if, 'up', netns=NETNS_NAME)
+    _ip('link', 'set', 'lo', 'up', netns=NETNS_NAME)
+
+
+def teardown_netns():
+    """Remove the namespace (and with it the veth pair), ignoring errors"""
+    subprocess.run(['ip', 'netns', 'del', NETNS_NAME], capture_output=True)
+    subprocess.run(['ip', 'link', 'del', NETNS_VETH[0]], capture_output=True)
+
+
+def start_server(bind_address, netns=None):
+    """Start the server process and return (process, port)"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--serve', bind_address]
+    if netns:
+        cmd = ['ip', 'netns', 'exec', netns] + cmd
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    ready, _, _ = select.select([proc.stdout], [], [], SERVER_START_TIMEOUT)
+    line = proc.stdout.readline() if ready else ''
+    if not line.strip().isdigit():
+        proc.kill()
+        raise RuntimeError('benchmark server did not start')
+    return proc, int(line)
+
+
+def stop_server(proc):
+    """Stop the server process, letting it remove its payload file"""
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def tcp_congestion_control():
+    """Return the kernel's default TCP congestion control algorithm"""
+    try:
+        with open('/proc/sys/net/ipv4/tcp_congestion_control', 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return 'unknown'
+
+
+def run_tests(address, duration):
+    """Run every sweep against a running server and return flat metrics"""
+    results = {}
+
+    with span('loopback.tcp_stream', 'measure'):
+        print("Running TCP throughput sweeps...", file=sys.stderr)
+        for label, size in MESSAGE_SIZES:
+            received, elapsed = tcp_stream(address, size, duration)
+            results[f'tcp_msg_{label}_mbps'] = received * 8 / elapsed / 1e6
+        for label, size in BUFFER_SIZES:
+            received, elapsed = tcp_stream(address, BASE_MESSAGE, duration, size)
+            results[f'tcp_buf_{label}_mbps'] = received * 8 / elapsed / 1e6
+        for streams in STREAM_COUNTS:
+            results[f'tcp_streams_{streams}_mbps'] = measure_streams(address, streams, duration)
+
+    with span('loopback.udp_stream', 'measure'):
+        print("Running UDP throughput tests...", file=sys.stderr)
+        for size in UDP_SIZES:
+            mbps, loss = udp_stream(address, size, duration)
+            results[f'udp_{size}_mbps'] = mbps
+            results[f'udp_{size}_loss_percent'] = loss
+
+    with span('loopback.request_response', 'measure'):
+        print("Running request/response latency tests...", file=sys.stderr)
+        for size in RR_SIZES:
+            for proto, test in (('tcp', tcp_rr), ('udp', udp_rr)):
+                for stat, value in test(address, size, duration).items():
+                    results[f'{proto}_rr_{size}_{stat}'] = value
+
+    with span('loopback.sendfile', 'measure'):
+        print("Running sendfile versus userspace copy...", file=sys.stderr)
+        for method, mbps in measure_send_methods(address).items():
+            results[f'tcp_{method}_mbps'] = mbps
+
+    return results
+
+
+def run_benchmark(duration, netns=False):
+    """Start the server, run every test and return the result document"""
+    if netns:
+        with span('loopback.netns_setup', 'setup'):
+            setup_netns()
+        bind_address = NETNS_SERVER_ADDR
+    else:
+        bind_address = '127.0.0.1'
+
+    proc = None
+    try:
+        proc, port = start_server(bind_address, NETNS_NAME if netns else None)
+        results = run_tests((bind_address, port), duration)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        if netns:
+            teardown_netns()
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'test_type': 'loopback',
+        'benchmark_version': BENCHMARK_VERSION,
+        'host': socket.gethostname(),
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'mode': 'netns' if netns else 'loopback',
+        'duration_seconds': duration,
+        'kernel': platform.release(),
+        'arch': platform.machine(),
+        'tcp_congestion_control': tcp_congestion_control(),
+        'results': {name: round(value, 3) for name, value in results.items()},
+    }
+
+
+def print_results(doc):
+    """Print a short table of the benchmark results"""
+    print(f"\nLoopback Benchmark v{doc['benchmark_version']} ({doc['mode']}, "
+          f"{doc['tcp_congestion_control']}, {doc['duration_seconds']}s per test)")
+    print("-" * 50)
+    for name, value in doc['results'].items():
+        print(f"  {name:<28} {value:>14,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the host network stack over loopback or network namespaces')
+    parser.add_argument('-o', '--output', help='Write the JSON result to this file')
+    parser.add_argument('-t', '--time', type=float, help=f'Seconds per test (default: {DEFAULT_DURATION})')
+    parser.add_argument('-q', '--quick', action='store_true', help=f'{QUICK_DURATION}s per test')
+    parser.add_argument('-n', '--netns', action='store_true',
+                        help='Run the server in a network namespace over veth (requires root and ip)')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    parser.add_argument('--serve', metavar='ADDRESS', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    trace_startup('loopback_benchmark')
+
+    duration = args.time or (QUICK_DURATION if args.quick else DEFAULT_DURATION)
+    if duration <= 0:
+        print("Error: --time must be positive")
+        sys.exit(1)
+    if args.netns and (not hasattr(os, 'geteuid') or os.geteuid() != 0):
+        print("Error: --netns requires root")
+        sys.exit(1)
+
+    try:
+        with span('loopback_benchmark.run', 'measure', mode='netns' if args.netns else 'loopback'):
+            doc = run_benchmark(duration, args.netns)
+    except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"Error: Loopback benchmark failed: {e}")
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, indent=2)
+        print(f"Results saved to: {args.output}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(doc, indent=2))
+    else:
+        print_results(doc)
+
+if __name__ == "__main__":
+    main()
@@ -5,186 +5,118 @@ Process and compare performance test results
 Parses JSON and text output from various test scripts
 """
 
-import json
 import csv
 import os
 import sys
-import glob
-import re
 from datetime import datetime
 from collections import defaultdict
 import argparse
 
+from result_schema import read_manifest, discover_entries, iter_records, SchemaError
+from tracing import span, trace_startup
+
+# Metrics to compare for the built-in benchmarks (all higher is better),
+# keyed by artifact type: (section title, [(metric, label), ...])
+BENCHMARK_METRICS = {
+    'cpu_memory': ('CPU/Memory', [
+        ('int_1t_mops', 'Integer 1-core (Mops/s)'),
+        ('int_mt_mops', 'Integer all-core (Mops/s)'),
+        ('float_1t_gflops', 'Float 1-core (GFLOPS)'),
+        ('float_mt_gflops', 'Float all-core (GFLOPS)'),
+        ('stream_triad_mbps', 'STREAM Triad (MB/s)'),
+        ('sha256_mbps', 'SHA-256 (MB/s)'),
+        ('aes_256_gcm_mbps', 'AES-256-GCM (MB/s)'),
+    ]),
+    'loopback': ('Loopback', [
+        ('tcp_msg_128k_mbps', 'TCP 1 stream (Mbps)'),
+        ('tcp_streams_4_mbps', 'TCP 4 streams (Mbps)'),
+        ('udp_1472_mbps', 'UDP 1472B (Mbps)'),
+        ('tcp_rr_1_tps', 'TCP request/response (trans/s)'),
+        ('udp_rr_1_tps', 'UDP request/response (trans/s)'),
+        ('tcp_sendfile_mbps', 'TCP sendfile (Mbps)'),
+    ]),
+}
+
 class TestResultsProcessor:
     def __init__(self, results_dir):
         self.results_dir = results_dir
         self.pre_results = defaultdict(dict)
         self.post_results = defaultdict(dict)
         
-    def find_result_files(self):
-        """Find all result files in the directory"""
-        json_files = glob.glob(os.path.join(self.results_dir, "*.json"))
-        txt_files = glob.glob(os.path.join(self.results_dir, "*.txt"))
-        
-        files = {
-            'pre': {'json': [], 'txt': []},
-            'post': {'json': [], 'txt': []}
-        }
-        
-        for f in json_files:
-            if 'pre_' in os.path.basename(f):
-                files['pre']['json'].append(f)
-            elif 'post_' in os.path.basename(f):
-                files['post']['json'].append(f)
-                
-        for f in txt_files:
-            if 'pre_' in os.path.basename(f):
-                files['pre']['txt'].append(f)
-            elif 'post_' in os.path.basename(f):
-                files['post']['txt'].append(f)
-                
-        return files
-    
-    def parse_ping_results(self, json_file):
-        """Parse ping test JSON results"""
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            
-        return {
-            'avg_rtt': data.get('rtt_avg_ms', 0),
-            'min_rtt': data.get('rtt_min_ms', 0),
-            'max_rtt': data.get('rtt_max_ms', 0),
-            'packet_loss': data.get('packet_loss_percent', 0),
-            'destination': data.get('destination', 'unknown')
-        }
-    
-    def parse_iperf_results(self, json_file):
-        """Parse iperf3 JSON results"""
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            
-        if 'end' in data:
-            # Standard iperf3 JSON format
-            sender = data['end']['sum_sent']['bits_per_second'] / 1e6  # Convert to Mbps
-            receiver = data['end']['sum_received']['bits_per_second'] / 1e6
-            
-            return {
-                'sender_mbps': sender,
-                'receiver_mbps': receiver,
-                'avg_mbps': (sender + receiver) / 2
+    def record_result(self, record):
+        """Map a normalized record to (result key, values) as used by the report, or None"""
+        metrics = record['metrics']
+        test = record['test']
+
+        if test == 'ping':
+            return 'ping', {
+                'avg_rtt': metrics.get('rtt_avg_ms', 0),
+                'min_rtt': metrics.get('rtt_min_ms', 0),
+                'max_rtt': metrics.get('rtt_max_ms', 0),
+                'packet_loss': metrics.get('packet_loss_percent', 0),
+                'destination': record['target'] or 'unknown'
             }
-        else:
-            # Custom format from our script
-            return {
-                'avg_mbps': data.get('speed_mbps', 0)
+        if test == 'iperf_tcp':
+            result = {key: metrics[key] for key in ['sender_mbps', 'receiver_mbps'] if key in metrics}
+            result['avg_mbps'] = metrics.get('throughput_mbps', 0)
+            return 'iperf', result
+        if test == 'iperf_udp':
+            return 'iperf_udp', {
+                'avg_mbps': metrics.get('throughput_mbps', 0),
+                'jitter_ms': metrics.get('jitter_ms', 0),
+                'lost_percent': metrics.get('lost_percent', 0)
             }
-    
-    def parse_dns_results(self, json_file):
-        """Parse DNS test JSON results"""
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            
-        if 'summary' in data:
-            return {
-                'avg_response_time': data['summary']['avg_response_time_ms'],
-                'min_response_time': data['summary']['min_response_time_ms'],
-                'max_response_time': data['summary']['max_response_time_ms'],
-                'success_rate': data['summary']['success_rate'],
-                'dns_server': data.get('dns_server', 'unknown')
+        if test in ('dns_dig', 'dnsperf'):
+            result = {
+                'avg_response_time': metrics.get('avg_response_time_ms', 0),
+                'min_response_time': metrics.get('min_response_time_ms', 0),
+                'max_response_time': metrics.get('max_response_time_ms', 0),
+                'dns_server': record['target'] or 'unknown'
             }
-        else:
-            # dnsperf format
-            return {
-                'avg_response_time': data.get('avg_latency_ms', 0),
-                'min_response_time': data.get('min_latency_ms', 0),
-                'max_response_time': data.get('max_latency_ms', 0),
-                'queries_completed': data.get('queries_completed', 0),
-                'dns_server': data.get('dns_server', 'unknown')
+            for key in ['success_rate', 'queries_completed']:
+                if key in metrics:
+                    result[key] = metrics[key]
+            return 'dns', result
+        if test.startswith('transfer_'):
+            return test, {
+                'test_type': record['attributes'].get('test_type', 'unknown'),
+                'speed_mbps': metrics.get('speed_mbps', 0),
+                'file_size_mb': metrics.get('file_size_bytes', 0) / 1048576,
+                'duration_seconds': metrics.get('duration_seconds', 0),
+                'status': record['attributes'].get('status', 'unknown')
             }
-    
-    def parse_transfer_results(self, json_file):
-        """Parse data transfer test JSON results"""
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            
-        return {
-            'test_type': data.get('test_type', 'unknown'),
-            'speed_mbps': data.get('speed_mbps', 0),
-            'file_size_mb': data.get('file_size_bytes', 0) / 1048576,
-            'duration_seconds': data.get('duration_seconds', 0),
-            'status': data.get('status', 'unknown')
-        }
-    
-    def parse_yabs_results(self, txt_file):
-        """Parse YABS benchmark text results"""
-        results = {}
-        
-        with open(txt_file, 'r') as f:
-            content = f.read()
-            
-        # Extract CPU info
-        cpu_match = re.search(r'CPU cores\s+:\s+(\d+)\s+@\s+([\d.]+\s+\w+)', content)
-        if cpu_match:
-            results['cpu_cores'] = int(cpu_match.group(1))
-            results['cpu_freq'] = cpu_match.group(2)
-            
-        # Extract Geekbench scores
-        gb_single = re.search(r'Single-Core Score\s+:\s+(\d+)', content)
-        gb_multi = re.search(r'Multi-Core Score\s+:\s+(\d+)', content)
-        if gb_single:
-            results['geekbench_single'] = int(gb_single.group(1))
-        if gb_multi:
-            results['geekbench_multi'] = int(gb_multi.group(1))
-            
-        # Extract disk speeds (fio results)
-        fio_results = re.findall(r'(\d+k?)\s+:\s+([\d.]+)\s+MB/s\s+\(([\d.]+)\s+IOPS\)', content)
-        for block_size, speed, iops in fio_results:
-            key = f'disk_{block_size}_mbps'
-            results[key] = float(speed)
-            results[f'disk_{block_size}_iops'] = float(iops)
-            
-        return results
-    
+        if test == 'yabs':
+            result = dict(metrics)
+            if 'cpu_freq' in record['attributes']:
+                result['cpu_freq'] = record['attributes']['cpu_freq']
+            return 'yabs', result
+        if test in BENCHMARK_METRICS:
+            result = dict(metrics)
+            result['benchmark_version'] = record['attributes'].get('benchmark_version', '')
+            return test, result
+        return None
+
     def load_all_results(self):
-        """Load and parse all result files"""
-        files = self.find_result_files()
-        
-        # Process pre-test results
-        for json_file in files['pre']['json']:
-            filename = os.path.basename(json_file)
-            
-            if 'ping' in filename:
-                self.pre_results['ping'] = self.parse_ping_results(json_file)
-            elif 'iperf' in filename:
-                self.pre_results['iperf'] = self.parse_iperf_results(json_file)
-            elif 'dns' in filename:
-                self.pre_results['dns'] = self.parse_dns_results(json_file)
-            elif any(t in filename for t in ['scp', 'rsync', 'wget', 'curl']):
-                transfer_data = self.parse_transfer_results(json_file)
-                self.pre_results[f'transfer_{transfer_data["test_type"]}'] = transfer_data
-                
-        # Process post-test results
-        for json_file in files['post']['json']:
-            filename = os.path.basename(json_file)
-            
-            if 'ping' in filename:
-                self.post_results['ping'] = self.parse_ping_results(json_file)
-            elif 'iperf' in filename:
-                self.post_results['iperf'] = self.parse_iperf_results(json_file)
-            elif 'dns' in filename:
-                self.post_results['dns'] = self.parse_dns_results(json_file)
-            elif any(t in filename for t in ['scp', 'rsync', 'wget', 'curl']):
-                transfer_data = self.parse_transfer_results(json_file)
-                self.post_results[f'transfer_{transfer_data["test_type"]}'] = transfer_data
-                
-        # Process YABS results
-        for txt_file in files['pre']['txt']:
-            if 'yabs' in os.path.basename(txt_file):
-                self.pre_results['yabs'] = self.parse_yabs_results(txt_file)
-                
-        for txt_file in files['post']['txt']:
-            if 'yabs' in os.path.basename(txt_file):
-                self.post_results['yabs'] = self.parse_yabs_results(txt_file)
+        """Load and normalize all result files listed in the manifest (or found by file name)"""
+        try:
+            entries = read_manifest(self.results_dir)
+        except SchemaError as e:
+            print(f"Warning: Ignoring invalid manifest: {e}")
+            entries = []
+        entries = entries or discover_entries(self.results_dir)
+
+        for record in iter_records(self.results_dir, entries=entries):
+            if record['phase'] == 'pre':
+                results = self.pre_results
+            elif record['phase'] == 'post':
+                results = self.post_results
+            else:
+                continue
+
+            mapped = self.record_result(record)
+            if mapped:
+                key, values = mapped
+                results[key] = values
     
     def calculate_changes(self):
         """Calculate percentage changes between pre and post results"""
@@ -212,6 +144,16 @@ class TestResultsProcessor:
                 )
             }
             
+        # Compare iperf UDP results
+        if 'iperf_udp' in self.pre_results and 'iperf_udp' in self.post_results:
+            pre = self.pre_results['iperf_udp']
+            post = self.post_results['iperf_udp']
+            
+            changes['iperf_udp'] = {
+                'throughput_change': self._calc_percent_change(pre['avg_mbps'], post['avg_mbps']),
+                'jitter_change': self._calc_percent_change(pre['jitter_ms'], post['jitter_ms'])
+            }
+            
         # Compare DNS results
         if 'dns' in self.pre_results and 'dns' in self.post_results:
             pre = self.pre_results['dns']
@@ -240,6 +182,20 @@ class TestResultsProcessor:
                     )
                 }
                 
+        # Compare built-in benchmarks run with the same benchmark version
+        for benchmark, (_, metrics) in BENCHMARK_METRICS.items():
+            if benchmark not in self.pre_results or benchmark not in self.post_results:
+                continue
+            pre = self.pre_results[benchmark]
+            post = self.post_results[benchmark]
+            
+            if pre.get('benchmark_version') == post.get('benchmark_version'):
+                changes[benchmark] = {
+                    f'{metric}_change': self._calc_percent_change(pre[metric], post[metric])
+                    for metric, _ in metrics
+                    if metric in pre and metric in post
+                }
+                
         return changes
     
     def _calc_percent_change(self, old_val, new_val):
@@ -295,6 +251,23 @@ class TestResultsProcessor:
                 )) if pre and post else 'N/A'
             ])
             
+        # Add iperf UDP results
+        if 'iperf_udp' in self.pre_results or 'iperf_udp' in self.post_results:
+            pre = self.pre_results.get('iperf_udp', {})
+            post = self.post_results.get('iperf_udp', {})
+            
+            for metric, label in [('avg_mbps', 'UDP Throughput (Mbps)'), ('jitter_ms', 'UDP Jitter (ms)')]:
+                rows.append([
+                    'iPerf3',
+                    label,
+                    f"{pre.get(metric, 0):.2f}" if pre else 'N/A',
+                    f"{post.get(metric, 0):.2f}" if post else 'N/A',
+                    self._format_percent(self._calc_percent_change(
+                        pre.get(metric, 0),
+                        post.get(metric, 0)
+                    )) if pre and post else 'N/A'
+                ])
+            
         # Add DNS results
         if 'dns' in self.pre_results or 'dns' in self.post_results:
             pre = self.pre_results.get('dns', {})
@@ -329,6 +302,25 @@ class TestResultsProcessor:
                     )) if pre and post else 'N/A'
                 ])
         
+        # Add built-in benchmark results
+        for benchmark, (title, metrics) in BENCHMARK_METRICS.items():
+            pre = self.pre_results.get(benchmark, {})
+            post = self.post_results.get(benchmark, {})
+            
+            for metric, label in metrics:
+                if metric not in pre and metric not in post:
+                    continue
+                rows.append([
+                    title,
+                    label,
+                    f"{pre[metric]:.2f}" if metric in pre else 'N/A',
+                    f"{post[metric]:.2f}" if metric in post else 'N/A',
+                    self._format_percent(self._calc_percent_change(
+                        pre[metric],
+                        post[metric]
+                    )) if metric in pre and metric in post else 'N/A'
+                ])
+        
         # Write to CSV
         with open(output_file, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
@@ -363,6 +355,11 @@ class TestResultsProcessor:
             iperf_change = changes['iperf']
             print(f"Throughput Change: {self._format_percent(iperf_change['throughput_change'])}")
             
+        if 'iperf_udp' in changes:
+            udp_change = changes['iperf_udp']
+            print(f"UDP Throughput Change: {self._format_percent(udp_change['throughput_change'])}")
+            print(f"UDP Jitter Change: {self._format_percent(udp_change['jitter_change'])}")
+            
         # DNS Performance
         print("\n### DNS Performance ###")
         if 'dns' in changes:
@@ -377,6 +374,15 @@ class TestResultsProcessor:
                 speed_change = changes[key]['speed_change']
                 print(f"{transfer_type.upper()} Speed Change: {self._format_percent(speed_change)}")
                 
+        # Built-in benchmarks
+        for benchmark, (title, metrics) in BENCHMARK_METRICS.items():
+            if benchmark not in changes:
+                continue
+            print(f"\n### {title} Performance ###")
+            labels = dict(metrics)
+            for metric, value in changes[benchmark].items():
+                print(f"{labels[metric[:-len('_change')]]} Change: {self._format_percent(value)}")
+                
         # Summary
         print("\n### Summary ###")
         improvements = []
@@ -404,6 +410,7 @@ class TestResultsProcessor:
             print("\nNo significant changes detected (±5% threshold)")
 
 def main():
+    trace_startup('process_results')
     parser = argparse.ArgumentParser(description='Process and compare performance test results')
     parser.add_argument('results_dir', help='Directory containing test results')
     parser.add_argument('-o', '--output', help='Output CSV file', default='comparison_results.csv')
@@ -416,12 +423,15 @@ def main():
         sys.exit(1)
         
     processor = TestResultsProcessor(args.results_dir)
-    processor.load_all_results()
+    with span('process_results.load', 'parse'):
+        processor.load_all_results()
     
     if args.report:
-        processor.generate_report()
+        with span('process_results.report', 'analysis'):
+            processor.generate_report()
         
-    processor.export_to_csv(args.output)
+    with span('process_results.export_csv', 'analysis'):
+        processor.export_to_csv(args.output)
     
     print(f"\nProcessing complete. CSV output: {args.output}")
 
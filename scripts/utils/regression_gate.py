@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+"""
+Regression gate for pre/post performance test runs
+Evaluates per-metric budgets over all samples from both phases and writes
+JSON/JUnit verdicts with machine-readable exit codes
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import time
+import argparse
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+
+import numpy as np
+
+from result_schema import load_entries, load_artifact, SchemaError
+from sample_store import load_entry_series
+from tracing import span, trace_startup
+
+# Exit codes
+EXIT_PASS = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+EXIT_NO_DATA = 3
+
+STATISTICS = ('mean', 'median', 'min', 'max', 'p50', 'p90', 'p95', 'p99')
+
+# Artifact types with raw sample series (see sample_store.extract_entry_series)
+SERIES_TYPES = ('ping', 'iperf_tcp', 'iperf_udp', 'dns_dig')
+
+# Minimum samples per phase before a budget is evaluated; the significance
+# test needs this many, below it (--min-samples) only the raw budget is checked
+MIN_SAMPLES_FOR_TEST = 8
+
+BUDGET_RE = re.compile(r'^([+-])(\d+(?:\.\d+)?)(%?)$')
+
+
+class Budget:
+    """A single metric budget, e.g. ping.rtt_ms p99 +10%"""
+
+    def __init__(self, test, metric, statistic, direction, limit, relative):
+        self.test = test
+        self.metric = metric
+        self.statistic = statistic
+        # +1: the metric may rise by at most limit (lower is better)
+        # -1: the metric may drop by at most limit (higher is better)
+        self.direction = direction
+        self.limit = limit
+        self.relative = relative
+
+    @property
+    def name(self):
+        return f'{self.test}.{self.metric}'
+
+    def describe(self):
+        sign = '+' if self.direction > 0 else '-'
+        return f"{self.statistic} {sign}{self.limit:g}{'%' if self.relative else ''}"
+
+
+def parse_budgets(path):
+    """Parse a budget file with lines of '<test>.<metric> <statistic> <budget>'"""
+    budgets = []
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            if len(fields) != 3 or '.' not in fields[0]:
+                raise ValueError(f"{path}:{line_no}: expected '<test>.<metric> <statistic> <budget>'")
+            name, statistic, budget = fields
+            test, metric = name.split('.', 1)
+            if statistic not in STATISTICS:
+                raise ValueError(f"{path}:{line_no}: unknown statistic '{statistic}' (use {', '.join(STATISTICS)})")
+            match = BUDGET_RE.match(budget)
+            if not match:
+                raise ValueError(f"{path}:{line_no}: invalid budget '{budget}' (e.g. +10%, -5%, +0.5)")
+            direction = 1 if match.group(1) == '+' else -1
+            budgets.append(Budget(test, metric, statistic, direction, float(match.group(2)), bool(match.group(3))))
+    return budgets
+
+
+def compute_statistic(values, statistic):
+    """Compute a named statistic over a sample array"""
+    if statistic == 'mean':
+        return float(np.mean(values))
+    if statistic in ('median', 'p50'):
+        return float(np.median(values))
+    if statistic == 'min':
+        return float(np.min(values))
+    if statistic == 'max':
+        return float(np.max(values))
+    return float(np.percentile(values, int(statistic[1:])))
+
+
+def mann_whitney_p(pre, post):
+    """Two-sided Mann-Whitney U p-value using the normal approximation"""
+    n1, n2 = pre.size, post.size
+    combined = np.concatenate([pre, post])
+    order = np.argsort(combined, kind='mergesort')
+    ranks = np.empty(combined.size, dtype=np.float64)
+    ranks[order] = np.arange(1, combined.size + 1)
+
+    # Average ranks over ties
+    sorted_values = combined[order]
+    _, starts, counts = np.unique(sorted_values, return_index=True, return_counts=True)
+    tied = counts > 1
+    for start, count in zip(starts[tied], counts[tied]):
+        ranks[order[start:start + count]] = start + (count + 1) / 2
+
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    tie_term = float(((counts ** 3) - counts).sum()) / ((n1 + n2) * (n1 + n2 - 1))
+    var_u = n1 * n2 / 12 * ((n1 + n2 + 1) - tie_term)
+    if var_u <= 0:
+        return 1.0
+    # Continuity-corrected z score; two-sided p = erfc(|z| / sqrt(2))
+    z = max(abs(u1 - mean_u) - 0.5, 0.0) / math.sqrt(var_u)
+    return min(1.0, math.erfc(z / math.sqrt(2)))
+
+
+class PhaseSamples:
+    """Collect every value of the budgeted metrics for one phase"""
+
+    def __init__(self, wanted):
+        self.wanted = wanted
+        self.values = defaultdict(list)
+
+    def add_entry(self, results_dir, entry):
+        """Add the values for one manifest entry"""
+        metrics = self.wanted.get(entry['type'])
+        record = None
+        if metrics is None:
+            # Transfers and yabs JSON are keyed by the record's test name, not the artifact type
+            record = load_artifact(results_dir, entry)
+            metrics = self.wanted.get(record['test'])
+            if metrics is None:
+                return
+        test = record['test'] if record else entry['type']
+
+        series = {}
+        if entry['type'] in SERIES_TYPES:
+            series = load_entry_series(results_dir, entry, metrics)
+        for metric in metrics:
+            if metric in series:
+                self.values[(test, metric)].append(np.asarray(series[metric], dtype=np.float64))
+                continue
+            if record is None:
+                record = load_artifact(results_dir, entry)
+            if metric in record['metrics']:
+                self.values[(test, metric)].append(np.array([record['metrics'][metric]], dtype=np.float64))
+
+    def get(self, test, metric):
+        """Return all values for a metric as one array"""
+        arrays = self.values.get((test, metric))
+        if not arrays:
+            return np.empty(0)
+        return np.concatenate(arrays)
+
+
+def collect_samples(run_dirs, budgets):
+    """Load the values needed by the budgets for both phases"""
+    wanted = defaultdict(set)
+    for budget in budgets:
+        wanted[budget.test].add(budget.metric)
+
+    phases = {'pre': PhaseSamples(wanted), 'post': PhaseSamples(wanted)}
+    for results_dir, default_phase in run_dirs:
+        for entry in load_entries(results_dir):
+            phase = entry['phase'] or default_phase
+            if phase not in phases:
+                continue
+            try:
+                phases[phase].add_entry(results_dir, entry)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Could not load {entry['file']}: {e}", file=sys.stderr)
+    return phases
+
+
+def evaluate_budget(budget, pre, post, alpha, min_samples=MIN_SAMPLES_FOR_TEST):
+    """Evaluate one budget, returning a verdict dictionary"""
+    verdict = {
+        'metric': budget.name,
+        'statistic': budget.statistic,
+        'budget': budget.describe(),
+        'pre_samples': int(pre.size),
+        'post_samples': int(post.size),
+    }
+    if pre.size == 0 or post.size == 0:
+        verdict.update(status='skipped', message='no samples in one or both phases')
+        return verdict
+    if pre.size < min_samples or post.size < min_samples:
+        verdict.update(status='skipped', message=f'insufficient samples (need {min_samples} per phase)')
+        return verdict
+
+    pre_value = compute_statistic(pre, budget.statistic)
+    post_value = compute_statistic(post, budget.statistic)
+    if budget.relative:
+        if pre_value == 0:
+            change = 0.0 if post_value == 0 else math.copysign(100.0, post_value)
+        else:
+            change = (post_value - pre_value) / abs(pre_value) * 100
+    else:
+        change = post_value - pre_value
+
+    # Positive regression means the metric moved in the bad direction
+    regression = change * budget.direction
+    over_budget = regression > budget.limit
+
+    p_value = None
+    if pre.size >= MIN_SAMPLES_FOR_TEST and post.size >= MIN_SAMPLES_FOR_TEST:
+        p_value = mann_whitney_p(pre, post)
+    significant = p_value is None or p_value < alpha
+
+    verdict.update(
+        pre_value=pre_value,
+        post_value=post_value,
+        change=float(change),
+        change_unit='%' if budget.relative else 'abs',
+        p_value=p_value,
+    )
+    if over_budget and significant:
+        verdict.update(status='fail', message=f"{budget.statistic} changed by {change:+.2f}"
+                       f"{'%' if budget.relative else ''}, budget {budget.describe()}")
+    elif over_budget:
+        verdict.update(status='pass', message=f"over budget but not significant (p={p_value:.3f})")
+    else:
+        verdict.update(status='pass', message='within budget')
+    return verdict
+
+
+def write_junit(verdicts, path, elapsed):
+    """Write verdicts as a JUnit XML report"""
+    failures = sum(1 for v in verdicts if v['status'] == 'fail')
+    skipped = sum(1 for v in verdicts if v['status'] == 'skipped')
+    suite = ET.Element('testsuite', name='regression-gate', tests=str(len(verdicts)),
+                       failures=str(failures), skipped=str(skipped), errors='0', time=f'{elapsed:.3f}')
+    for verdict in verdicts:
+        case = ET.SubElement(suite, 'testcase', classname='regression_gate',
+                             name=f"{verdict['metric']} {verdict['statistic']}")
+        if verdict['status'] == 'fail':
+            failure = ET.SubElement(case, 'failure', message=verdict['message'])
+            failure.text = json.dumps(verdict, indent=2)
+        elif verdict['status'] == 'skipped':
+            ET.SubElement(case, 'skipped', message=verdict['message'])
+    ET.ElementTree(suite).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def run_gate(run_dirs, budgets, alpha=0.05, min_samples=MIN_SAMPLES_FOR_TEST):
+    """Evaluate all budgets and return (exit_code, verdicts)"""
+    with span('regression_gate.collect', 'parse'):
+        phases = collect_samples(run_dirs, budgets)
+    with span('regression_gate.evaluate', 'analysis'):
+        verdicts = [evaluate_budget(b, phases['pre'].get(b.test, b.metric), phases['post'].get(b.test, b.metric),
+                                    alpha, min_samples) for b in budgets]
+
+    if any(v['status'] == 'fail' for v in verdicts):
+        return EXIT_REGRESSION, verdicts
+    if all(v['status'] == 'skipped' for v in verdicts):
+        return EXIT_NO_DATA, verdicts
+    return EXIT_PASS, verdicts
+
+
+def main():
+    trace_startup('regression_gate')
+    parser = argparse.ArgumentParser(description='Gate a rollout on pre/post performance budgets')
+    parser.add_argument('results_dirs', nargs='+',
+                        help='One directory with pre_/post_ results, or a pre directory followed by a post directory')
+    parser.add_argument('-b', '--budgets', required=True, help='Budget file (see configs/gate_budgets_template.conf)')
+    parser.add_argument('-a', '--alpha', type=float, default=0.05, help='Significance level (default: 0.05)')
+    parser.add_argument('-m', '--min-samples', type=int, default=MIN_SAMPLES_FOR_TEST,
+                        help=f'Minimum samples per phase to evaluate a budget (default: {MIN_SAMPLES_FOR_TEST}); '
+                             f'below {MIN_SAMPLES_FOR_TEST} no significance test is applied')
+    parser.add_argument('-j', '--json', help='Write JSON verdicts to this file')
+    parser.add_argument('-x', '--junit', help='Write JUnit XML verdicts to this file')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print failures')
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+
+    if args.min_samples < 1:
+        print("Error: --min-samples must be at least 1")
+        sys.exit(EXIT_ERROR)
+    if len(args.results_dirs) > 2:
+        print("Error: Pass one results directory or a pre and a post directory")
+        sys.exit(EXIT_ERROR)
+    for results_dir in args.results_dirs:
+        if not os.path.exists(results_dir):
+            print(f"Error: Results directory not found: {results_dir}")
+            sys.exit(EXIT_ERROR)
+
+    if len(args.results_dirs) == 2:
+        run_dirs = [(args.results_dirs[0], 'pre'), (args.results_dirs[1], 'post')]
+    else:
+        run_dirs = [(args.results_dirs[0], '')]
+
+    try:
+        budgets = parse_budgets(args.budgets)
+        exit_code, verdicts = run_gate(run_dirs, budgets, args.alpha, args.min_samples)
+    except (OSError, ValueError, SchemaError) as e:
+        print(f"Error: {e}")
+        sys.exit(EXIT_ERROR)
+
+    elapsed = time.perf_counter() - start
+
+    for verdict in verdicts:
+        if args.quiet and verdict['status'] != 'fail':
+            continue
+        symbol = {'pass': '✓', 'fail': '✗', 'skipped': '-'}[verdict['status']]
+        values = ''
+        if 'pre_value' in verdict:
+            values = f" {verdict['pre_value']:.3f} → {verdict['post_value']:.3f}"
+        print(f"  {symbol} {verdict['metric']} {verdict['statistic']}{values}: {verdict['message']}")
+
+    status = {EXIT_PASS: 'PASS', EXIT_REGRESSION: 'FAIL', EXIT_NO_DATA: 'NO DATA'}[exit_code]
+    print(f"\nRegression gate: {status} ({len(verdicts)} budgets, {elapsed:.3f}s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'status': status.lower().replace(' ', '_'), 'exit_code': exit_code,
+                       'elapsed_seconds': elapsed, 'verdicts': verdicts}, f, indent=2)
+    if args.junit:
+        write_junit(verdicts, args.junit, elapsed)
+
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+
+"""
+Unified result schema for performance test artifacts
+Loads run manifests, normalizes every test output into one versioned
+record format and validates records
+"""
+
+import json
+import os
+import re
+import sys
+import glob
+import argparse
+from datetime import datetime, timezone
+
+SCHEMA_VERSION = 1
+MANIFEST_NAME = 'manifest.jsonl'
+
+# Artifact types written to the manifest by the shell scripts
+ARTIFACT_TYPES = (
+    'ping', 'traceroute', 'iperf_tcp', 'iperf_udp',
+    'dns_dig', 'dnsperf', 'transfer', 'yabs', 'yabs_json', 'cpu_memory',
+    'loopback',
+)
+
+# Required manifest fields and their types
+MANIFEST_FIELDS = {
+    'schema_version': int,
+    'type': str,
+    'file': str,
+    'host': str,
+    'phase': str,
+    'target': str,
+    'timestamp': str,
+}
+
+# Required record fields and their types
+RECORD_FIELDS = {
+    'schema_version': int,
+    'type': str,
+    'test': str,
+    'host': str,
+    'phase': str,
+    'target': str,
+    'timestamp': str,
+    'source': str,
+    'metrics': dict,
+    'attributes': dict,
+}
+
+# Units for every metric name a normalizer can emit
+METRIC_UNITS = {
+    'rtt_min_ms': 'ms',
+    'rtt_avg_ms': 'ms',
+    'rtt_max_ms': 'ms',
+    'rtt_stddev_ms': 'ms',
+    'packet_loss_percent': '%',
+    'packets_transmitted': 'count',
+    'packets_received': 'count',
+    'hops_found': 'count',
+    'sender_mbps': 'Mbps',
+    'receiver_mbps': 'Mbps',
+    'throughput_mbps': 'Mbps',
+    'retransmits': 'count',
+    'jitter_ms': 'ms',
+    'lost_packets': 'count',
+    'lost_percent': '%',
+    'packets': 'count',
+    'avg_response_time_ms': 'ms',
+    'min_response_time_ms': 'ms',
+    'max_response_time_ms': 'ms',
+    'success_rate': '%',
+    'total_queries': 'count',
+    'successful_queries': 'count',
+    'failed_queries': 'count',
+    'queries_sent': 'count',
+    'queries_completed': 'count',
+    'queries_lost': 'count',
+    'speed_mbps': 'MB/s',
+    'reported_speed_mbps': 'MB/s',
+    'file_size_bytes': 'bytes',
+    'duration_seconds': 's',
+    'cpu_cores': 'count',
+    'geekbench_single': 'score',
+    'geekbench_multi': 'score',
+    'ram_kib': 'KiB',
+    'swap_kib': 'KiB',
+    'disk_kb': 'KB',
+    'bench_workers': 'count',
+    'int_1t_mops': 'Mops/s',
+    'int_mt_mops': 'Mops/s',
+    'float_1t_gflops': 'GFLOPS',
+    'float_mt_gflops': 'GFLOPS',
+    'zlib_1t_mbps': 'MB/s',
+    'zlib_mt_mbps': 'MB/s',
+    'sha256_mbps': 'MB/s',
+    'sha1_mbps': 'MB/s',
+    'blake2b_mbps': 'MB/s',
+    'md5_mbps': 'MB/s',
+    'aes_256_gcm_mbps': 'MB/s',
+    'stream_copy_mbps': 'MB/s',
+    'stream_scale_mbps': 'MB/s',
+    'stream_add_mbps': 'MB/s',
+    'stream_triad_mbps': 'MB/s',
+    'stream_triad_1t_mbps': 'MB/s',
+}
+
+# Per block size fio metrics (disk_4k_mbps, disk_64k_iops, ...)
+FIO_METRIC_RE = re.compile(r'^disk_\w+_(mbps|iops|read_mbps|write_mbps|read_iops|write_iops)$')
+
+# Pointer-chase latency per working set (mem_latency_32k_ns, ...), timed in
+# the Python interpreter
+LATENCY_METRIC_RE = re.compile(r'^mem_latency_\w+_ns$')
+
+# yabs iperf3 speed per server location (iperf_ipv4_clouvider_london_uk_send_mbps, ...)
+YABS_IPERF_METRIC_RE = re.compile(r'^iperf_ipv[46]_\w+_(send|recv)_mbps$')
+
+# Loopback benchmark sweeps (tcp_msg_16k_mbps, udp_rr_1_p99_us, ...)
+LOOPBACK_METRIC_RE = re.compile(r'^(tcp|udp)_\w+?_(mbps|loss_percent|us|tps|lost)$')
+LOOPBACK_UNITS = {'mbps': 'Mbps', 'loss_percent': '%', 'us': 'us', 'tps': 'count/s', 'lost': 'count'}
+
+
+class SchemaError(ValueError):
+    """Raised when a manifest entry or record does not match the schema"""
+
+
+def metric_unit(name):
+    """Return the unit for a metric name"""
+    if name in METRIC_UNITS:
+        return METRIC_UNITS[name]
+    match = FIO_METRIC_RE.match(name)
+    if match:
+        return 'MB/s' if match.group(1).endswith('mbps') else 'IOPS'
+    if LATENCY_METRIC_RE.match(name):
+        return 'ns'
+    if YABS_IPERF_METRIC_RE.match(name):
+        return 'Mbps'
+    match = LOOPBACK_METRIC_RE.match(name)
+    if match:
+        return LOOPBACK_UNITS[match.group(2)]
+    return ''
+
+
+def _check_fields(obj, fields):
+    """Check required fields and their types, returning a list of errors"""
+    if not isinstance(obj, dict):
+        return ['not a JSON object']
+
+    errors = []
+    for field, field_type in fields.items():
+        if field not in obj:
+            errors.append(f"missing field '{field}'")
+        elif not isinstance(obj[field], field_type) or isinstance(obj[field], bool):
+            errors.append(f"field '{field}' must be {field_type.__name__}")
+    return errors
+
+
+def validate_manifest_entry(entry):
+    """Validate a manifest entry, returning a list of errors"""
+    errors = _check_fields(entry, MANIFEST_FIELDS)
+    if errors:
+        return errors
+    if entry['schema_version'] > SCHEMA_VERSION:
+        errors.append(f"unsupported schema_version {entry['schema_version']}")
+    if entry['type'] not in ARTIFACT_TYPES:
+        errors.append(f"unknown artifact type '{entry['type']}'")
+    return errors
+
+
+def validate_record(record):
+    """Validate a normalized record, returning a list of errors"""
+    errors = _check_fields(record, RECORD_FIELDS)
+    if errors:
+        return errors
+    if record['type'] not in ARTIFACT_TYPES:
+        errors.append(f"unknown artifact type '{record['type']}'")
+    for name, value in record['metrics'].items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            errors.append(f"metric '{name}' must be numeric")
+    return errors
+
+
+def classify_filename(filename):
+    """Guess the artifact type of a legacy result file without a manifest"""
+    if filename.endswith('.txt'):
+        return 'yabs' if 'yabs' in filename else None
+    if 'cpu_memory' in filename:
+        return 'cpu_memory'
+    if 'loopback' in filename:
+        return 'loopback'
+    if 'ping' in filename:
+        return 'ping'
+    if 'traceroute' in filename:
+        return 'traceroute'
+    if 'iperf_udp' in filename:
+        return 'iperf_udp'
+    if 'iperf' in filename:
+        return 'iperf_tcp'
+    if 'dnsperf' in filename:
+        return 'dnsperf'
+    if 'dns' in filename:
+        return 'dns_dig'
+    if any(t in filename for t in ['scp', 'rsync', 'wget', 'curl']):
+        return 'transfer'
+    if 'yabs' in filename:
+        return 'yabs_json'
+    return None
+
+
+def phase_from_filename(filename):
+    """Extract the test phase from a legacy result file name"""
+    if 'pre_' in filename:
+        return 'pre'
+    if 'post_' in filename:
+        return 'post'
+    return ''
+
+
+def read_manifest(results_dir):
+    """Read the run manifest, returning a list of entries (empty if absent)"""
+    manifest_path = os.path.join(results_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return []
+
+    entries = []
+    with open(manifest_path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise SchemaError(f"{manifest_path}:{line_no}: {e}") from e
+            errors = validate_manifest_entry(entry)
+            if errors:
+                raise SchemaError(f"{manifest_path}:{line_no}: {'; '.join(errors)}")
+            entries.append(entry)
+    return entries
+
+
+def discover_entries(results_dir):
+    """Build manifest-style entries for a legacy directory by file name"""
+    entries = []
+    paths = glob.glob(os.path.join(results_dir, '*.json')) + glob.glob(os.path.join(results_dir, '*.txt'))
+    for path in sorted(paths):
+        filename = os.path.basename(path)
+        artifact_type = classify_filename(filename)
+        if artifact_type is None:
+            continue
+        mtime = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        entries.append({
+            'schema_version': SCHEMA_VERSION,
+            'type': artifact_type,
+            'file': filename,
+            'host': '',
+            'phase': phase_from_filename(filename),
+            'target': '',
+            'timestamp': mtime.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+    return entries
+
+
+def load_entries(results_dir):
+    """Return manifest entries for a run, falling back to file name discovery"""
+    return read_manifest(results_dir) or discover_entries(results_dir)
+
+
+def _num(value, default=0):
+    """Coerce a JSON value into a number"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _pick(data, keys):
+    """Copy the numeric fields listed in keys out of data"""
+    return {key: _num(data[key]) for key in keys if key in data and data[key] is not None}
+
+
+def normalize_ping(data):
+    """Normalize ping JSON into metrics, attributes and target"""
+    metrics = _pick(data, ['rtt_min_ms', 'rtt_avg_ms', 'rtt_max_ms', 'rtt_stddev_ms',
+                           'packet_loss_percent', 'packets_transmitted', 'packets_received'])
+    return metrics, {}, data.get('destination', '')
+
+
+def normalize_traceroute(data):
+    """Normalize traceroute JSON into metrics, attributes and target"""
+    return _pick(data, ['hops_found']), {}, data.get('destination', '')
+
+
+def normalize_iperf_tcp(data):
+    """Normalize iperf3 TCP JSON into metrics, attributes and target"""
+    metrics = {}
+    target = ''
+    if 'end' in data:
+        end = data['end']
+        if 'sum_sent' in end:
+            metrics['sender_mbps'] = _num(end['sum_sent'].get('bits_per_second')) / 1e6
+            if 'retransmits' in end['sum_sent']:
+                metrics['retransmits'] = _num(end['sum_sent']['retransmits'])
+        if 'sum_received' in end:
+            metrics['receiver_mbps'] = _num(end['sum_received'].get('bits_per_second')) / 1e6
+        if 'sender_mbps' in metrics and 'receiver_mbps' in metrics:
+            metrics['throughput_mbps'] = (metrics['sender_mbps'] + metrics['receiver_mbps']) / 2
+        connected = data.get('start', {}).get('connecting_to', {})
+        target = connected.get('host', '')
+    elif 'speed_mbps' in data:
+        # Custom format from our script
+        metrics['throughput_mbps'] = _num(data['speed_mbps'])
+    return metrics, {}, target
+
+
+def normalize_iperf_udp(data):
+    """Normalize iperf3 UDP JSON into metrics, attributes and target"""
+    metrics = {}
+    summary = data.get('end', {}).get('sum', {})
+    if summary:
+        metrics['throughput_mbps'] = _num(summary.get('bits_per_second')) / 1e6
+        metrics.update(_pick(summary, ['jitter_ms', 'lost_packets', 'packets', 'lost_percent']))
+    target = data.get('start', {}).get('connecting_to', {}).get('host', '')
+    return metrics, {}, target
+
+
+def normalize_dns_dig(data):
+    """Normalize dig-based DNS JSON into metrics, attributes and target"""
+    summary = data.get('summary', {})
+    metrics = _pick(summary, ['avg_response_time_ms', 'min_response_time_ms', 'max_response_time_ms',
+                              'success_rate', 'total_queries', 'successful_queries', 'failed_queries'])
+    attributes = {'query_type': str(data.get('query_type', ''))}
+    return metrics, attributes, data.get('dns_server', '')
+
+
+def normalize_dnsperf(data):
+    """Normalize dnsperf JSON into metrics, attributes and target"""
+    metrics = _pick(data, ['queries_sent', 'queries_completed', 'queries_lost'])
+    for src, dst in [('avg_latency_ms', 'avg_response_time_ms'),
+                     ('min_latency_ms', 'min_response_time_ms'),
+                     ('max_latency_ms', 'max_response_time_ms')]:
+        if src in data:
+            metrics[dst] = _num(data[src])
+    if metrics.get('queries_sent'):
+        metrics['success_rate'] = metrics.get('queries_completed', 0) * 100 / metrics['queries_sent']
+    attributes = {'query_type': str(data.get('query_type', ''))}
+    return metrics, attributes, data.get('dns_server', '')
+
+
+def normalize_transfer(data):
+    """Normalize data transfer JSON into metrics, attributes and target"""
+    metrics = _pick(data, ['speed_mbps', 'file_size_bytes', 'duration_seconds'])
+    if 'curl_reported_speed_mbps' in data:
+        metrics['reported_speed_mbps'] = _num(data['curl_reported_speed_mbps'])
+    attributes = {
+        'test_type': str(data.get('test_type', 'unknown')),
+        'status': str(data.get('status', 'unknown')),
+    }
+    if 'direction' in data:
+        attributes['direction'] = str(data['direction'])
+    target = data.get('remote_host') or data.get('url', '')
+    return metrics, attributes, target
+
+
+YABS_SIZE_UNITS = {'KiB': 1, 'MiB': 1024, 'GiB': 1024 ** 2, 'TiB': 1024 ** 3}
+# fio speeds are printed by yabs' format_speed (base 1000 from KB/s), in MB/s
+YABS_SPEED_UNITS = {'KB/s': 0.001, 'MB/s': 1, 'GB/s': 1000}
+YABS_FIO_ROW_METRICS = {'Read': ('read_mbps', 'read_iops'), 'Write': ('write_mbps', 'write_iops'),
+                        'Total': ('mbps', 'iops')}
+
+
+def _yabs_iops(value):
+    """Convert a yabs IOPS cell (format_iops, e.g. 10.6k) to a number"""
+    if value.endswith('k'):
+        return float(value[:-1]) * 1000
+    return float(value)
+
+
+def parse_yabs_fio_table(content):
+    """Parse the yabs fio table (Block Size header, Read/Write/Total rows) into metrics"""
+    metrics = {}
+    block_sizes = []
+    for line in content.splitlines():
+        cells = [cell.strip() for cell in line.split('|')]
+        if cells[0] == 'Block Size':
+            block_sizes = [cell.split()[0] for cell in cells[1:] if cell]
+            continue
+        if cells[0] not in YABS_FIO_ROW_METRICS or not block_sizes:
+            continue
+        speed_metric, iops_metric = YABS_FIO_ROW_METRICS[cells[0]]
+        for bs, cell in zip(block_sizes, cells[1:]):
+            match = re.match(r'([\d.]+)\s+(KB/s|MB/s|GB/s)\s+\(([\d.]+k?)\)', cell)
+            if match:
+                metrics[f'disk_{bs}_{speed_metric}'] = float(match.group(1)) * YABS_SPEED_UNITS[match.group(2)]
+                metrics[f'disk_{bs}_{iops_metric}'] = _yabs_iops(match.group(3))
+    return metrics
+
+
+# iperf3 bitrates (base 1000), printed unchanged in the yabs iperf table
+YABS_BITRATE_UNITS = {'bits/sec': 0.000001, 'Kbits/sec': 0.001, 'Mbits/sec': 1, 'Gbits/sec': 1000}
+YABS_IPERF_HEADING_RE = re.compile(r'iperf3 Network Speed Tests \((IPv[46])\):')
+# Progress lines ("Performing IPv4 iperf3 send test...") are erased with \r and ESC[0K
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+
+def yabs_iperf_metric(mode, provider, location, direction):
+    """Return the metric name for a yabs iperf3 speed (mode IPv4/IPv6, direction send/recv)"""
+    # The advertised link speed, e.g. "(10G)", is not part of the location
+    place = re.sub(r'\s*\(.*\)$', '', location)
+    slug = re.sub(r'[^a-z0-9]+', '_', f'{provider} {place}'.lower()).strip('_')
+    return f'iperf_{mode.lower()}_{slug}_{direction}_mbps'
+
+
+def _yabs_bitrate(value):
+    """Convert a yabs iperf3 speed (e.g. 1.61 Gbits/sec) to Mbps, or None for busy servers"""
+    match = re.match(r'([\d.]+)\s+((?:[KMG])?bits/sec)$', value.strip())
+    if not match:
+        return None
+    return float(match.group(1)) * YABS_BITRATE_UNITS[match.group(2)]
+
+
+def parse_yabs_iperf_table(content):
+    """Parse the yabs iperf3 tables (Provider, Location, Send, Recv, Ping rows) into metrics"""
+    metrics = {}
+    mode = None
+    for line in content.splitlines():
+        line = ANSI_ESCAPE_RE.sub('', line).rsplit('\r', 1)[-1]
+        heading = YABS_IPERF_HEADING_RE.search(line)
+        if heading:
+            mode = heading.group(1)
+            continue
+        cells = [cell.strip() for cell in line.split('|')]
+        if mode is None or len(cells) != 5:
+            continue
+        for direction, cell in [('send', cells[2]), ('recv', cells[3])]:
+            speed = _yabs_bitrate(cell)
+            if speed is not None:
+                metrics[yabs_iperf_metric(mode, cells[0], cells[1], direction)] = speed
+    return metrics
+
+
+def normalize_yabs_text(content):
+    """Normalize YABS text output into metrics, attributes and target"""
+    metrics = {}
+    attributes = {}
+
+    cpu_match = re.search(r'CPU cores\s+:\s+(\d+)\s+@\s+([\d.]+\s+\w+)', content)
+    if cpu_match:
+        metrics['cpu_cores'] = int(cpu_match.group(1))
+        attributes['cpu_freq'] = cpu_match.group(2)
+    proc_match = re.search(r'Processor\s+:\s+(.+)', content)
+    if proc_match:
+        attributes['cpu_model'] = proc_match.group(1).strip()
+    kernel_match = re.search(r'Kernel\s+:\s+(\S+)', content)
+    if kernel_match:
+        attributes['kernel'] = kernel_match.group(1)
+    for label, attr in [('Distro', 'distro'), ('VM Type', 'virt_type')]:
+        match = re.search(rf'{label}\s+:\s+(.+)', content)
+        if match:
+            attributes[attr] = match.group(1).strip()
+
+    # Sizes are printed by yabs' format_size (base 1024 from KiB)
+    for label, metric in [('RAM', 'ram_kib'), ('Swap', 'swap_kib'), ('Disk', 'disk_kb')]:
+        match = re.search(rf'^{label}\s+:\s+([\d.]+)\s+(KiB|MiB|GiB|TiB)', content, re.MULTILINE)
+        if match:
+            metrics[metric] = float(match.group(1)) * YABS_SIZE_UNITS[match.group(2)]
+
+    gb_single = re.search(r'Single[- ]Core(?: Score)?\s+[:|]\s+(\d+)', content)
+    gb_multi = re.search(r'Multi[- ]Core(?: Score)?\s+[:|]\s+(\d+)', content)
+    if gb_single:
+        metrics['geekbench_single'] = int(gb_single.group(1))
+    if gb_multi:
+        metrics['geekbench_multi'] = int(gb_multi.group(1))
+
+    metrics.update(parse_yabs_fio_table(content))
+    metrics.update(parse_yabs_iperf_table(content))
+    # Older one-line format: "4k : 42.25 MB/s (10600 IOPS)"
+    fio_results = re.findall(r'(\d+k?)\s+:\s+([\d.]+)\s+MB/s\s+\(([\d.]+)\s+IOPS\)', content)
+    for block_size, speed, iops in fio_results:
+        metrics.setdefault(f'disk_{block_size}_mbps', float(speed))
+        metrics.setdefault(f'disk_{block_size}_iops', float(iops))
+
+    return metrics, attributes, ''
+
+
+def normalize_yabs_json(data):
+    """Normalize yabs.sh -j/-w JSON into metrics, attributes and target"""
+    metrics = {}
+    attributes = {}
+
+    cpu = data.get('cpu', {})
+    os_info = data.get('os', {})
+    mem = data.get('mem', {})
+    if 'cores' in cpu:
+        metrics['cpu_cores'] = _num(cpu['cores'])
+    for key, attr in [('model', 'cpu_model'), ('freq', 'cpu_freq')]:
+        if key in cpu:
+            attributes[attr] = str(cpu[key])
+    for key in ['aes', 'virt']:
+        if key in cpu:
+            attributes[f'cpu_{key}'] = str(cpu[key]).lower()
+    for key, attr in [('arch', 'arch'), ('distro', 'distro'), ('kernel', 'kernel'), ('vm', 'virt_type')]:
+        if key in os_info:
+            attributes[attr] = str(os_info[key])
+    for key, metric in [('ram', 'ram_kib'), ('swap', 'swap_kib'), ('disk', 'disk_kb')]:
+        if key in mem:
+            metrics[metric] = _num(mem[key])
+
+    for fio in data.get('fio', []):
+        bs = fio.get('bs', '')
+        # yabs reports fio speeds in KB/s
+        metrics[f'disk_{bs}_mbps'] = _num(fio.get('speed_rw')) / 1000
+        metrics[f'disk_{bs}_read_mbps'] = _num(fio.get('speed_r')) / 1000
+        metrics[f'disk_{bs}_write_mbps'] = _num(fio.get('speed_w')) / 1000
+        metrics[f'disk_{bs}_iops'] = _num(fio.get('iops_rw'))
+        metrics[f'disk_{bs}_read_iops'] = _num(fio.get('iops_r'))
+        metrics[f'disk_{bs}_write_iops'] = _num(fio.get('iops_w'))
+
+    for iperf in data.get('iperf', []):
+        for direction in ['send', 'recv']:
+            speed = _yabs_bitrate(str(iperf.get(direction, '')))
+            if speed is not None:
+                metric = yabs_iperf_metric(iperf.get('mode', ''), iperf.get('provider', ''),
+                                           iperf.get('loc', ''), direction)
+                metrics[metric] = speed
+
+    for gb in data.get('geekbench', []):
+        # Keep the newest Geekbench version's scores
+        metrics['geekbench_single'] = _num(gb.get('single'))
+        metrics['geekbench_multi'] = _num(gb.get('multi'))
+        attributes['geekbench_version'] = str(gb.get('version', ''))
+
+    return metrics, attributes, ''
+
+
+def normalize_cpu_memory(data):
+    """Normalize cpu_memory_benchmark.py JSON into metrics, attributes and target"""
+    metrics = _pick(data.get('results', {}), data.get('results', {}).keys())
+    attributes = {key: str(data[key]) for key in ['benchmark_version', 'cpu_model', 'arch', 'python_version',
+                                                  'numpy_version', 'blas', 'aes_implementation']
+                  if key in data}
+    return metrics, attributes, ''
+
+
+def normalize_loopback(data):
+    """Normalize loopback_benchmark.py JSON into metrics, attributes and target"""
+    metrics = _pick(data.get('results', {}), data.get('results', {}).keys())
+    attributes = {key: str(data[key]) for key in ['benchmark_version', 'mode', 'kernel', 'arch',
+                                                  'tcp_congestion_control', 'duration_seconds']
+                  if key in data}
+    return metrics, attributes, data.get('mode', '')
+
+
+NORMALIZERS = {
+    'ping': normalize_ping,
+    'traceroute': normalize_traceroute,
+    'iperf_tcp': normalize_iperf_tcp,
+    'iperf_udp': normalize_iperf_udp,
+    'dns_dig': normalize_dns_dig,
+    'dnsperf': normalize_dnsperf,
+    'transfer': normalize_transfer,
+    'yabs_json': normalize_yabs_json,
+    'cpu_memory': normalize_cpu_memory,
+    'loopback': normalize_loopback,
+}
+
+
+def load_artifact(results_dir, entry):
+    """Load the file behind a manifest entry and return its normalized record"""
+    path = os.path.join(results_dir, entry['file'])
+    artifact_type = entry['type']
+
+    with open(path, 'r') as f:
+        if artifact_type == 'yabs':
+            metrics, attributes, target = normalize_yabs_text(f.read())
+            data = {}
+        else:
+            data = json.load(f)
+            metrics, attributes, target = NORMALIZERS[artifact_type](data)
+
+    test = artifact_type
+    if artifact_type == 'transfer':
+        test = f"transfer_{attributes['test_type']}"
+    elif artifact_type == 'yabs_json':
+        # Text and JSON yabs output carry the same metrics
+        test = 'yabs'
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'type': artifact_type,
+        'test': test,
+        'host': entry['host'] or str(data.get('host', '')),
+        'phase': entry['phase'],
+        'target': entry['target'] or str(target),
+        'timestamp': entry['timestamp'],
+        'source': entry['file'],
+        'metrics': metrics,
+        'attributes': attributes,
+    }
+
+
+def iter_records(results_dir, strict=False, entries=None):
+    """Yield normalized records for every artifact in a run directory (or the given entries)"""
+    for entry in load_entries(results_dir) if entries is None else entries:
+        try:
+            yield load_artifact(results_dir, entry)
+        except (OSError, ValueError, KeyError, AttributeError, TypeError) as e:
+            if strict:
+                raise SchemaError(f"{entry['file']}: {e}") from e
+            print(f"Warning: Could not load {entry['file']}: {e}", file=sys.stderr)
+
+
+def load_records(results_dir, strict=False):
+    """Return normalized records for every artifact in a run directory"""
+    return list(iter_records(results_dir, strict))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and dump normalized performance test results')
+    parser.add_argument('command', choices=['validate', 'dump'], help='Action to perform')
+    parser.add_argument('results_dir', help='Directory containing test results')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.results_dir):
+        print(f"Error: Results directory not found: {args.results_dir}")
+        sys.exit(1)
+
+    try:
+        records = load_records(args.results_dir, strict=args.command == 'validate')
+    except SchemaError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.command == 'dump':
+        for record in records:
+            print(json.dumps(record, sort_keys=True))
+        return
+
+    invalid = 0
+    for record in records:
+        errors = validate_record(record)
+        if errors:
+            invalid += 1
+            print(f"✗ {record['source']}: {'; '.join(errors)}")
+
+    print(f"{len(records) - invalid}/{len(records)} records valid (schema v{SCHEMA_VERSION})")
+    sys.exit(1 if invalid else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+
+"""
+Compact binary storage for raw measurement samples
+Stores typed fixed-width arrays in compressed blocks behind a small header,
+reads them back through NumPy (memory-mapped when uncompressed) and converts
+raw samples out of existing result files
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+import argparse
+import tempfile
+from contextlib import nullcontext
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from result_schema import load_entries
+from tracing import span, trace_startup
+
+MAGIC = b'YBS1'
+FORMAT_VERSION = 1
+SAMPLE_EXT = '.ybs'
+SAMPLES_DIR = 'samples'
+
+# magic, format version, dtype code, codec, sample count, samples per block, block count, index offset
+HEADER = struct.Struct('<4sHBBQIIQ')
+# offset, compressed length, sample count
+INDEX_ENTRY = struct.Struct('<QII')
+STRING_LEN = struct.Struct('<H')
+
+DTYPES = {1: 'f4', 2: 'f8', 3: 'i4', 4: 'i8', 5: 'u4', 6: 'u8'}
+DTYPE_CODES = {name: code for code, name in DTYPES.items()}
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+# Codec flag: bytes of each block are grouped by significance before compression
+SHUFFLE_FLAG = 0x80
+
+DEFAULT_BLOCK_SAMPLES = 65536
+
+
+class SampleFormatError(ValueError):
+    """Raised when a sample file is malformed or uses an unsupported feature"""
+
+
+def _compressor(codec):
+    """Return a bytes -> bytes compression function for a codec"""
+    if codec == CODEC_NONE:
+        return bytes
+    if codec == CODEC_ZLIB:
+        return lambda data: zlib.compress(data, 6)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise SampleFormatError("zstd codec requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3).compress
+    raise SampleFormatError(f"unknown codec {codec}")
+
+
+def _decompressor(codec):
+    """Return a buffer -> bytes decompression function for a codec"""
+    if codec == CODEC_NONE:
+        return lambda data: data
+    if codec == CODEC_ZLIB:
+        return zlib.decompress
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise SampleFormatError("zstd codec requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress
+    raise SampleFormatError(f"unknown codec {codec}")
+
+
+def shuffle_bytes(block):
+    """Group the bytes of a block by significance so similar bytes compress together"""
+    return block.view(np.uint8).reshape(-1, block.dtype.itemsize).T.tobytes()
+
+
+def unshuffle_bytes(raw, dtype, count):
+    """Reverse shuffle_bytes, returning a NumPy array of count samples"""
+    planes = np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, count)
+    return np.ascontiguousarray(planes.T).view(dtype).ravel()
+
+
+def default_codec():
+    """Return the best codec available on this host"""
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+class SampleWriter:
+    """Stream samples of one metric into a compressed block file"""
+
+    def __init__(self, path, name, unit='', dtype='f8', codec=None, block_samples=DEFAULT_BLOCK_SAMPLES,
+                 shuffle=False):
+        if dtype not in DTYPE_CODES:
+            raise SampleFormatError(f"unsupported dtype {dtype}")
+        codec = codec or default_codec()
+        if codec not in CODECS:
+            raise SampleFormatError(f"unsupported codec {codec}")
+
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder('<')
+        self.dtype_code = DTYPE_CODES[dtype]
+        self.codec = CODECS[codec]
+        # Byte shuffling only pays off when the block is compressed afterwards;
+        # it helps integer counters but can hurt noisy floating point samples
+        self.shuffle = shuffle and self.codec != CODEC_NONE
+        self.compress = _compressor(self.codec)
+        self.block_samples = block_samples
+        self.count = 0
+        self.index = []
+        self.pending = []
+        self.pending_count = 0
+
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.dtype_code, self._codec_byte(), 0, block_samples, 0, 0))
+        for text in (name, unit):
+            encoded = text.encode('utf-8')
+            self.file.write(STRING_LEN.pack(len(encoded)))
+            self.file.write(encoded)
+
+    def _codec_byte(self):
+        """Return the codec id with its flags as stored in the header"""
+        return self.codec | (SHUFFLE_FLAG if self.shuffle else 0)
+
+    def append(self, values):
+        """Append an array (or sequence) of samples"""
+        values = np.asarray(values, dtype=self.dtype).ravel()
+        while values.size:
+            take = min(values.size, self.block_samples - self.pending_count)
+            self.pending.append(values[:take])
+            self.pending_count += take
+            values = values[take:]
+            if self.pending_count == self.block_samples:
+                self._flush_block()
+
+    def _flush_block(self):
+        """Compress and write the pending block"""
+        if not self.pending_count:
+            return
+        block = np.concatenate(self.pending) if len(self.pending) > 1 else self.pending[0]
+        payload = self.compress(shuffle_bytes(block) if self.shuffle else block.tobytes())
+        self.index.append((self.file.tell(), len(payload), block.size))
+        self.file.write(payload)
+        self.count += block.size
+        self.pending = []
+        self.pending_count = 0
+
+    def close(self):
+        """Flush remaining samples, write the block index and finalize the header"""
+        if self.file.closed:
+            return
+        self._flush_block()
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.dtype_code, self._codec_byte(), self.count,
+                                    self.block_samples, len(self.index), index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SampleReader:
+    """Read a sample file through a memory map without per-sample Python objects"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self.file.close()
+            raise SampleFormatError(f"{path}: empty sample file") from e
+
+        if len(self.map) < HEADER.size:
+            self.close()
+            raise SampleFormatError(f"{path}: truncated header")
+        (magic, version, dtype_code, self.codec, self.count,
+         self.block_samples, n_blocks, index_offset) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SampleFormatError(f"{path}: not a sample file")
+        if version > FORMAT_VERSION or dtype_code not in DTYPES:
+            self.close()
+            raise SampleFormatError(f"{path}: unsupported format version {version} or dtype {dtype_code}")
+
+        self.dtype = np.dtype(DTYPES[dtype_code]).newbyteorder('<')
+        self.shuffle = bool(self.codec & SHUFFLE_FLAG)
+        self.codec &= ~SHUFFLE_FLAG
+        offset = HEADER.size
+        strings = []
+        for _ in range(2):
+            (length,) = STRING_LEN.unpack_from(self.map, offset)
+            offset += STRING_LEN.size
+            strings.append(self.map[offset:offset + length].decode('utf-8'))
+            offset += length
+        self.name, self.unit = strings
+
+        self.index = [INDEX_ENTRY.unpack_from(self.map, index_offset + i * INDEX_ENTRY.size)
+                      for i in range(n_blocks)]
+        self.decompress = _decompressor(self.codec)
+
+    def iter_blocks(self):
+        """Yield each block as a NumPy array"""
+        view = memoryview(self.map)
+        for offset, length, count in self.index:
+            raw = self.decompress(view[offset:offset + length])
+            if self.shuffle:
+                yield unshuffle_bytes(raw, self.dtype, count)
+            else:
+                yield np.frombuffer(raw, dtype=self.dtype, count=count)
+
+    def array(self):
+        """Return all samples; uncompressed files are returned as a read-only memmap"""
+        if self.count == 0:
+            return np.empty(0, dtype=self.dtype)
+        if self.codec == CODEC_NONE:
+            return np.memmap(self.path, dtype=self.dtype, mode='r', offset=self.index[0][0], shape=(self.count,))
+        return np.concatenate(list(self.iter_blocks()))
+
+    def aggregate(self):
+        """Compute count/sum/min/max/mean/stddev in one streaming pass over the blocks"""
+        count = 0
+        total = 0.0
+        total_sq = 0.0
+        low = np.inf
+        high = -np.inf
+        for block in self.iter_blocks():
+            if not block.size:
+                continue
+            values = block.astype(np.float64, copy=False)
+            count += values.size
+            total += float(values.sum())
+            total_sq += float(np.dot(values, values))
+            low = min(low, float(values.min()))
+            high = max(high, float(values.max()))
+
+        if count == 0:
+            return {'count': 0, 'sum': 0.0, 'min': 0.0, 'max': 0.0, 'mean': 0.0, 'stddev': 0.0}
+        mean = total / count
+        variance = max(total_sq / count - mean * mean, 0.0)
+        return {'count': count, 'sum': total, 'min': low, 'max': high,
+                'mean': mean, 'stddev': variance ** 0.5}
+
+    def percentiles(self, quantiles=(50, 90, 99)):
+        """Return the requested percentiles of all samples"""
+        values = self.array()
+        if values.size == 0:
+            return {q: 0.0 for q in quantiles}
+        result = np.percentile(values, quantiles)
+        return {q: float(v) for q, v in zip(quantiles, result)}
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if getattr(self, 'map', None) is not None and not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_samples(path, values, name, unit='', dtype='f8', codec=None, shuffle=False):
+    """Write a complete array of samples to a sample file"""
+    with SampleWriter(path, name, unit, dtype, codec, shuffle=shuffle) as writer:
+        writer.append(values)
+    return path
+
+
+def read_samples(path):
+    """Read all samples from a sample file into a NumPy array"""
+    with SampleReader(path) as reader:
+        return np.array(reader.array())
+
+
+def extract_ping_rtts(text):
+    """Extract per-packet RTTs (ms) from raw ping output"""
+    return np.array(re.findall(r'time[=<]([\d.]+)\s*ms', text), dtype=np.float64)
+
+
+def extract_iperf_intervals(data):
+    """Extract per-interval throughput (Mbps) from iperf3 -J output"""
+    values = [interval.get('sum', {}).get('bits_per_second', 0) for interval in data.get('intervals', [])]
+    return np.array(values, dtype=np.float64) / 1e6
+
+
+def extract_dns_latencies(data):
+    """Extract per-domain average latencies (ms) from dig-based DNS JSON"""
+    return np.array([query.get('avg_ms', 0) for query in data.get('queries', [])], dtype=np.float64)
+
+
+def sample_path(results_dir, source, metric):
+    """Return the sample file path for a metric extracted from a result file"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(results_dir, SAMPLES_DIR, f'{stem}.{metric}{SAMPLE_EXT}')
+
+
+def extract_entry_series(results_dir, entry):
+    """Extract the raw sample series behind one manifest entry as (metric, unit, array) tuples"""
+    path = os.path.join(results_dir, entry['file'])
+    series = []
+
+    if entry['type'] == 'ping':
+        with open(path, 'r') as f:
+            data = json.load(f)
+        raw_output = data.get('output_file') or os.path.splitext(path)[0] + '.txt'
+        if not os.path.exists(raw_output):
+            raw_output = os.path.join(results_dir, os.path.basename(raw_output))
+        if os.path.exists(raw_output):
+            with open(raw_output, 'r') as f:
+                series.append(('rtt_ms', 'ms', extract_ping_rtts(f.read())))
+    elif entry['type'] in ('iperf_tcp', 'iperf_udp'):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        # Client-side UDP output only reports jitter in end.sum (see the jitter_ms metric)
+        series.append(('interval_mbps', 'Mbps', extract_iperf_intervals(data)))
+    elif entry['type'] == 'dns_dig':
+        with open(path, 'r') as f:
+            data = json.load(f)
+        series.append(('domain_avg_ms', 'ms', extract_dns_latencies(data)))
+
+    return [(metric, unit, values) for metric, unit, values in series if values.size]
+
+
+def load_entry_series(results_dir, entry, metrics):
+    """Return {metric: array} for an entry, preferring existing sample files over re-extraction"""
+    found = {}
+    missing = []
+    for metric in metrics:
+        path = sample_path(results_dir, entry['file'], metric)
+        if os.path.exists(path):
+            found[metric] = read_samples(path)
+        else:
+            missing.append(metric)
+    if missing:
+        for name, _, values in extract_entry_series(results_dir, entry):
+            if name in missing:
+                found[name] = values
+    return found
+
+
+def convert_entry(results_dir, entry, codec=None, shuffle=False):
+    """Convert the raw samples behind one manifest entry, returning written paths"""
+    written = []
+    for metric, unit, values in extract_entry_series(results_dir, entry):
+        out = sample_path(results_dir, entry['file'], metric)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        written.append(write_samples(out, values, metric, unit, codec=codec, shuffle=shuffle))
+    return written
+
+
+def convert_results(results_dir, codec=None, shuffle=False):
+    """Convert raw samples for every artifact in a run directory"""
+    written = []
+    for entry in load_entries(results_dir):
+        try:
+            written.extend(convert_entry(results_dir, entry, codec, shuffle))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not convert {entry['file']}: {e}", file=sys.stderr)
+    return written
+
+
+def run_benchmark(n_samples, output_dir=None):
+    """Compare size and load+aggregate time of JSON against each sample codec"""
+    rng = np.random.default_rng(42)
+    # RTT-like distribution: a log-normal body rounded to microseconds
+    values = np.round(rng.lognormal(mean=3.0, sigma=0.3, size=n_samples), 3)
+
+    if output_dir is None:
+        # Benchmark files are only kept when an output directory is given
+        context = tempfile.TemporaryDirectory(prefix='ybs_bench_')
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+        context = nullcontext(output_dir)
+
+    with context as workdir:
+        results = []
+
+        json_path = os.path.join(workdir, 'samples.json')
+        with open(json_path, 'w') as f:
+            json.dump({'rtt_ms': values.tolist()}, f)
+        start = time.perf_counter()
+        with open(json_path, 'r') as f:
+            loaded = json.load(f)['rtt_ms']
+        mean = sum(loaded) / len(loaded)
+        results.append(('json', os.path.getsize(json_path), time.perf_counter() - start, mean))
+
+        variants = [('none', False), ('zlib', False), ('zlib', True)]
+        if zstandard is not None:
+            variants += [('zstd', False), ('zstd', True)]
+        for codec, shuffle in variants:
+            label = f'{codec}+shuf' if shuffle else codec
+            path = os.path.join(workdir, f'samples_{label}{SAMPLE_EXT}')
+            write_samples(path, values, 'rtt_ms', 'ms', codec=codec, shuffle=shuffle)
+            start = time.perf_counter()
+            with SampleReader(path) as reader:
+                mean = reader.aggregate()['mean']
+            results.append((label, os.path.getsize(path), time.perf_counter() - start, mean))
+
+    return results
+
+
+def main():
+    trace_startup('sample_store')
+    parser = argparse.ArgumentParser(description='Convert, inspect and benchmark compact sample files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert = subparsers.add_parser('convert', help='Extract raw samples from a results directory')
+    convert.add_argument('results_dir', help='Directory containing test results')
+    convert.add_argument('-c', '--codec', choices=sorted(CODECS), help=f'Block codec (default: {default_codec()})')
+    convert.add_argument('-s', '--shuffle', action='store_true', help='Byte-shuffle blocks before compression')
+
+    stats = subparsers.add_parser('stats', help='Print statistics for sample files')
+    stats.add_argument('files', nargs='+', help='Sample files to summarize')
+
+    bench = subparsers.add_parser('bench', help='Compare sample file size and load time against JSON')
+    bench.add_argument('-n', '--samples', type=int, default=1000000, help='Number of samples (default: 1000000)')
+    bench.add_argument('-o', '--output', help='Directory for benchmark files (default: temp dir)')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        if not os.path.exists(args.results_dir):
+            print(f"Error: Results directory not found: {args.results_dir}")
+            sys.exit(1)
+        with span('sample_store.convert', 'parse'):
+            written = convert_results(args.results_dir, args.codec, args.shuffle)
+        for path in written:
+            print(f"Wrote: {path}")
+
+    elif args.command == 'stats':
+        for path in args.files:
+            try:
+                with SampleReader(path) as reader:
+                    agg = reader.aggregate()
+                    pct = reader.percentiles()
+                    print(f"{os.path.basename(path)}: {reader.name} ({reader.unit}) n={agg['count']} "
+                          f"mean={agg['mean']:.3f} min={agg['min']:.3f} max={agg['max']:.3f} "
+                          f"p50={pct[50]:.3f} p90={pct[90]:.3f} p99={pct[99]:.3f}")
+            except SampleFormatError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+
+    elif args.command == 'bench':
+        results = run_benchmark(args.samples, args.output)
+        json_size, json_time = results[0][1], results[0][2]
+        print(f"{'Format':<10} {'Size (bytes)':>14} {'Ratio':>8} {'Load (s)':>10} {'Speedup':>8}")
+        for name, size, elapsed, _ in results:
+            print(f"{name:<10} {size:>14} {json_size / size:>7.1f}x {elapsed:>10.4f} {json_time / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+"""
+Span tracing for the performance test suite
+Appends Chrome trace-event spans (start, duration, CPU, RSS, bytes read) to
+$YABS_TRACE_FILE and summarizes where the wall-clock time of a run went
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import contextmanager
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; spans still record time and CPU
+    resource = None
+
+TRACE_ENV = 'YABS_TRACE_FILE'
+
+
+def trace_file():
+    """Return the active trace file, or None when tracing is disabled"""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def _read_io():
+    """Return (rchar, read_bytes) for this process, or zeros without /proc"""
+    counters = {'rchar': 0, 'read_bytes': 0}
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in counters:
+                    counters[key] = int(value)
+    except OSError:
+        pass
+    return counters['rchar'], counters['read_bytes']
+
+
+def max_rss_kb():
+    """Return the peak RSS of this process in KiB"""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _write_event(path, event):
+    """Append one event to the trace file, creating it when needed"""
+    # Single short appends keep concurrent writers from interleaving
+    line = json.dumps(event) + ',\n'
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        line = '[\n' + line
+    with open(path, 'a') as f:
+        f.write(line)
+
+
+@contextmanager
+def span(name, category='python', **args):
+    """Record the enclosed block as a complete ('X') trace event"""
+    path = trace_file()
+    if path is None:
+        yield
+        return
+
+    start_wall = time.time()
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    start_rchar, start_read = _read_io()
+    try:
+        yield
+    finally:
+        rchar, read_bytes = _read_io()
+        args.update(
+            cpu_ms=round((time.process_time() - start_cpu) * 1000),
+            rchar=rchar - start_rchar,
+            read_bytes=read_bytes - start_read,
+            rss_kb=max_rss_kb(),
+        )
+        _write_event(path, {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': int(start_wall * 1e6),
+            'dur': int((time.perf_counter() - start) * 1e6),
+            'pid': os.getpid(),
+            'tid': os.getpid(),
+            'args': args,
+        })
+
+
+def _process_start_time():
+    """Return this process's start time (epoch seconds) from /proc, or None"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    # Process age from clock ticks since boot; /proc/stat btime only has 1s resolution
+    age = uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    return time.time() - max(0.0, age)
+
+
+def trace_startup(tool):
+    """Record interpreter start-up and import time up to this call"""
+    path = trace_file()
+    started = _process_start_time() if path else None
+    if started is None:
+        return
+    now = time.time()
+    rchar, read_bytes = _read_io()
+    _write_event(path, {
+        'name': f'{tool}.startup',
+        'cat': 'startup',
+        'ph': 'X',
+        'ts': int(started * 1e6),
+        'dur': max(0, int((now - started) * 1e6)),
+        'pid': os.getpid(),
+        'tid': os.getpid(),
+        'args': {'cpu_ms': round(time.process_time() * 1000), 'rchar': rchar,
+                 'read_bytes': read_bytes, 'rss_kb': max_rss_kb()},
+    })
+
+
+def load_trace(path):
+    """Load trace events, tolerating the optional closing bracket"""
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    if not content:
+        return []
+    if not content.endswith(']'):
+        content = content.rstrip(',') + ']'
+    return [e for e in json.loads(content) if e.get('ph') == 'X']
+
+
+def summarize(events):
+    """Aggregate spans by name and category using exclusive (self) time"""
+    # Nest spans by time containment so that work done by child scripts is
+    # not counted twice; overlapping parallel spans become siblings
+    ordered = sorted(events, key=lambda e: (e['ts'], -e['dur']))
+    self_time = [e['dur'] for e in ordered]
+    stack = []
+    for i, event in enumerate(ordered):
+        end = event['ts'] + event['dur']
+        while stack and ordered[stack[-1]]['ts'] + ordered[stack[-1]]['dur'] < end:
+            stack.pop()
+        if stack:
+            self_time[stack[-1]] -= event['dur']
+        stack.append(i)
+
+    by_name = defaultdict(lambda: {'count': 0, 'total_us': 0, 'self_us': 0, 'cpu_ms': 0,
+                                   'read_bytes': 0, 'rchar': 0, 'max_rss_kb': 0})
+    by_category = defaultdict(int)
+    for event, exclusive in zip(ordered, self_time):
+        exclusive = max(0, exclusive)
+        args = event.get('args', {})
+        stats = by_name[(event['name'], event.get('cat', ''))]
+        stats['count'] += 1
+        stats['total_us'] += event['dur']
+        stats['self_us'] += exclusive
+        stats['cpu_ms'] += args.get('cpu_ms', 0)
+        stats['read_bytes'] += args.get('read_bytes', 0)
+        stats['rchar'] += args.get('rchar', 0)
+        stats['max_rss_kb'] = max(stats['max_rss_kb'], args.get('rss_kb', 0))
+        by_category[event.get('cat', '')] += exclusive
+
+    wall_us = 0
+    if ordered:
+        wall_us = max(e['ts'] + e['dur'] for e in ordered) - ordered[0]['ts']
+    spans = [dict(name=name, category=cat, **stats) for (name, cat), stats in by_name.items()]
+    spans.sort(key=lambda s: -s['self_us'])
+    return {'wall_us': wall_us, 'categories': dict(by_category), 'spans': spans}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a Chrome trace-event file from a test run')
+    parser.add_argument('command', choices=['summary'], help='Action to perform')
+    parser.add_argument('trace_file', help='Trace file (trace.json in the results directory)')
+    parser.add_argument('-n', '--top', type=int, default=20, help='Number of spans to show (default: 20)')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.trace_file):
+        print(f"Error: Trace file not found: {args.trace_file}")
+        sys.exit(1)
+
+    try:
+        summary = summarize(load_trace(args.trace_file))
+    except (ValueError, KeyError) as e:
+        print(f"Error: Could not parse trace file: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    wall = summary['wall_us'] or 1
+    print(f"Wall-clock time: {summary['wall_us'] / 1e6:.2f}s\n")
+    print("Time by category (exclusive):")
+    for category, us in sorted(summary['categories'].items(), key=lambda c: -c[1]):
+        print(f"  {category or '-':<12} {us / 1e6:>9.2f}s {100 * us / wall:>6.1f}%")
+
+    print(f"\n  {'Span':<36} {'Count':>5} {'Self (s)':>9} {'Total (s)':>9} {'%':>6} "
+          f"{'CPU (s)':>8} {'Read MB':>8} {'RSS MB':>7}")
+    for s in summary['spans'][:args.top]:
+        print(f"  {s['name'][:36]:<36} {s['count']:>5} {s['self_us'] / 1e6:>9.2f} {s['total_us'] / 1e6:>9.2f} "
+              f"{100 * s['self_us'] / wall:>6.1f} {s['cpu_ms'] / 1000:>8.2f} "
+              f"{s['rchar'] / 1e6:>8.1f} {s['max_rss_kb'] / 1024:>7.1f}")
+
+if __name__ == "__main__":
+    main()
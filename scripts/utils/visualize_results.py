@@ -16,6 +16,8 @@ import numpy as np
 from datetime import datetime
 from collections import defaultdict
 
+from tracing import span, trace_startup
+
 # Set default style
 plt.style.use('seaborn-v0_8-darkgrid')
 
@@ -510,6 +512,7 @@ class TestResultsVisualizer:
         plt.show()
 
 def main():
+    trace_startup('visualize_results')
     parser = argparse.ArgumentParser(description='Visualize performance test results')
     parser.add_argument('results_dir', help='Directory containing test results')
     parser.add_argument('-o', '--output', help='Output directory for visualizations')
@@ -522,16 +525,19 @@ def main():
         sys.exit(1)
         
     visualizer = TestResultsVisualizer(args.results_dir)
-    visualizer.load_json_results()
+    with span('visualize_results.load', 'parse'):
+        visualizer.load_json_results()
     
     # Create all visualizations
-    visualizer.create_ping_comparison()
-    visualizer.create_throughput_comparison()
-    visualizer.create_dns_performance_chart()
-    visualizer.create_summary_dashboard()
+    with span('visualize_results.render', 'analysis'):
+        visualizer.create_ping_comparison()
+        visualizer.create_throughput_comparison()
+        visualizer.create_dns_performance_chart()
+        visualizer.create_summary_dashboard()
     
     # Save figures
-    visualizer.save_all_figures(args.output)
+    with span('visualize_results.save', 'analysis'):
+        visualizer.save_all_figures(args.output)
     
     # Show figures if requested
     if args.show:
@@ -30,6 +30,7 @@ QUICK COMMANDS:
   $0 network                   Network tests only
   $0 dns                       DNS tests only
   $0 compare                   Compare pre/post results
+  $0 unit                      Run the unit tests of the Python tools
 
 COMMON OPTIONS:
   $0 --server <IP>             Run tests with specific iPerf server
@@ -98,6 +99,11 @@ case "$COMMAND" in
         "$PERFORMANCE_SUITE" --compare
         ;;
     
+    unit)
+        echo -e "${GREEN}Running unit tests...${NC}"
+        python3 -m unittest discover -s "$SCRIPT_DIR/tests" "$@"
+        ;;
+    
     create-config)
         echo -e "${GREEN}Creating configuration template...${NC}"
         "$PERFORMANCE_SUITE" --create-config
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the anomaly detector: the EWMA update, watched metrics, scoring of
+single points and ingesting scheduled yabs runs
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from anomaly_detector import AnomalyDetector, AlertSink, ewma_update, watch_direction, DROP, SPIKE, ALL_HOURS
+from result_schema import MANIFEST_NAME, SCHEMA_VERSION
+
+KEY = ('web-01', 'iperf_tcp', '192.168.1.100', 'throughput_mbps')
+LONDON_SEND = 'iperf_ipv4_clouvider_london_uk_send_mbps'
+
+
+class EwmaTest(unittest.TestCase):
+
+    def test_warm_up_is_plain_mean(self):
+        values = [940.0, 931.5, 952.25, 938.0, 944.75]
+        count, mean, var = 0, 0.0, 0.0
+        for value in values:
+            count, mean, var = ewma_update(count, mean, var, value, 0.1)
+        self.assertEqual(count, 5)
+        self.assertAlmostEqual(mean, np.mean(values))
+        self.assertAlmostEqual(var, np.var(values))
+
+    def test_weight_after_warm_up(self):
+        count, mean, var = ewma_update(20, 100.0, 4.0, 110.0, 0.1)
+        self.assertEqual(count, 21)
+        self.assertAlmostEqual(mean, 101.0)
+        self.assertAlmostEqual(var, 0.9 * (4.0 + 10.0 * 1.0))
+
+
+class WatchDirectionTest(unittest.TestCase):
+
+    def test_watched(self):
+        self.assertEqual(watch_direction('yabs', 'disk_4k_iops'), DROP)
+        self.assertEqual(watch_direction('yabs', LONDON_SEND), DROP)
+        self.assertEqual(watch_direction('yabs', 'iperf_ipv6_online_paris_fr_recv_mbps'), DROP)
+        self.assertEqual(watch_direction('iperf_udp', 'throughput_mbps'), DROP)
+        self.assertEqual(watch_direction('dns_dig', 'avg_response_time_ms'), SPIKE)
+        self.assertEqual(watch_direction('dnsperf', 'avg_response_time_ms'), SPIKE)
+
+    def test_not_watched(self):
+        for test, metric in [('yabs', 'disk_4k_mbps'), ('yabs', 'geekbench_single'), ('iperf_udp', 'jitter_ms'),
+                             ('ping', 'rtt_avg_ms'), ('iperf_tcp', LONDON_SEND), ('yabs', 'iperf_ipv4_x_mbps')]:
+            self.assertIsNone(watch_direction(test, metric), f'{test} {metric}')
+
+
+class DetectorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_anomaly_test_')
+        self.detector = AnomalyDetector(os.path.join(self.workdir, 'state.db'))
+
+    def tearDown(self):
+        self.detector.close()
+        shutil.rmtree(self.workdir)
+
+
+class AddPointTest(DetectorTestCase):
+
+    def add_history(self, values, hour=5):
+        for day, value in enumerate(values, 1):
+            self.assertIsNone(self.detector.add_point(KEY, f'2026-10-{day:02d}T{hour:02d}:00:00Z', value, DROP))
+
+    def test_min_samples(self):
+        # Seven points are too little history to score against, even for a large drop
+        self.add_history([940, 935, 945, 938, 942, 939, 941, 300])
+
+    def test_drop_alerts(self):
+        self.add_history([940, 935, 945, 938, 942, 939, 941, 944, 937, 940])
+        alert = self.detector.add_point(KEY, '2026-10-11T05:00:00Z', 600.0, DROP)
+        self.assertEqual((alert['direction'], alert['unit'], alert['hour']), (DROP, 'Mbps', 5))
+        self.assertLess(alert['z_score'], -4)
+        self.assertLess(alert['change_percent'], -20)
+
+    def test_rise_and_small_changes_are_not_alerts(self):
+        self.add_history([940, 935, 945, 938, 942, 939, 941, 944, 937, 940])
+        self.assertIsNone(self.detector.add_point(KEY, '2026-10-11T05:00:00Z', 2000.0, DROP))
+        # Far beyond the z threshold but within the minimum relative change
+        self.assertIsNone(self.detector.add_point(KEY, '2026-10-12T05:00:00Z', 870.0, DROP))
+
+    def test_stale_points(self):
+        self.add_history([940, 935])
+        self.assertIs(self.detector.add_point(KEY, '2026-10-02T05:00:00Z', 100.0, DROP), False)
+        self.assertIs(self.detector.add_point(KEY, '2026-10-01T09:00:00Z', 100.0, DROP), False)
+
+    def test_outlier_barely_moves_baseline(self):
+        self.add_history([1000, 1002, 998, 1001, 999, 1000, 1003, 997, 1000, 1000])
+        self.detector.add_point(KEY, '2026-10-11T05:00:00Z', 10.0, DROP)
+        baseline = next(b for b in self.detector.baselines() if b['hour'] == ALL_HOURS)
+        self.assertGreater(baseline['mean'], 990)
+
+    def test_hour_buckets(self):
+        self.add_history([940] * 10, hour=5)
+        buckets = {b['hour']: b['count'] for b in self.detector.baselines(host='web-01')}
+        self.assertEqual(buckets, {5: 10, ALL_HOURS: 10})
+        # The 14:00 bucket is still cold, so the point is scored against all hours
+        alert = self.detector.add_point(KEY, '2026-10-11T14:00:00Z', 400.0, DROP)
+        self.assertEqual(alert['hour'], 14)
+
+
+class IngestTest(DetectorTestCase):
+
+    def write_run(self, day, replace=None):
+        with open(os.path.join(FIXTURES, 'yabs_output.txt'), 'r') as f:
+            content = f.read()
+        if replace:
+            content = content.replace(*replace)
+        run_dir = os.path.join(self.workdir, 'results', f'scheduled_Oct-{day:02d}-2026_05-00-00')
+        os.makedirs(run_dir)
+        with open(os.path.join(run_dir, 'yabs_scheduled_results.txt'), 'w') as f:
+            f.write(content)
+        with open(os.path.join(run_dir, MANIFEST_NAME), 'w') as f:
+            f.write(json.dumps({'schema_version': SCHEMA_VERSION, 'type': 'yabs', 'file': 'yabs_scheduled_results.txt',
+                                'host': 'web-01', 'phase': 'scheduled', 'target': '',
+                                'timestamp': f'2026-10-{day:02d}T05:00:00Z'}) + '\n')
+        return run_dir
+
+    def test_iperf_drop(self):
+        run_dirs = [self.write_run(day) for day in range(1, 10)]
+        run_dirs.append(self.write_run(10, ('| 1.61 Gbits/sec  |', '| 412 Mbits/sec   |')))
+        alerts_path = os.path.join(self.workdir, 'alerts.jsonl')
+
+        runs, points, alerts = self.detector.ingest(run_dirs, AlertSink(alerts_path))
+        self.assertEqual(runs, 10)
+        self.assertEqual(points % 10, 0)
+        self.assertEqual([(a['test'], a['metric'], a['value']) for a in alerts], [('yabs', LONDON_SEND, 412.0)])
+        with open(alerts_path, 'r') as f:
+            self.assertEqual(json.loads(f.readline())['metric'], LONDON_SEND)
+        self.assertEqual(self.detector.recent_alerts()[0]['source'],
+                         os.path.join(run_dirs[-1], 'yabs_scheduled_results.txt'))
+
+        # Runs are only ingested once
+        self.assertEqual(self.detector.ingest(run_dirs, AlertSink(alerts_path))[:2], (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
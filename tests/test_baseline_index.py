@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the cross-host baseline index: hardware fingerprints, incremental
+Welford aggregates when hosts are added and replaced, and peer comparisons
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from baseline_index import BaselineIndex, hardware_fingerprint
+
+
+def yabs_record(host, timestamp, iops, ram_kib=8147968, cpu_model='AMD EPYC 7543P 32-Core Processor'):
+    """Return a normalized yabs record for one host"""
+    return {
+        'schema_version': 1, 'type': 'yabs', 'test': 'yabs', 'host': host, 'phase': '', 'target': '',
+        'timestamp': timestamp, 'source': 'yabs_output.txt',
+        'metrics': {'cpu_cores': 4, 'ram_kib': ram_kib, 'disk_kb': 164943012, 'disk_4k_iops': iops},
+        'attributes': {'cpu_model': cpu_model, 'kernel': '5.15.0-105-generic', 'virt_type': 'KVM'},
+    }
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_same_hardware(self):
+        # Reported RAM differs a little between identical hosts and kernel patch levels are ignored
+        a = yabs_record('a', '2026-10-19T05:00:00Z', 1, ram_kib=8147968)
+        b = yabs_record('b', '2026-10-19T05:00:00Z', 2, ram_kib=8010000)
+        b['attributes']['kernel'] = '5.15.0-113-generic'
+        self.assertEqual(hardware_fingerprint(a)[0], hardware_fingerprint(b)[0])
+        self.assertEqual(hardware_fingerprint(a)[1]['ram_gib'], 8)
+
+    def test_different_hardware(self):
+        a = yabs_record('a', '2026-10-19T05:00:00Z', 1)
+        b = yabs_record('b', '2026-10-19T05:00:00Z', 1, ram_kib=16 * 1024 ** 2)
+        self.assertNotEqual(hardware_fingerprint(a)[0], hardware_fingerprint(b)[0])
+
+
+class BaselineIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_baseline_test_')
+        self.index = BaselineIndex(os.path.join(self.workdir, 'index.db'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.workdir)
+
+    def stats(self, metric='disk_4k_iops'):
+        return self.index.db.execute('SELECT count, mean, m2 FROM group_stats WHERE metric = ?', (metric,)).fetchone()
+
+    def assert_stats(self, values):
+        count, mean, m2 = self.stats()
+        self.assertEqual(count, len(values))
+        self.assertAlmostEqual(mean, float(np.mean(values)), places=6)
+        self.assertAlmostEqual(m2, float(np.sum((np.array(values) - np.mean(values)) ** 2)), places=3)
+
+    def test_welford_add(self):
+        values = [42300, 41800, 43100, 40950, 42700, 41200]
+        for i, value in enumerate(values):
+            self.assertTrue(self.index.add_record(yabs_record(f'host-{i}', '2026-10-19T05:00:00Z', value)))
+        self.assert_stats(values)
+        self.assertIsNone(self.stats('ram_kib'))
+
+    def test_welford_replace(self):
+        values = [42300, 41800, 43100, 40950]
+        for i, value in enumerate(values):
+            self.index.add_record(yabs_record(f'host-{i}', '2026-10-19T05:00:00Z', value))
+        # A newer result replaces the host's old value (reverse Welford, then add)
+        self.assertTrue(self.index.add_record(yabs_record('host-1', '2026-10-19T11:00:00Z', 30000)))
+        self.assert_stats([42300, 30000, 43100, 40950])
+        # Older or equal results are ignored
+        self.assertFalse(self.index.add_record(yabs_record('host-1', '2026-10-19T11:00:00Z', 1)))
+        self.assert_stats([42300, 30000, 43100, 40950])
+
+        before = self.stats()
+        self.index.rebuild()
+        for got, expected in zip(self.stats(), before):
+            self.assertAlmostEqual(got, expected, places=3)
+
+    def test_welford_remove_to_one(self):
+        self.index.add_record(yabs_record('host-0', '2026-10-19T05:00:00Z', 100))
+        self.index.add_record(yabs_record('host-0', '2026-10-19T06:00:00Z', 200, ram_kib=16 * 1024 ** 2))
+        # The host moved to another group; its old group is emptied
+        self.assertEqual(self.index.db.execute('SELECT COUNT(*) FROM group_stats').fetchone()[0], 1)
+        self.assert_stats([200])
+
+    def test_compare_excludes_host(self):
+        values = [100, 110, 90, 105, 95]
+        for i, value in enumerate(values):
+            self.index.add_record(yabs_record(f'host-{i}', '2026-10-19T05:00:00Z', value))
+        _, comparison = self.index.compare('host-0')
+        iops = next(c for c in comparison if c['metric'] == 'disk_4k_iops')
+        peers = values[1:]
+        self.assertEqual(iops['peers'], 4)
+        self.assertAlmostEqual(iops['peer_mean'], np.mean(peers))
+        self.assertAlmostEqual(iops['peer_stddev'], np.std(peers, ddof=1))
+        self.assertEqual(iops['percentile'], 50.0)
+        with self.assertRaises(KeyError):
+            self.index.compare('unknown')
+
+    def test_outliers(self):
+        values = [42300, 41800, 43100, 40950, 42700, 41200, 12000]
+        for i, value in enumerate(values):
+            self.index.add_record(yabs_record(f'host-{i}', '2026-10-19T05:00:00Z', value))
+        outliers = self.index.outliers(z_threshold=3.0)
+        self.assertEqual([(o['host'], o['metric']) for o in outliers], [('host-6', 'disk_4k_iops')])
+        self.assertAlmostEqual(outliers[0]['peer_mean'], np.mean(values[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
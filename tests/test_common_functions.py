@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the shell helpers in lib/common_functions.sh: JSON escaping, run
+manifest entries and pruning, the run journal, the download cache checksums and
+trace spans
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_FUNCTIONS = os.path.join(TESTS_DIR, '..', 'lib', 'common_functions.sh')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from result_schema import read_manifest, validate_manifest_entry, MANIFEST_NAME
+from tracing import load_trace
+
+
+class ShellTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_common_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def bash(self, script, *args, env=None, check=True):
+        """Run a script with the library sourced; positional arguments are $1, $2, ..."""
+        full_env = {k: v for k, v in os.environ.items() if k != 'SUITE_STEP'}
+        full_env.update(env or {})
+        proc = subprocess.run(['bash', '-c', f'source "{COMMON_FUNCTIONS}"; {script}', 'bash', *args],
+                              env=full_env, capture_output=True, text=True)
+        if check:
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc
+
+    def manifest(self):
+        with open(os.path.join(self.workdir, MANIFEST_NAME), 'r') as f:
+            return [json.loads(line) for line in f]
+
+
+class JsonEscapeTest(ShellTestCase):
+
+    def test_round_trip(self):
+        for value in ['plain', 'say "hi"', 'C:\\temp\\new', 'tab\there', 'two\nlines\r', '\\"', '']:
+            escaped = self.bash('json_escape "$1"', value).stdout
+            self.assertEqual(json.loads(f'"{escaped}"'), value, repr(value))
+
+    def test_to_variable(self):
+        out = self.bash('json_escape "$1" escaped; printf "%s|" "$escaped"', 'say "hi"').stdout
+        self.assertEqual(out, 'say \\"hi\\"|')
+
+
+class ManifestTest(ShellTestCase):
+
+    def add(self, step, artifact_type, filename, target=''):
+        env = {'SUITE_STEP': step} if step else None
+        self.bash('manifest_add "$1" "$2" pre "$3" "$4"', self.workdir, artifact_type, filename, target, env=env)
+
+    def test_add_escapes_fields(self):
+        self.add('network.ping', 'ping', '/tmp/results/pre_ping_8.8.8.8.json', 'dns "primary" \\ 8.8.8.8')
+        self.add('', 'yabs', 'yabs_pre_results.txt')
+        entries = self.manifest()
+        self.assertEqual(entries[0]['file'], 'pre_ping_8.8.8.8.json')
+        self.assertEqual(entries[0]['target'], 'dns "primary" \\ 8.8.8.8')
+        self.assertEqual(entries[0]['step'], 'network.ping')
+        self.assertNotIn('step', entries[1])
+        for entry in read_manifest(self.workdir):
+            self.assertEqual(validate_manifest_entry(entry), [])
+
+    def test_prune_exact_step(self):
+        self.add('net', 'ping', 'a.json')
+        self.add('network', 'ping', 'b.json')
+        self.add('net\\1', 'ping', 'c.json')
+        self.add('', 'ping', 'net.json', 'net')
+        self.add('net', 'dns_dig', 'd.json')
+        self.bash('manifest_prune "$1" net', self.workdir)
+        self.assertEqual([e['file'] for e in self.manifest()], ['b.json', 'c.json', 'net.json'])
+        self.bash('manifest_prune "$1" "$2"', self.workdir, 'net\\1')
+        self.assertEqual([e['file'] for e in self.manifest()], ['b.json', 'net.json'])
+
+    def test_prune_without_manifest(self):
+        self.bash('manifest_prune "$1" net', self.workdir)
+        self.assertFalse(os.path.exists(os.path.join(self.workdir, MANIFEST_NAME)))
+
+
+class JournalTest(ShellTestCase):
+
+    def is_done(self, step, inputs):
+        return self.bash('journal_is_done "$1" "$2" "$3"', self.workdir, step, inputs, check=False).returncode == 0
+
+    def test_record_and_lookup(self):
+        self.assertFalse(self.is_done('yabs', 'abc'))
+        self.bash('journal_record "$1" yabs abc', self.workdir)
+        self.assertTrue(self.is_done('yabs', 'abc'))
+        # Changed inputs or another step rerun
+        self.assertFalse(self.is_done('yabs', 'abd'))
+        self.assertFalse(self.is_done('ya', 'abc'))
+
+    def test_torn_line_is_not_done(self):
+        with open(os.path.join(self.workdir, 'run_journal.jsonl'), 'w') as f:
+            f.write('{"step": "dns", "inputs": "abc", "status": "done", "timest')
+        self.assertFalse(self.is_done('dns', 'abc'))
+
+    def test_inputs_hash(self):
+        script = os.path.join(self.workdir, 'step.sh')
+        with open(script, 'w') as f:
+            f.write('echo one\n')
+        first = self.bash('inputs_hash "ping -c 10" "$1"', script).stdout
+        self.assertEqual(len(first.strip()), 64)
+        self.assertNotEqual(self.bash('inputs_hash "ping -c 20" "$1"', script).stdout, first)
+        with open(script, 'a') as f:
+            f.write('echo two\n')
+        self.assertNotEqual(self.bash('inputs_hash "ping -c 10" "$1"', script).stdout, first)
+
+
+class CacheTest(ShellTestCase):
+
+    def is_valid(self, path):
+        return self.bash('cache_is_valid "$1"', path, check=False).returncode == 0
+
+    def test_commit_and_validate(self):
+        path = os.path.join(self.workdir, 'fio_x64')
+        with open(path, 'wb') as f:
+            f.write(b'\x7fELF binary')
+        self.assertFalse(self.is_valid(path))
+        self.bash('cache_commit "$1"', path)
+        self.assertTrue(self.is_valid(path))
+        self.assertFalse(os.path.exists(path + '.sha256.tmp'))
+
+        # A corrupted or truncated download is fetched again
+        with open(path, 'wb') as f:
+            f.write(b'\x7fELF')
+        self.assertFalse(self.is_valid(path))
+        os.unlink(path)
+        self.assertFalse(self.is_valid(path))
+
+
+class TraceTest(ShellTestCase):
+
+    def test_span_names_are_escaped(self):
+        path = os.path.join(self.workdir, 'trace.json')
+        self.bash('trace_init "$1"; trace_begin "$2" "$3"; trace_begin inner; trace_end; trace_end',
+                  path, 'dns "8.8.8.8" C:\\temp', 'io\tcat')
+        events = load_trace(path)
+        self.assertEqual([(e['name'], e['cat']) for e in events],
+                         [('inner', 'suite'), ('dns "8.8.8.8" C:\\temp', 'io\tcat')])
+
+
+if __name__ == '__main__':
+    unittest.main()
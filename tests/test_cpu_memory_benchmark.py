@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the offline CPU and memory benchmark: the pointer-chase chain,
+raw per-load latency and the thread limits left to the caller
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+from unittest import mock
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+UTILS_DIR = os.path.join(TESTS_DIR, '..', 'scripts', 'utils')
+sys.path.insert(0, UTILS_DIR)
+
+import cpu_memory_benchmark
+from cpu_memory_benchmark import _chain, measure_latency
+
+
+class LatencyTest(unittest.TestCase):
+
+    def test_chain_is_one_cycle(self):
+        chain = _chain(4096, np.random.default_rng(1))
+        self.assertEqual(len(chain), 512)
+        seen = set()
+        i = 0
+        for _ in range(len(chain)):
+            seen.add(i)
+            i = chain[i]
+        self.assertEqual(i, 0)
+        self.assertEqual(len(seen), len(chain))
+
+    def test_raw_latency_per_working_set(self):
+        sizes = (('32k', 32 << 10), ('1m', 1 << 20))
+        with mock.patch.object(cpu_memory_benchmark, 'LATENCY_STEPS', 1 << 14):
+            latency = measure_latency(sizes, 2)
+        self.assertEqual(list(latency), ['32k', '1m'])
+        # Every set reports its full time per load, including the smallest one
+        for label, ns in latency.items():
+            self.assertGreater(ns, 0.1, label)
+
+
+class ThreadLimitTest(unittest.TestCase):
+
+    def import_and_read(self, env):
+        code = 'import os, cpu_memory_benchmark; print(os.environ.get("OMP_NUM_THREADS"))'
+        return subprocess.run([sys.executable, '-c', code], cwd=UTILS_DIR, env=env, capture_output=True,
+                              text=True, check=True).stdout.strip()
+
+    def test_import_keeps_environment(self):
+        env = {k: v for k, v in os.environ.items() if k != 'OMP_NUM_THREADS'}
+        self.assertEqual(self.import_and_read(env), 'None')
+        env['OMP_NUM_THREADS'] = '4'
+        self.assertEqual(self.import_and_read(env), '4')
+
+
+if __name__ == '__main__':
+    unittest.main()
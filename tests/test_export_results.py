@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the long-format result exporter: row layout, CSV and NDJSON output,
+format detection and recursive run discovery
+"""
+
+import io
+import os
+import sys
+import csv
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from result_schema import MANIFEST_NAME, SCHEMA_VERSION
+from export_results import COLUMNS, find_run_dirs, iter_rows, detect_format, open_output, write_rows
+
+RUN_NAME = 'pre_Oct-19-2026_05-41-02-Extended-Test-Suite-Results'
+IPERF_FILE = 'pre_iperf_tcp_192.168.1.100_20261019_054102.json'
+
+
+class ExportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_export_test_')
+        self.run_dir = self.make_run(os.path.join(self.workdir, 'host-a', RUN_NAME))
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def make_run(self, run_dir):
+        os.makedirs(run_dir)
+        shutil.copy(os.path.join(FIXTURES, 'iperf3_tcp.json'), os.path.join(run_dir, IPERF_FILE))
+        shutil.copy(os.path.join(FIXTURES, 'yabs_output.txt'), os.path.join(run_dir, 'yabs_pre_results.txt'))
+        return run_dir
+
+
+class RowsTest(ExportTestCase):
+
+    def test_row_layout(self):
+        rows = list(iter_rows([self.run_dir], host='host-a'))
+        for row in rows:
+            self.assertEqual(len(row), len(COLUMNS))
+        by_column = [dict(zip(COLUMNS, row)) for row in rows]
+        iperf = [r for r in by_column if r['test'] == 'iperf_tcp']
+        self.assertEqual({r['host'] for r in by_column}, {'host-a'})
+        self.assertEqual({r['run'] for r in by_column}, {RUN_NAME})
+        self.assertEqual({r['phase'] for r in by_column}, {'pre'})
+
+        # One row per metric, sorted by metric name within a record
+        metrics = [r['metric'] for r in iperf]
+        self.assertEqual(metrics, sorted(metrics))
+        self.assertEqual(len(metrics), len(set(metrics)))
+        sender = next(r for r in iperf if r['metric'] == 'sender_mbps')
+        self.assertEqual((sender['value'], sender['unit'], sender['target']), (940.0, 'Mbps', '192.168.1.100'))
+        retransmits = next(r for r in iperf if r['metric'] == 'retransmits')
+        self.assertEqual((retransmits['value'], retransmits['unit']), (12, 'count'))
+
+        iops = next(r for r in by_column if r['metric'] == 'disk_4k_iops')
+        self.assertEqual((iops['test'], iops['unit']), ('yabs', 'IOPS'))
+
+    def test_manifest_host_wins(self):
+        entries = [('iperf_tcp', IPERF_FILE, 'web-01'), ('yabs', 'yabs_pre_results.txt', '')]
+        with open(os.path.join(self.run_dir, MANIFEST_NAME), 'w') as f:
+            for artifact_type, name, host in entries:
+                f.write(json.dumps({'schema_version': SCHEMA_VERSION, 'type': artifact_type, 'file': name,
+                                    'host': host, 'phase': 'pre', 'target': '',
+                                    'timestamp': '2026-10-19T05:41:02Z'}) + '\n')
+        hosts = {(row[3], row[0]) for row in iter_rows([self.run_dir], host='host-a')}
+        self.assertEqual(hosts, {('iperf_tcp', 'web-01'), ('yabs', 'host-a')})
+
+    def test_run_name_with_trailing_slash(self):
+        rows = list(iter_rows([self.run_dir + os.sep]))
+        self.assertEqual({row[1] for row in rows}, {RUN_NAME})
+
+
+class OutputTest(ExportTestCase):
+
+    def rows(self):
+        return [('host-a', RUN_NAME, 'pre', 'ping', '8.8.8.8', 'rtt_avg_ms', 12.5, 'ms', '2026-10-19T05:41:02Z'),
+                ('host-a', RUN_NAME, 'pre', 'ping', '8.8.8.8', 'target, "quoted"', 1, 'count', '')]
+
+    def test_csv(self):
+        out = io.StringIO(newline='')
+        self.assertEqual(write_rows(iter(self.rows()), out, 'csv'), 2)
+        parsed = list(csv.reader(io.StringIO(out.getvalue(), newline='')))
+        self.assertEqual(tuple(parsed[0]), COLUMNS)
+        self.assertEqual(parsed[1][6], '12.5')
+        self.assertEqual(parsed[2][5], 'target, "quoted"')
+
+    def test_ndjson(self):
+        out = io.StringIO()
+        self.assertEqual(write_rows(iter(self.rows()), out, 'ndjson'), 2)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(list(lines[0]), list(COLUMNS))
+        self.assertEqual(lines[0]['value'], 12.5)
+
+    def test_gzip_file(self):
+        path = os.path.join(self.workdir, 'export.csv.gz')
+        fmt, compressed = detect_format(path)
+        with open_output(path, compressed) as out:
+            count = write_rows(iter_rows([self.run_dir]), out, fmt)
+        with gzip.open(path, 'rt', newline='') as f:
+            lines = list(csv.reader(f))
+        self.assertEqual(len(lines), count + 1)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('out.csv'), ('csv', False))
+        self.assertEqual(detect_format('OUT.NDJSON.GZ'), ('ndjson', True))
+        self.assertEqual(detect_format('out.jsonl'), ('ndjson', False))
+        self.assertEqual(detect_format('out.json.gz'), ('ndjson', True))
+        self.assertEqual(detect_format('-'), (None, False))
+        self.assertEqual(detect_format('out.txt.gz'), (None, True))
+
+
+class FindRunDirsTest(ExportTestCase):
+
+    def test_recursive(self):
+        other = self.make_run(os.path.join(self.workdir, 'host-b', RUN_NAME))
+        # Cached downloads and checkpoints are never exported
+        self.make_run(os.path.join(self.workdir, '.cache', 'old'))
+        os.makedirs(os.path.join(self.workdir, 'host-b', 'empty'))
+        self.assertEqual(list(find_run_dirs([self.workdir], recursive=True)), [self.run_dir, other])
+
+    def test_not_recursive(self):
+        self.assertEqual(list(find_run_dirs([self.workdir, self.run_dir])), [self.workdir, self.run_dir])
+
+
+if __name__ == '__main__':
+    unittest.main()
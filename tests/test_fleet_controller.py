@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the fleet controller: inventory parsing, SSH command lines, the
+uplink gate, reading fetched run journals and indexing fetched results in the
+fleet store
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import threading
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from fleet_controller import (load_inventory, InventoryError, SSHHost, UplinkGate, FleetStore, completed_suites,
+                              DEFAULT_REMOTE_DIR, JOURNAL_NAME)
+
+INVENTORY_TEMPLATE = os.path.join(TESTS_DIR, '..', 'configs', 'fleet_inventory_template.conf')
+
+
+class InventoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_fleet_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def parse(self, text):
+        path = os.path.join(self.workdir, 'inventory.conf')
+        with open(path, 'w') as f:
+            f.write(text)
+        return load_inventory(path)
+
+    def test_template(self):
+        self.assertEqual(load_inventory(INVENTORY_TEMPLATE), [{'name': 'localhost', 'address': '127.0.0.1'}])
+
+    def test_options(self):
+        hosts = self.parse('# fleet\n\nweb-01  10.0.1.11  user=bench   # comment\n'
+                           'web-02 10.0.1.12 port=2202 identity=~/.ssh/k remote_dir=/opt/yabs-fleet\n')
+        self.assertEqual(hosts, [
+            {'name': 'web-01', 'address': '10.0.1.11', 'user': 'bench'},
+            {'name': 'web-02', 'address': '10.0.1.12', 'port': '2202', 'identity': '~/.ssh/k',
+             'remote_dir': '/opt/yabs-fleet'},
+        ])
+
+    def test_errors(self):
+        cases = [
+            ('web-01\n', 'expected'),
+            ('web-01 10.0.1.11 password=secret\n', "unknown option 'password=secret'"),
+            ('web-01 10.0.1.11 user\n', "unknown option 'user'"),
+            ('web-01 10.0.1.11\nweb-01 10.0.1.12\n', "inventory.conf:2: duplicate host name 'web-01'"),
+            ('# no hosts\n', 'no hosts'),
+            ('', 'no hosts'),
+        ]
+        for text, message in cases:
+            with self.assertRaises(InventoryError, msg=text) as ctx:
+                self.parse(text)
+            self.assertIn(message, str(ctx.exception))
+
+
+class SSHHostTest(unittest.TestCase):
+
+    def test_command_line(self):
+        host = SSHHost({'name': 'web-02', 'address': '10.0.1.12', 'user': 'bench', 'port': '2202',
+                        'identity': '/keys/fleet'}, '/tmp/ctl')
+        self.assertEqual(host.remote_dir, DEFAULT_REMOTE_DIR)
+        self.assertIn('ControlPath=/tmp/ctl/%C', host.base)
+        self.assertIn('BatchMode=yes', host.base)
+        self.assertEqual(host.base[-7:], ['-l', 'bench', '-p', '2202', '-i', '/keys/fleet', '10.0.1.12'])
+
+        minimal = SSHHost({'name': 'a', 'address': 'a.example', 'remote_dir': '/opt/y'}, '/tmp/ctl', ssh='/bin/ssh')
+        self.assertEqual((minimal.base[0], minimal.base[-1], minimal.remote_dir), ('/bin/ssh', 'a.example', '/opt/y'))
+        self.assertNotIn('-l', minimal.base)
+
+
+class UplinkGateTest(unittest.TestCase):
+
+    def test_slots(self):
+        gate = UplinkGate(2, 0)
+        lock = threading.Lock()
+        active = []
+        peak = []
+        release = threading.Event()
+
+        def worker():
+            with gate:
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                release.wait(5)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        # Let the first two take their slots before the rest are released
+        time.sleep(0.2)
+        self.assertEqual(len(active), 2)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(len(peak), 4)
+
+
+class CompletedSuitesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_fleet_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_count(self):
+        self.assertEqual(completed_suites(self.workdir), 0)
+        entry = '{{"step": "{}", "inputs": "{}", "status": "done", "timestamp": "2026-10-19T05:10:00Z"}}\n'
+        with open(os.path.join(self.workdir, JOURNAL_NAME), 'w') as f:
+            f.write(entry.format('cpu_memory', '896cd486'))
+            f.write(entry.format('suite', 'complete'))
+            f.write('{"step": "suite", "inp')
+        self.assertEqual(completed_suites(self.workdir), 1)
+        with open(os.path.join(self.workdir, JOURNAL_NAME), 'a') as f:
+            f.write('\n' + entry.format('dns', '9544b28b') + entry.format('suite', 'complete'))
+        self.assertEqual(completed_suites(self.workdir), 2)
+
+
+class FleetStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_fleet_test_')
+        self.results_dir = os.path.join(self.workdir, 'results')
+        os.makedirs(self.results_dir)
+        shutil.copy(os.path.join(FIXTURES, 'iperf3_tcp.json'),
+                    os.path.join(self.results_dir, 'pre_iperf_tcp_192.168.1.100_20261019_054102.json'))
+        self.store = FleetStore(os.path.join(self.workdir, 'store', 'fleet.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.workdir)
+
+    def result(self, host, status='ok', results_dir=None):
+        return {'host': host, 'status': status, 'started': '2026-10-19T05:00:00Z', 'finished': '2026-10-19T05:20:00Z',
+                'results_dir': results_dir}
+
+    def test_add_run(self):
+        added = self.store.add_run('20261019-050000', 'pre', self.result('web-01', results_dir=self.results_dir))
+        self.assertGreater(added, 0)
+        # Re-indexing a host's run replaces its metrics instead of duplicating them
+        self.assertEqual(self.store.add_run('20261019-050000', 'pre',
+                                            self.result('web-01', results_dir=self.results_dir)), added)
+        failed = dict(self.result('web-02', 'failed'), error='SSH connection failed')
+        self.assertEqual(self.store.add_run('20261019-050000', 'pre', failed), 0)
+
+        runs = {r['host']: r for r in self.store.runs()}
+        self.assertEqual(runs['web-01']['metrics'], added)
+        self.assertEqual((runs['web-02']['status'], runs['web-02']['error']), ('failed', 'SSH connection failed'))
+        self.assertEqual([r['host'] for r in self.store.runs('web-02')], ['web-02'])
+        value = self.store.db.execute("SELECT value FROM metrics WHERE metric = 'sender_mbps'").fetchone()[0]
+        self.assertAlmostEqual(value, 940.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the synthetic result generator and the tooling benchmark comparison:
+generated runs load as valid records, drift shows up in the post phase and
+regressions against the previous version on the same machine are flagged
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from generate_synthetic_results import generate
+from benchmark_tooling import compare, previous_entry
+from result_schema import load_records, validate_record, MANIFEST_NAME
+
+# Files in one suite run: raw and JSON ping per destination, iperf3 TCP/UDP, three DNS, four transfers, yabs
+RUN_FILES = 14
+
+
+def generator_args(output_dir, **overrides):
+    """Return generator arguments for a small, fast data set"""
+    args = argparse.Namespace(output_dir=output_dir, files=2 * RUN_FILES, hosts=1, phases='pre,post', drift=-50.0,
+                              flat=False, no_manifest=False, ping_count=20, iperf_duration=3, dns_queries=2,
+                              failure_rate=0.0, seed=7)
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+class GenerateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_generate_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def run_dirs(self):
+        host_dir = os.path.join(self.workdir, 'bench-host-000')
+        return [os.path.join(host_dir, name) for name in sorted(os.listdir(host_dir))]
+
+    def test_runs_load_as_valid_records(self):
+        files, total_bytes = generate(generator_args(self.workdir))
+        self.assertEqual(files, 2 * RUN_FILES)
+        self.assertGreater(total_bytes, 0)
+
+        run_dirs = self.run_dirs()
+        self.assertEqual([os.path.basename(d).split('_')[0] for d in run_dirs], ['post', 'pre'])
+        for run_dir in run_dirs:
+            self.assertTrue(os.path.exists(os.path.join(run_dir, MANIFEST_NAME)))
+            records = load_records(run_dir, strict=True)
+            self.assertEqual(len(records), RUN_FILES - 2)
+            for record in records:
+                self.assertEqual(validate_record(record), [], record['source'])
+            self.assertEqual(sorted({r['type'] for r in records}),
+                             ['dns_dig', 'dnsperf', 'iperf_tcp', 'iperf_udp', 'ping', 'transfer', 'yabs'])
+            yabs = next(r for r in records if r['type'] == 'yabs')
+            for metric in ['disk_4k_iops', 'disk_1m_mbps', 'geekbench_single', 'cpu_cores']:
+                self.assertIn(metric, yabs['metrics'])
+
+    def test_post_phase_drift(self):
+        generate(generator_args(self.workdir))
+        post_dir, pre_dir = self.run_dirs()
+
+        def tcp_mbps(run_dir):
+            return next(r for r in load_records(run_dir) if r['type'] == 'iperf_tcp')['metrics']['throughput_mbps']
+        self.assertLess(tcp_mbps(post_dir), tcp_mbps(pre_dir) * 0.75)
+
+    def test_file_limit_and_seed(self):
+        generate(generator_args(self.workdir, files=5, flat=True, no_manifest=True))
+        names = sorted(os.listdir(self.workdir))
+        self.assertEqual(len(names), 5)
+        self.assertNotIn(MANIFEST_NAME, names)
+
+        other = tempfile.mkdtemp(prefix='yabs_generate_test_')
+        try:
+            generate(generator_args(other, files=5, flat=True, no_manifest=True))
+            self.assertEqual(sorted(os.listdir(other)), names)
+            for name in names:
+                with open(os.path.join(self.workdir, name)) as a, open(os.path.join(other, name)) as b:
+                    self.assertEqual(a.read(), b.read(), name)
+        finally:
+            shutil.rmtree(other)
+
+    def test_flat_legacy_discovery(self):
+        # Without a manifest the run is discovered from file names, and every run gets its own yabs file
+        generate(generator_args(self.workdir, flat=True, no_manifest=True))
+        yabs_files = [n for n in os.listdir(self.workdir) if n.startswith('yabs_')]
+        self.assertEqual(len(yabs_files), 2)
+        records = load_records(self.workdir, strict=True)
+        self.assertEqual(len(records), 2 * (RUN_FILES - 2))
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_regressions(self):
+        old = {'total_s': 10.0, 'files_per_s': 100.0, 'peak_rss_kb': 50000}
+        new = {'total_s': 12.0, 'files_per_s': 98.0, 'peak_rss_kb': None}
+        changes = {label: (change, regressed) for label, _, _, change, regressed in compare(new, old, 10.0)}
+        self.assertEqual(set(changes), {'Total time', 'Ingestion'})
+        self.assertAlmostEqual(changes['Total time'][0], 20.0)
+        self.assertTrue(changes['Total time'][1])
+        self.assertAlmostEqual(changes['Ingestion'][0], -2.0)
+        self.assertFalse(changes['Ingestion'][1])
+
+    def test_previous_entry(self):
+        def entry(version, **fields):
+            return dict({'version': version, 'host': 'bench01', 'python_version': '3.12.3', 'tool': 'processor',
+                         'files': 1000, 'hosts': 16, 'legacy': False}, **fields)
+
+        history = [entry('v1'), entry('v2', files=10), entry('v2', legacy=True), entry('v2', host='laptop'),
+                   entry('v2', python_version='3.9.18'), entry('v2', skipped='matplotlib not installed'),
+                   entry('v3')]
+        self.assertEqual(previous_entry(history, entry('v3')), history[0])
+        self.assertIsNone(previous_entry(history, entry('v4', python_version='3.13.0')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the loopback network-stack benchmark: latency statistics, metric
+units and short runs of each test against a local server
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+import loopback_benchmark
+from loopback_benchmark import (payload_file, CACHE_ENV, PAYLOAD_NAME, start_server, stop_server, _percentile, _rr_stats, tcp_stream, tcp_rr, udp_stream,
+                                udp_rr, tcp_receive)
+from result_schema import metric_unit
+
+RECEIVE_BYTES = 4 << 20
+DURATION = 0.2
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def test_percentile_nearest_rank(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(_percentile(ordered, 50), 51)
+        self.assertEqual(_percentile(ordered, 99), 100)
+        self.assertEqual(_percentile([7], 99), 7)
+
+    def test_rr_stats(self):
+        stats = _rr_stats([0.0002, 0.0001, 0.0003, 0.0001], 2.0)
+        self.assertAlmostEqual(stats['p50_us'], 200.0)
+        self.assertAlmostEqual(stats['p99_us'], 300.0)
+        self.assertEqual(stats['tps'], 2.0)
+        self.assertEqual(_rr_stats([], 1.0), {})
+
+    def test_metric_units(self):
+        for name, unit in [('tcp_msg_16k_mbps', 'Mbps'), ('udp_1472_loss_percent', '%'), ('tcp_rr_1_p99_us', 'us'),
+                           ('udp_rr_1024_tps', 'count/s'), ('udp_rr_1_lost', 'count'), ('tcp_sendfile_mbps', 'Mbps')]:
+            self.assertEqual(metric_unit(name), unit, name)
+
+
+class PayloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_loopback_test_')
+        patcher = mock.patch.object(loopback_benchmark, 'SEND_BYTES', 2 << 20)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_without_cache(self):
+        with mock.patch.dict(os.environ, {CACHE_ENV: ''}):
+            path, temporary = payload_file()
+        self.assertTrue(temporary)
+        self.assertEqual(os.path.getsize(path), 2 << 20)
+        os.unlink(path)
+
+    def test_cached_payload_is_reused(self):
+        with mock.patch.dict(os.environ, {CACHE_ENV: self.workdir}):
+            path, temporary = payload_file()
+            self.assertFalse(temporary)
+            self.assertEqual(path, os.path.join(self.workdir, 'payloads', PAYLOAD_NAME))
+            self.assertEqual(sorted(os.listdir(os.path.dirname(path))), [PAYLOAD_NAME, PAYLOAD_NAME + '.sha256'])
+            mtime = os.stat(path).st_mtime_ns
+            self.assertEqual(payload_file(), (path, False))
+            self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+            # A corrupted payload is written again
+            with open(path, 'r+b') as f:
+                f.write(b'corrupt')
+            with open(path + '.sha256', 'r') as f:
+                checksum = f.read()
+            payload_file()
+            with open(path + '.sha256', 'r') as f:
+                self.assertNotEqual(f.read(), checksum)
+            self.assertEqual(os.path.getsize(path), 2 << 20)
+
+
+class LocalServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # A separate process as in real runs: forked handlers must not inherit the client's sockets
+        cls.cache_dir = tempfile.mkdtemp(prefix='yabs_loopback_test_')
+        with mock.patch.dict(os.environ, {CACHE_ENV: cls.cache_dir}):
+            cls.server, port = start_server('127.0.0.1')
+        cls.address = ('127.0.0.1', port)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.server)
+        shutil.rmtree(cls.cache_dir)
+
+    def test_tcp_stream(self):
+        received, elapsed = tcp_stream(self.address, 16 << 10, DURATION)
+        self.assertGreater(received, 0)
+        self.assertEqual(received % (16 << 10), 0)
+        self.assertGreaterEqual(elapsed, DURATION)
+
+    def test_udp_stream(self):
+        mbps, loss = udp_stream(self.address, 1472, DURATION)
+        self.assertGreater(mbps, 0)
+        self.assertGreaterEqual(loss, 0)
+        self.assertLessEqual(loss, 100)
+
+    def test_request_response(self):
+        for test in (tcp_rr, udp_rr):
+            stats = test(self.address, 64, DURATION)
+            self.assertLessEqual(stats['p50_us'], stats['p99_us'], test.__name__)
+            self.assertGreater(stats['tps'], 0, test.__name__)
+
+    def test_send_methods(self):
+        for method in ['copy', 'sendfile']:
+            self.assertGreater(tcp_receive(self.address, method, RECEIVE_BYTES), 0, method)
+
+
+if __name__ == '__main__':
+    unittest.main()
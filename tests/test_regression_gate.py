@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the regression gate: budget parsing, statistics, the Mann-Whitney
+test, per-budget verdicts and the exit codes of a whole gate run
+"""
+
+import os
+import sys
+import json
+import math
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from regression_gate import (Budget, parse_budgets, compute_statistic, mann_whitney_p, evaluate_budget, run_gate,
+                             EXIT_PASS, EXIT_REGRESSION, EXIT_NO_DATA)
+
+BUDGET_TEMPLATE = os.path.join(TESTS_DIR, '..', 'configs', 'gate_budgets_template.conf')
+
+
+def reference_u_p(pre, post):
+    """Mann-Whitney p-value from the pairwise definition of U (normal approximation, tie corrected)"""
+    u = sum((a > b) + 0.5 * (a == b) for a in pre for b in post)
+    n1, n2 = len(pre), len(post)
+    _, counts = np.unique(np.concatenate([pre, post]), return_counts=True)
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - ((counts ** 3 - counts).sum()) / (n * (n - 1)))
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0) / math.sqrt(var)
+    return math.erfc(z / math.sqrt(2))
+
+
+class BudgetParsingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_gate_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def parse(self, text):
+        path = os.path.join(self.workdir, 'budgets.conf')
+        with open(path, 'w') as f:
+            f.write(text)
+        return parse_budgets(path)
+
+    def test_parse(self):
+        budgets = self.parse('# comment\n\nping.rtt_ms p99 +10%   # tail latency\niperf_tcp.interval_mbps mean -5\n')
+        self.assertEqual([b.name for b in budgets], ['ping.rtt_ms', 'iperf_tcp.interval_mbps'])
+        self.assertEqual((budgets[0].statistic, budgets[0].direction, budgets[0].limit, budgets[0].relative),
+                         ('p99', 1, 10.0, True))
+        self.assertEqual((budgets[1].direction, budgets[1].relative), (-1, False))
+        self.assertEqual(budgets[1].describe(), 'mean -5')
+
+    def test_invalid_lines(self):
+        for line in ['ping.rtt_ms p99', 'ping.rtt_ms p42 +10%', 'ping.rtt_ms p99 10%', 'rtt_ms p99 +10%']:
+            with self.assertRaises(ValueError, msg=line):
+                self.parse(line + '\n')
+
+    def test_template(self):
+        budgets = parse_budgets(BUDGET_TEMPLATE)
+        self.assertTrue(budgets)
+        self.assertNotIn('iperf_udp.interval_jitter_ms', [b.name for b in budgets])
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def test_compute_statistic(self):
+        values = np.arange(1, 101, dtype=np.float64)
+        self.assertEqual(compute_statistic(values, 'mean'), 50.5)
+        self.assertEqual(compute_statistic(values, 'median'), 50.5)
+        self.assertEqual(compute_statistic(values, 'p50'), 50.5)
+        self.assertAlmostEqual(compute_statistic(values, 'p90'), 90.1)
+        self.assertAlmostEqual(compute_statistic(values, 'p99'), 99.01)
+        self.assertEqual(compute_statistic(values, 'min'), 1)
+        self.assertEqual(compute_statistic(values, 'max'), 100)
+
+    def test_mann_whitney_separated(self):
+        # scipy.stats.mannwhitneyu(range(1, 11), range(11, 21), method='asymptotic') -> 0.000182672
+        p = mann_whitney_p(np.arange(1, 11, dtype=float), np.arange(11, 21, dtype=float))
+        self.assertAlmostEqual(p, 0.000182672, places=8)
+
+    def test_mann_whitney_symmetric_and_ties(self):
+        rng = np.random.default_rng(3)
+        pre = np.round(rng.normal(10, 1, 30), 1)
+        post = np.round(rng.normal(10.5, 1, 25), 1)
+        p = mann_whitney_p(pre, post)
+        self.assertAlmostEqual(p, mann_whitney_p(post, pre))
+        self.assertAlmostEqual(p, reference_u_p(pre, post), places=9)
+        self.assertEqual(mann_whitney_p(np.ones(10), np.ones(12)), 1.0)
+
+    def test_mann_whitney_same_distribution(self):
+        values = np.arange(20, dtype=float)
+        self.assertGreater(mann_whitney_p(values[::2], values[1::2]), 0.5)
+
+
+class EvaluateBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.latency_budget = Budget('ping', 'rtt_ms', 'p99', 1, 10.0, True)
+        self.throughput_budget = Budget('iperf_tcp', 'interval_mbps', 'mean', -1, 5.0, True)
+        self.pre = rng.normal(10.0, 0.5, 200)
+        self.slow = rng.normal(12.0, 0.5, 200)
+
+    def test_regression_fails(self):
+        verdict = evaluate_budget(self.latency_budget, self.pre, self.slow, 0.05)
+        self.assertEqual(verdict['status'], 'fail')
+        self.assertGreater(verdict['change'], 10)
+        self.assertLess(verdict['p_value'], 0.05)
+
+    def test_within_budget(self):
+        verdict = evaluate_budget(self.latency_budget, self.pre, self.pre * 1.01, 0.05)
+        self.assertEqual(verdict['status'], 'pass')
+        self.assertEqual(verdict['message'], 'within budget')
+
+    def test_direction(self):
+        # Throughput may only drop by 5%: a rise is never a regression
+        self.assertEqual(evaluate_budget(self.throughput_budget, self.slow, self.pre, 0.05)['status'], 'fail')
+        self.assertEqual(evaluate_budget(self.throughput_budget, self.pre, self.slow, 0.05)['status'], 'pass')
+
+    def test_over_budget_but_not_significant(self):
+        pre = np.arange(1, 11, dtype=float)
+        post = pre.copy()
+        post[-1] = 20.0
+        verdict = evaluate_budget(self.latency_budget, pre, post, 0.05)
+        self.assertEqual(verdict['status'], 'pass')
+        self.assertIn('not significant', verdict['message'])
+
+    def test_min_samples(self):
+        verdict = evaluate_budget(self.latency_budget, self.pre[:3], self.slow[:3], 0.05)
+        self.assertEqual(verdict['status'], 'skipped')
+        self.assertIn('insufficient samples', verdict['message'])
+        self.assertEqual(evaluate_budget(self.latency_budget, self.pre, np.empty(0), 0.05)['status'], 'skipped')
+
+    def test_single_values_with_min_samples_one(self):
+        # One value per phase compares the raw values, without a significance test
+        verdict = evaluate_budget(self.latency_budget, np.array([10.0]), np.array([12.0]), 0.05, min_samples=1)
+        self.assertEqual(verdict['status'], 'fail')
+        self.assertIsNone(verdict['p_value'])
+
+
+class RunGateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_gate_test_')
+        with open(os.path.join(FIXTURES, 'iperf3_tcp.json'), 'r') as f:
+            data = json.load(f)
+        self.pre_dir = self.write_run('pre', 'pre', data)
+        self.same_dir = self.write_run('same', 'post', data)
+        for interval in data['intervals']:
+            interval['sum']['bits_per_second'] *= 0.5
+        self.post_dir = self.write_run('post', 'post', data)
+        self.budgets = [Budget('iperf_tcp', 'interval_mbps', 'mean', -1, 5.0, True)]
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def write_run(self, name, phase, data):
+        run_dir = os.path.join(self.workdir, name)
+        os.makedirs(run_dir)
+        with open(os.path.join(run_dir, f'{phase}_iperf_192.168.1.100_20261019_054102.json'), 'w') as f:
+            json.dump(data, f)
+        return run_dir
+
+    def test_exit_codes(self):
+        run_dirs = [(self.pre_dir, 'pre'), (self.post_dir, 'post')]
+        # Three intervals per phase are below the default minimum
+        code, verdicts = run_gate(run_dirs, self.budgets)
+        self.assertEqual(code, EXIT_NO_DATA)
+        code, verdicts = run_gate(run_dirs, self.budgets, min_samples=3)
+        self.assertEqual(code, EXIT_REGRESSION)
+        self.assertEqual(verdicts[0]['pre_samples'], 3)
+        code, _ = run_gate([(self.pre_dir, 'pre'), (self.same_dir, 'post')], self.budgets, min_samples=3)
+        self.assertEqual(code, EXIT_PASS)
+
+
+if __name__ == '__main__':
+    unittest.main()
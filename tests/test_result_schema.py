@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the unified result schema: normalizers against real yabs and
+iperf3 output, manifest reading and record loading
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import contextlib
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from result_schema import (normalize_yabs_text, normalize_yabs_json, normalize_iperf_tcp, normalize_iperf_udp,
+                           parse_yabs_iperf_table, yabs_iperf_metric, classify_filename, metric_unit, read_manifest, iter_records, load_records,
+                           validate_record, SchemaError, MANIFEST_NAME, SCHEMA_VERSION)
+
+
+def read_fixture(name):
+    """Return the text of a fixture file"""
+    with open(os.path.join(FIXTURES, name), 'r') as f:
+        return f.read()
+
+
+def load_fixture(name):
+    """Return a parsed JSON fixture"""
+    return json.loads(read_fixture(name))
+
+
+class YabsTextTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics, self.attributes, self.target = normalize_yabs_text(read_fixture('yabs_output.txt'))
+
+    def test_system_info(self):
+        self.assertEqual(self.metrics['cpu_cores'], 4)
+        self.assertEqual(self.attributes['cpu_freq'], '2794.748 MHz')
+        self.assertEqual(self.attributes['cpu_model'], 'AMD EPYC 7543P 32-Core Processor')
+        self.assertEqual(self.attributes['kernel'], '5.15.0-105-generic')
+        self.assertEqual(self.attributes['virt_type'], 'KVM')
+        self.assertAlmostEqual(self.metrics['ram_kib'], 7.8 * 1024 ** 2)
+        self.assertAlmostEqual(self.metrics['disk_kb'], 157.3 * 1024 ** 2)
+        self.assertEqual(self.target, '')
+
+    def test_fio_table(self):
+        self.assertAlmostEqual(self.metrics['disk_4k_read_mbps'], 169.44)
+        self.assertEqual(self.metrics['disk_4k_read_iops'], 42300)
+        self.assertAlmostEqual(self.metrics['disk_4k_mbps'], 339.33)
+        self.assertEqual(self.metrics['disk_4k_iops'], 84800)
+        # GB/s cells are converted to MB/s
+        self.assertAlmostEqual(self.metrics['disk_64k_write_mbps'], 1050)
+        self.assertAlmostEqual(self.metrics['disk_1m_mbps'], 3190)
+        self.assertEqual(self.metrics['disk_1m_iops'], 3100)
+        fio = [name for name in self.metrics if name.startswith('disk_') and name != 'disk_kb']
+        self.assertEqual(len(fio), 4 * 6)
+
+    def test_geekbench(self):
+        self.assertEqual(self.metrics['geekbench_single'], 1439)
+        self.assertEqual(self.metrics['geekbench_multi'], 4813)
+
+    def test_iperf_table(self):
+        iperf = {name: value for name, value in self.metrics.items() if name.startswith('iperf_')}
+        # The progress messages before the first row are cut off, busy servers are skipped
+        self.assertEqual(iperf, {
+            'iperf_ipv4_clouvider_london_uk_send_mbps': 1610.0,
+            'iperf_ipv4_clouvider_london_uk_recv_mbps': 1430.0,
+            'iperf_ipv4_eranium_amsterdam_nl_recv_mbps': 845.0,
+            'iperf_ipv4_leaseweb_nyc_ny_us_send_mbps': 512.0,
+            'iperf_ipv4_leaseweb_nyc_ny_us_recv_mbps': 736.0,
+        })
+        for name in iperf:
+            self.assertEqual(metric_unit(name), 'Mbps', name)
+
+    def test_iperf_metric_names(self):
+        self.assertEqual(yabs_iperf_metric('IPv6', 'Scaleway', 'Paris, FR (10G)', 'send'),
+                         'iperf_ipv6_scaleway_paris_fr_send_mbps')
+        metrics = parse_yabs_iperf_table('iperf3 Network Speed Tests (IPv6):\n'
+                                         'Provider | Location (Link) | Send Speed | Recv Speed | Ping\n'
+                                         'Clouvider | London, UK (10G) | 1.61 Gbits/sec | busy | 1 ms\n'
+                                         'Online | Paris, FR (10G) | 980 Kbits/sec | -- | --\n')
+        self.assertEqual(metrics, {'iperf_ipv6_clouvider_london_uk_send_mbps': 1610.0,
+                                   'iperf_ipv6_online_paris_fr_send_mbps': 0.98})
+
+    def test_legacy_fio_lines(self):
+        metrics, _, _ = normalize_yabs_text('4k : 42.25 MB/s (10600 IOPS)\n64k : 512.00 MB/s (8000 IOPS)\n')
+        self.assertEqual(metrics['disk_4k_mbps'], 42.25)
+        self.assertEqual(metrics['disk_64k_iops'], 8000)
+
+
+class YabsJsonTest(unittest.TestCase):
+
+    def test_matches_text_metrics(self):
+        metrics, attributes, _ = normalize_yabs_json(load_fixture('yabs.json'))
+        text_metrics, _, _ = normalize_yabs_text(read_fixture('yabs_output.txt'))
+        # JSON speeds are exact KB/s, the text table is rounded
+        for name in ['disk_4k_mbps', 'disk_4k_read_mbps', 'disk_64k_write_mbps']:
+            self.assertAlmostEqual(metrics[name], text_metrics[name], delta=text_metrics[name] * 0.01)
+        self.assertEqual(metrics['disk_4k_iops'], 84832)
+        self.assertEqual(metrics['ram_kib'], 8147968)
+        self.assertEqual(metrics['geekbench_multi'], 4813)
+        self.assertEqual(metrics['iperf_ipv4_clouvider_london_uk_send_mbps'], text_metrics[
+            'iperf_ipv4_clouvider_london_uk_send_mbps'])
+        self.assertNotIn('iperf_ipv4_eranium_amsterdam_nl_send_mbps', metrics)
+        self.assertEqual(attributes['cpu_aes'], 'true')
+        self.assertEqual(attributes['geekbench_version'], '6')
+
+
+class IperfTest(unittest.TestCase):
+
+    def test_tcp(self):
+        metrics, _, target = normalize_iperf_tcp(load_fixture('iperf3_tcp.json'))
+        self.assertAlmostEqual(metrics['sender_mbps'], 940.0)
+        self.assertAlmostEqual(metrics['receiver_mbps'], 938.6)
+        self.assertAlmostEqual(metrics['throughput_mbps'], 939.3)
+        self.assertEqual(metrics['retransmits'], 12)
+        self.assertEqual(target, '192.168.1.100')
+
+    def test_udp(self):
+        metrics, _, target = normalize_iperf_udp(load_fixture('iperf3_udp.json'))
+        self.assertAlmostEqual(metrics['throughput_mbps'], 49.9913989)
+        self.assertEqual(metrics['jitter_ms'], 0.0423)
+        self.assertEqual(metrics['lost_packets'], 13)
+        self.assertEqual(metrics['packets'], 12948)
+        self.assertEqual(metrics['lost_percent'], 0.1004)
+        self.assertEqual(target, '192.168.1.100')
+
+    def test_units(self):
+        for name in ['sender_mbps', 'jitter_ms', 'lost_percent', 'disk_4k_read_iops', 'disk_1m_mbps']:
+            self.assertIsNotNone(metric_unit(name), name)
+        self.assertEqual(metric_unit('disk_4k_read_iops'), 'IOPS')
+
+
+class RecordLoadingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results_dir = tempfile.mkdtemp(prefix='yabs_schema_test_')
+        for fixture, name in [('yabs.json', 'yabs_pre_results.json'),
+                              ('iperf3_tcp.json', 'pre_iperf_192.168.1.100_20261019_054102.json'),
+                              ('iperf3_udp.json', 'pre_iperf_udp_192.168.1.100_20261019_054110.json')]:
+            shutil.copy(os.path.join(FIXTURES, fixture), os.path.join(self.results_dir, name))
+
+    def tearDown(self):
+        shutil.rmtree(self.results_dir)
+
+    def write_manifest(self, entries):
+        with open(os.path.join(self.results_dir, MANIFEST_NAME), 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+
+    def entry(self, artifact_type, filename, target=''):
+        return {'schema_version': SCHEMA_VERSION, 'type': artifact_type, 'file': filename, 'host': 'bench01',
+                'phase': 'pre', 'target': target, 'timestamp': '2026-10-19T05:41:02Z'}
+
+    def test_classify_filename(self):
+        self.assertEqual(classify_filename('yabs_pre_results.json'), 'yabs_json')
+        self.assertEqual(classify_filename('yabs_output.txt'), 'yabs')
+        self.assertEqual(classify_filename('pre_iperf_udp_10.0.0.1_x.json'), 'iperf_udp')
+        self.assertEqual(classify_filename('pre_iperf_10.0.0.1_x.json'), 'iperf_tcp')
+        self.assertIsNone(classify_filename('test_summary.txt'))
+
+    def test_discovery_without_manifest(self):
+        records = load_records(self.results_dir)
+        self.assertEqual(sorted(r['test'] for r in records), ['iperf_tcp', 'iperf_udp', 'yabs'])
+        for record in records:
+            self.assertEqual(validate_record(record), [])
+            self.assertEqual(record['phase'], 'pre')
+
+    def test_manifest_records(self):
+        self.write_manifest([self.entry('yabs_json', 'yabs_pre_results.json'),
+                             self.entry('iperf_tcp', 'pre_iperf_192.168.1.100_20261019_054102.json', '192.168.1.100')])
+        records = load_records(self.results_dir)
+        self.assertEqual([r['test'] for r in records], ['yabs', 'iperf_tcp'])
+        self.assertEqual(records[0]['host'], 'bench01')
+        self.assertEqual(records[1]['target'], '192.168.1.100')
+        self.assertEqual(records[1]['timestamp'], '2026-10-19T05:41:02Z')
+
+    def test_missing_file(self):
+        self.write_manifest([self.entry('iperf_tcp', 'missing.json'), self.entry('yabs_json', 'yabs_pre_results.json')])
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            records = list(iter_records(self.results_dir))
+        self.assertEqual([r['test'] for r in records], ['yabs'])
+        self.assertIn('missing.json', stderr.getvalue())
+        with self.assertRaises(SchemaError):
+            list(iter_records(self.results_dir, strict=True))
+
+    def test_invalid_manifest(self):
+        entry = self.entry('iperf_tcp', 'pre_iperf_192.168.1.100_20261019_054102.json')
+        del entry['timestamp']
+        self.write_manifest([entry])
+        with self.assertRaises(SchemaError):
+            read_manifest(self.results_dir)
+        with open(os.path.join(self.results_dir, MANIFEST_NAME), 'w') as f:
+            f.write('{"schema_version": 1, "type": \n')
+        with self.assertRaises(SchemaError):
+            read_manifest(self.results_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
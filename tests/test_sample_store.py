@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the compact binary sample format: round trips for every codec,
+block boundaries, streaming aggregates, raw series extraction and the codec
+benchmark
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from sample_store import (SampleWriter, SampleReader, SampleFormatError, write_samples, read_samples,
+                          extract_ping_rtts, extract_iperf_intervals, convert_entry, sample_path, run_benchmark, zstandard)
+
+PING_OUTPUT = """PING 8.8.8.8 (8.8.8.8) 56(84) bytes of data.
+64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=11.8 ms
+64 bytes from 8.8.8.8: icmp_seq=2 ttl=117 time=12.1 ms
+64 bytes from 8.8.8.8: icmp_seq=3 ttl=117 time=11.9 ms
+
+--- 8.8.8.8 ping statistics ---
+3 packets transmitted, 3 received, 0% packet loss, time 2003ms
+rtt min/avg/max/mdev = 11.800/11.933/12.100/0.124 ms
+"""
+
+
+class SampleStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_samples_test_')
+        self.values = np.round(np.random.default_rng(7).lognormal(3.0, 0.3, 10000), 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def test_round_trip_codecs(self):
+        variants = [('none', False), ('zlib', False), ('zlib', True)]
+        if zstandard is not None:
+            variants += [('zstd', False), ('zstd', True)]
+        for codec, shuffle in variants:
+            path = write_samples(self.path(f'{codec}_{shuffle}.ybs'), self.values, 'rtt_ms', 'ms',
+                                 codec=codec, shuffle=shuffle)
+            np.testing.assert_array_equal(read_samples(path), self.values, err_msg=f'{codec} shuffle={shuffle}')
+            with SampleReader(path) as reader:
+                self.assertEqual((reader.name, reader.unit, reader.count), ('rtt_ms', 'ms', self.values.size))
+
+    def test_blocks_and_integers(self):
+        path = self.path('counters.ybs')
+        counters = np.arange(2500, dtype=np.int64) * 3
+        with SampleWriter(path, 'bytes', 'B', dtype='i8', codec='zlib', block_samples=1000, shuffle=True) as writer:
+            # Appends that straddle block boundaries
+            writer.append(counters[:700])
+            writer.append(counters[700:2100])
+            writer.append(counters[2100:])
+        with SampleReader(path) as reader:
+            self.assertEqual([count for _, _, count in reader.index], [1000, 1000, 500])
+            self.assertEqual(reader.array().dtype, np.dtype('<i8'))
+            np.testing.assert_array_equal(reader.array(), counters)
+
+    def test_aggregate_and_percentiles(self):
+        path = write_samples(self.path('agg.ybs'), self.values, 'rtt_ms', 'ms', codec='zlib')
+        with SampleReader(path) as reader:
+            stats = reader.aggregate()
+            percentiles = reader.percentiles((50, 99))
+        self.assertEqual(stats['count'], self.values.size)
+        self.assertAlmostEqual(stats['mean'], float(np.mean(self.values)), places=9)
+        self.assertAlmostEqual(stats['stddev'], float(np.std(self.values)), places=6)
+        self.assertEqual(stats['min'], float(self.values.min()))
+        self.assertEqual(stats['max'], float(self.values.max()))
+        self.assertAlmostEqual(percentiles[99], float(np.percentile(self.values, 99)))
+
+    def test_empty_file(self):
+        path = write_samples(self.path('empty.ybs'), [], 'rtt_ms', 'ms', codec='none')
+        with SampleReader(path) as reader:
+            self.assertEqual(reader.array().size, 0)
+            self.assertEqual(reader.aggregate()['count'], 0)
+
+    def test_rejects_other_files(self):
+        with open(self.path('bad.ybs'), 'wb') as f:
+            f.write(b'not a sample file at all, just some bytes')
+        with self.assertRaises(SampleFormatError):
+            SampleReader(self.path('bad.ybs'))
+        with self.assertRaises(SampleFormatError):
+            write_samples(self.path('x.ybs'), [1.0], 'x', codec='lz4')
+
+    def test_extract_raw_series(self):
+        np.testing.assert_array_equal(extract_ping_rtts(PING_OUTPUT), [11.8, 12.1, 11.9])
+        with open(os.path.join(FIXTURES, 'iperf3_tcp.json'), 'r') as f:
+            intervals = extract_iperf_intervals(json.load(f))
+        np.testing.assert_allclose(intervals, [941.2, 938.7, 940.1])
+
+    def test_convert_entry(self):
+        shutil.copy(os.path.join(FIXTURES, 'iperf3_udp.json'), self.path('iperf_udp.json'))
+        entry = {'type': 'iperf_udp', 'file': 'iperf_udp.json'}
+        written = convert_entry(self.workdir, entry, codec='zlib')
+        self.assertEqual(written, [sample_path(self.workdir, 'iperf_udp.json', 'interval_mbps')])
+        np.testing.assert_allclose(read_samples(written[0]), [50.0, 49.99, 50.01])
+
+    def test_benchmark_files(self):
+        # Files in a temporary directory are removed, a given output is kept
+        with mock.patch.object(tempfile, 'tempdir', self.workdir):
+            results = run_benchmark(1000)
+        self.assertEqual(os.listdir(self.workdir), [])
+        self.assertEqual(results[0][0], 'json')
+        self.assertAlmostEqual(results[-1][3], results[0][3])
+
+        kept = run_benchmark(1000, self.path('bench'))
+        self.assertEqual(len(os.listdir(self.path('bench'))), len(kept))
+
+
+if __name__ == '__main__':
+    unittest.main()
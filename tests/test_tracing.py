@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Tests for span tracing: event writing, trace loading and the exclusive-time
+summary
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'scripts', 'utils'))
+
+from tracing import span, load_trace, summarize, max_rss_kb, TRACE_ENV
+
+
+def event(name, ts, dur, cat='measure'):
+    """Return a complete trace event"""
+    return {'name': name, 'cat': cat, 'ph': 'X', 'ts': ts, 'dur': dur, 'pid': 1, 'tid': 1, 'args': {}}
+
+
+class SpanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_trace_test_')
+        self.trace = os.path.join(self.workdir, 'trace.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {TRACE_ENV: ''}):
+            with span('noop'):
+                pass
+        self.assertFalse(os.path.exists(self.trace))
+
+    def test_appends_events(self):
+        with mock.patch.dict(os.environ, {TRACE_ENV: self.trace}):
+            with span('outer', 'analysis', rows=3):
+                with span('inner'):
+                    pass
+        with open(self.trace, 'r') as f:
+            content = f.read()
+        # Written as an unterminated JSON array so shell and Python writers can append
+        self.assertTrue(content.startswith('[\n'))
+        events = load_trace(self.trace)
+        self.assertEqual([e['name'] for e in events], ['inner', 'outer'])
+        self.assertEqual(events[1]['cat'], 'analysis')
+        self.assertEqual(events[1]['args']['rows'], 3)
+        for key in ['cpu_ms', 'rchar', 'read_bytes', 'rss_kb']:
+            self.assertIn(key, events[0]['args'])
+
+    def test_existing_trace_is_kept(self):
+        with open(self.trace, 'w') as f:
+            f.write('[\n' + json.dumps(event('shell', 0, 10)) + ',\n')
+        with mock.patch.dict(os.environ, {TRACE_ENV: self.trace}):
+            with span('python'):
+                pass
+        self.assertEqual([e['name'] for e in load_trace(self.trace)], ['shell', 'python'])
+
+    def test_load_trace_formats(self):
+        events = [event('a', 0, 5), event('b', 5, 5)]
+        with open(self.trace, 'w') as f:
+            json.dump(events + [{'name': 'meta', 'ph': 'M'}], f)
+        self.assertEqual([e['name'] for e in load_trace(self.trace)], ['a', 'b'])
+        open(self.trace, 'w').close()
+        self.assertEqual(load_trace(self.trace), [])
+
+    def test_max_rss(self):
+        self.assertGreater(max_rss_kb(), 0)
+
+
+class SummarizeTest(unittest.TestCase):
+
+    def test_exclusive_time(self):
+        summary = summarize([
+            event('suite', 0, 100, 'suite'),
+            event('network.ping', 10, 30),
+            event('network.iperf', 50, 40),
+            event('parse', 60, 10, 'parse'),
+        ])
+        spans = {s['name']: s for s in summary['spans']}
+        self.assertEqual(summary['wall_us'], 100)
+        self.assertEqual(spans['suite']['self_us'], 30)
+        self.assertEqual(spans['network.iperf']['self_us'], 30)
+        self.assertEqual(spans['network.iperf']['total_us'], 40)
+        self.assertEqual(summary['categories'], {'suite': 30, 'measure': 60, 'parse': 10})
+
+    def test_parallel_spans(self):
+        # Overlapping spans that don't nest are siblings, not parent and child
+        summary = summarize([event('suite', 0, 100, 'suite'), event('a', 10, 50), event('b', 40, 50)])
+        spans = {s['name']: s for s in summary['spans']}
+        self.assertEqual(spans['a']['self_us'], 50)
+        self.assertEqual(spans['b']['self_us'], 50)
+
+    def test_empty(self):
+        self.assertEqual(summarize([])['wall_us'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
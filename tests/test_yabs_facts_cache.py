@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the host facts cache in yabs.sh: TTL and reboot invalidation, the
+disabled cache and the single background refresh per fact class
+"""
+
+import os
+import re
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+YABS = os.path.join(TESTS_DIR, '..', 'yabs.sh')
+FACTS_FUNCTIONS = ('facts_load', 'facts_save', 'facts_refresh')
+
+
+def extract_functions(path, names):
+    """Return the source of the named top-level functions; yabs.sh runs its tests when sourced"""
+    with open(path, 'r') as f:
+        source = f.read()
+    functions = []
+    for name in names:
+        match = re.search(rf'^function {name} {{\n.*?^}}\n', source, re.S | re.M)
+        if not match:
+            raise AssertionError(f"function {name} not found in {path}")
+        functions.append(match.group(0))
+    return ''.join(functions)
+
+
+class FactsCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.functions = extract_functions(YABS, FACTS_FUNCTIONS)
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='yabs_facts_test_')
+        self.cache_dir = os.path.join(self.workdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def bash(self, script, boot_id='boot-1', cache_dir=None):
+        """Run a script with the facts functions defined, returning its stdout"""
+        env = dict(os.environ, YABS_CACHE_DIR=self.cache_dir if cache_dir is None else cache_dir)
+        proc = subprocess.run(['bash', '-c', f'BOOT_ID={boot_id}\n{self.functions}\n{script}'],
+                              env=env, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc.stdout
+
+    def save(self, **kwargs):
+        self.bash('CPU_PROC="AMD EPYC 7543P 32-Core Processor"; CPU_AES="\\xE2\\x9C\\x94 Enabled"\n'
+                  'facts_save hardware CPU_PROC CPU_AES', **kwargs)
+
+    def load(self, ttl=60, **kwargs):
+        return self.bash(f'facts_load hardware {ttl} CPU_PROC CPU_AES; echo "$?|$CPU_PROC|$CPU_AES"',
+                         **kwargs).strip().split('|')
+
+    def test_round_trip(self):
+        self.assertEqual(self.load()[0], '2')
+        self.save()
+        status, cpu, aes = self.load()
+        self.assertEqual(status, '0')
+        self.assertEqual(cpu, 'AMD EPYC 7543P 32-Core Processor')
+        self.assertEqual(aes, '\\xE2\\x9C\\x94 Enabled')
+        self.assertEqual(os.listdir(os.path.join(self.cache_dir, 'facts')), ['hardware'])
+
+    def test_expired_facts_are_still_loaded(self):
+        self.save()
+        status, cpu, _ = self.load(ttl=0)
+        self.assertEqual(status, '1')
+        self.assertEqual(cpu, 'AMD EPYC 7543P 32-Core Processor')
+
+    def test_reboot_invalidates(self):
+        self.save()
+        self.assertEqual(self.load(boot_id='boot-2')[0], '2')
+
+    def test_only_requested_variables(self):
+        self.save()
+        out = self.bash('facts_load hardware 60 CPU_PROC; echo "$?|$CPU_PROC|${CPU_AES-unset}"').strip()
+        self.assertEqual(out, '0|AMD EPYC 7543P 32-Core Processor|unset')
+
+    def test_disabled(self):
+        self.save(cache_dir='')
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertEqual(self.load(cache_dir='')[0], '2')
+
+    def test_single_refresh(self):
+        self.bash('IPV4_CHECK=true; IPV6_CHECK=""; facts_save connectivity IPV4_CHECK IPV6_CHECK')
+        marker = os.path.join(self.workdir, 'refreshed')
+        collect = f'collect() {{ echo run >> "{marker}"; sleep 0.3; IPV4_CHECK=fresh; }}\n'
+        # The second refresh finds the lock of the first and returns at once
+        self.bash(collect + 'facts_refresh connectivity collect IPV4_CHECK IPV6_CHECK\n'
+                  'facts_refresh connectivity collect IPV4_CHECK IPV6_CHECK\nwait')
+        with open(marker, 'r') as f:
+            self.assertEqual(f.read(), 'run\n')
+        out = self.bash('facts_load connectivity 60 IPV4_CHECK IPV6_CHECK; echo "$?|$IPV4_CHECK"').strip()
+        self.assertEqual(out, '0|fresh')
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'facts', 'connectivity.refresh')))
+
+    def test_stale_lock_is_ignored(self):
+        self.bash('facts_save connectivity IPV4_CHECK')
+        lock = os.path.join(self.cache_dir, 'facts', 'connectivity.refresh')
+        os.mkdir(lock)
+        old = time.time() - 3600
+        os.utime(lock, (old, old))
+        self.bash('collect() { IPV4_CHECK=fresh; }\nfacts_refresh connectivity collect IPV4_CHECK\nwait')
+        self.assertEqual(self.bash('facts_load connectivity 60 IPV4_CHECK; echo "$IPV4_CHECK"').strip(), 'fresh')
+
+
+if __name__ == '__main__':
+    unittest.main()
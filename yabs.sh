@@ -25,6 +25,13 @@ date
 TIME_START=$(date '+%Y%m%d-%H%M%S')
 YABS_START_TIME=$(date +%s)
 
+# optional span tracing: trace_begin/trace_end are exported by lib/common_functions.sh
+# (e.g. performance_test_suite.sh --trace) and write to $YABS_TRACE_FILE; no-ops otherwise
+if ! declare -F trace_begin > /dev/null; then
+	function trace_begin { :; }
+	function trace_end { :; }
+fi
+
 # override locale to eliminate parsing errors (i.e. using commas as delimiters rather than periods)
 if locale -a 2>/dev/null | grep ^C$ > /dev/null; then
 	# locale "C" installed
@@ -112,10 +119,94 @@ else
 fi
 
 
+# optional host facts cache (when YABS_CACHE_DIR is set, e.g. by performance_test_suite.sh):
+# hardware facts, connectivity and network/ISP info are kept in $YABS_CACHE_DIR/facts with a TTL
+# (in seconds) per class and are all refreshed after a reboot. Expired network facts are still
+# used for the current run and refreshed in the background, so lookups never block a run.
+FACTS_TTL_HARDWARE=${YABS_FACTS_TTL_HARDWARE:-259200}
+FACTS_TTL_CONNECTIVITY=${YABS_FACTS_TTL_CONNECTIVITY:-3600}
+FACTS_TTL_NETWORK=${YABS_FACTS_TTL_NETWORK:-21600}
+# timeout (in seconds) of every external network info lookup
+FACTS_TIMEOUT=${YABS_FACTS_TIMEOUT:-4}
+BOOT_ID=$(cat /proc/sys/kernel/random/boot_id 2>/dev/null)
+
+# facts_load
+# Purpose: Load a class of cached host facts into the given variables
+# Parameters:
+#          1. CLASS - fact class (hardware, connectivity, network)
+#          2. TTL - maximum age in seconds
+#          3+. VARS - names of the variables the class holds
+# Returns:
+#          0 if the facts are fresh, 1 if they were loaded but have expired,
+#          2 if there are none (caching disabled, never stored or stored before the last reboot)
+function facts_load {
+	local FILE="$YABS_CACHE_DIR/facts/$1" TTL=$2 KEY VALUE FETCHED="" BOOT=""
+	shift 2
+	[[ -z $YABS_CACHE_DIR || ! -f "$FILE" ]] && return 2
+
+	while IFS=$'\t' read -r KEY VALUE; do
+		case $KEY in
+			_FETCHED) FETCHED=$VALUE ;;
+			_BOOT) BOOT=$VALUE ;;
+			*) [[ " $* " == *" $KEY "* ]] && printf -v "$KEY" '%s' "$VALUE" ;;
+		esac
+	done < "$FILE"
+
+	[[ -z $FETCHED || "$BOOT" != "$BOOT_ID" ]] && return 2
+	(( $(date +%s) - FETCHED < TTL )) && return 0 || return 1
+}
+
+# facts_save
+# Purpose: Atomically store the current values of a class of host facts (no-op if caching is disabled)
+# Parameters:
+#          1. CLASS - fact class
+#          2+. VARS - names of the variables to store
+function facts_save {
+	[[ -z $YABS_CACHE_DIR ]] && return 0
+	local FILE="$YABS_CACHE_DIR/facts/$1" VAR
+	shift
+	mkdir -p "$YABS_CACHE_DIR/facts"
+	{
+		printf '_FETCHED\t%s\n_BOOT\t%s\n' "$(date +%s)" "$BOOT_ID"
+		for VAR in "$@"; do
+			printf '%s\t%s\n' "$VAR" "${!VAR}"
+		done
+	} > "$FILE.$$" && mv "$FILE.$$" "$FILE"
+}
+
+# facts_refresh
+# Purpose: Refresh a class of expired network facts in the background, at most one refresh per class
+# Parameters:
+#          1. CLASS - fact class
+#          2. FUNCTION - collects the facts into the variables
+#          3+. VARS - names of the variables to store
+function facts_refresh {
+	local LOCK="$YABS_CACHE_DIR/facts/$1.refresh"
+	# a lock left behind by a refresh that was killed is ignored after 10 minutes
+	find "$LOCK" -maxdepth 0 -mmin +10 -exec rmdir {} \; 2>/dev/null
+	mkdir "$LOCK" 2>/dev/null || return 0
+	( "$2" && facts_save "$1" "${@:3}"; rmdir "$LOCK" ) </dev/null >/dev/null 2>&1 &
+}
+
+# collect_connectivity
+# Purpose: Test if the host has IPv4/IPv6 connectivity
+# Parameters:
+#          - (none)
+function collect_connectivity {
+	[[ -n $LOCAL_CURL ]] && IP_CHECK_CMD="curl -s -m $FACTS_TIMEOUT" || IP_CHECK_CMD="wget -qO- -T $FACTS_TIMEOUT"
+	IPV4_CHECK=$( (ping -4 -c 1 -W "$FACTS_TIMEOUT" ipv4.google.com >/dev/null 2>&1 && echo true) || $IP_CHECK_CMD -4 icanhazip.com 2> /dev/null)
+	IPV6_CHECK=$( (ping -6 -c 1 -W "$FACTS_TIMEOUT" ipv6.google.com >/dev/null 2>&1 && echo true) || $IP_CHECK_CMD -6 icanhazip.com 2> /dev/null)
+	# an offline result is not cached, the next run checks again
+	[[ -n "$IPV4_CHECK" || -n "$IPV6_CHECK" ]]
+}
+
 # test if the host has IPv4/IPv6 connectivity
-[[ -n $LOCAL_CURL ]] && IP_CHECK_CMD="curl -s -m 4" || IP_CHECK_CMD="wget -qO- -T 4"
-IPV4_CHECK=$( (ping -4 -c 1 -W 4 ipv4.google.com >/dev/null 2>&1 && echo true) || $IP_CHECK_CMD -4 icanhazip.com 2> /dev/null)
-IPV6_CHECK=$( (ping -6 -c 1 -W 4 ipv6.google.com >/dev/null 2>&1 && echo true) || $IP_CHECK_CMD -6 icanhazip.com 2> /dev/null)
+CONNECTIVITY_FACTS=(IPV4_CHECK IPV6_CHECK)
+facts_load connectivity "$FACTS_TTL_CONNECTIVITY" "${CONNECTIVITY_FACTS[@]}"
+case $? in
+	1) facts_refresh connectivity collect_connectivity "${CONNECTIVITY_FACTS[@]}" ;;
+	2) collect_connectivity && facts_save connectivity "${CONNECTIVITY_FACTS[@]}" ;;
+esac
 if [[ -z "$IPV4_CHECK" && -z "$IPV6_CHECK" ]]; then
 	echo -e
 	echo -e "Warning: Both IPv4 AND IPv6 connectivity were not detected. Check for DNS issues..."
@@ -232,82 +323,122 @@ echo -e "Basic System Information:"
 echo -e "---------------------------------"
 UPTIME=$(uptime | awk -F'( |,|:)+' '{d=h=m=0; if ($7=="min") m=$6; else {if ($7~/^day/) {d=$6;h=$8;m=$9} else {h=$6;m=$7}}} {print d+0,"days,",h+0,"hours,",m+0,"minutes"}')
 echo -e "Uptime     : $UPTIME"
-# check for local lscpu installs
-if command -v lscpu >/dev/null 2>&1; then
-  LOCAL_LSCPU=true
-else
-  unset LOCAL_LSCPU
-fi
-if [[ $ARCH = *aarch64* || $ARCH = *arm* ]] && [[ -n $LOCAL_LSCPU ]]; then
-	CPU_PROC=$(lscpu | grep "Model name" | sed 's/Model name: *//g')
-else
-	CPU_PROC=$(awk -F: '/model name/ {name=$2} END {print name}' /proc/cpuinfo | sed 's/^[ \t]*//;s/[ \t]*$//')
+
+# collect_hardware
+# Purpose: Gather the CPU model, core count and frequency, AES-NI/virt status, RAM, swap and
+#          disk sizes, distro, kernel and virtualization type of the host
+# Parameters:
+#          - (none)
+function collect_hardware {
+	# check for local lscpu installs
+	if command -v lscpu >/dev/null 2>&1; then
+		LOCAL_LSCPU=true
+	else
+		unset LOCAL_LSCPU
+	fi
+	if [[ $ARCH = *aarch64* || $ARCH = *arm* ]] && [[ -n $LOCAL_LSCPU ]]; then
+		CPU_PROC=$(lscpu | grep "Model name" | sed 's/Model name: *//g')
+	else
+		CPU_PROC=$(awk -F: '/model name/ {name=$2} END {print name}' /proc/cpuinfo | sed 's/^[ \t]*//;s/[ \t]*$//')
+	fi
+	if [[ $ARCH = *aarch64* || $ARCH = *arm* ]] && [[ -n $LOCAL_LSCPU ]]; then
+		CPU_CORES=$(lscpu | grep "^[[:blank:]]*CPU(s):" | sed 's/CPU(s): *//g')
+		CPU_FREQ=$(lscpu | grep "CPU max MHz" | sed 's/CPU max MHz: *//g')
+		[[ -z "$CPU_FREQ" ]] && CPU_FREQ="???"
+		CPU_FREQ="${CPU_FREQ} MHz"
+	else
+		CPU_CORES=$(awk -F: '/model name/ {core++} END {print core}' /proc/cpuinfo)
+		CPU_FREQ=$(awk -F: ' /cpu MHz/ {freq=$2} END {print freq " MHz"}' /proc/cpuinfo | sed 's/^[ \t]*//;s/[ \t]*$//')
+	fi
+	CPU_AES=$(grep aes /proc/cpuinfo)
+	[[ -z "$CPU_AES" ]] && CPU_AES="\xE2\x9D\x8C Disabled" || CPU_AES="\xE2\x9C\x94 Enabled"
+	CPU_VIRT=$(grep 'vmx\|svm' /proc/cpuinfo)
+	[[ -z "$CPU_VIRT" ]] && CPU_VIRT="\xE2\x9D\x8C Disabled" || CPU_VIRT="\xE2\x9C\x94 Enabled"
+	TOTAL_RAM_RAW=$(free | awk 'NR==2 {print $2}')
+	TOTAL_SWAP_RAW=$(free | grep Swap | awk '{ print $2 }')
+	# total disk size is calculated by adding all partitions of the types listed below (after the -t flags)
+	TOTAL_DISK_RAW=$(df -t simfs -t ext2 -t ext3 -t ext4 -t btrfs -t xfs -t vfat -t exfat -t ntfs -t swap --total 2>/dev/null | grep total | awk '{ print $2 }')
+	DISTRO=$(grep 'PRETTY_NAME' /etc/os-release | cut -d '"' -f 2 )
+	KERNEL=$(uname -r)
+	VIRT=$(systemd-detect-virt 2>/dev/null)
+	VIRT=${VIRT^^} || VIRT="UNKNOWN"
+}
+
+HARDWARE_FACTS=(CPU_PROC CPU_CORES CPU_FREQ CPU_AES CPU_VIRT TOTAL_RAM_RAW TOTAL_SWAP_RAW TOTAL_DISK_RAW DISTRO KERNEL VIRT)
+if ! facts_load hardware "$FACTS_TTL_HARDWARE" "${HARDWARE_FACTS[@]}"; then
+	collect_hardware
+	facts_save hardware "${HARDWARE_FACTS[@]}"
 fi
+TOTAL_RAM=$(format_size "$TOTAL_RAM_RAW")
+TOTAL_SWAP=$(format_size "$TOTAL_SWAP_RAW")
+TOTAL_DISK=$(format_size "$TOTAL_DISK_RAW")
+
 echo -e "Processor  : $CPU_PROC"
-if [[ $ARCH = *aarch64* || $ARCH = *arm* ]] && [[ -n $LOCAL_LSCPU ]]; then
-	CPU_CORES=$(lscpu | grep "^[[:blank:]]*CPU(s):" | sed 's/CPU(s): *//g')
-	CPU_FREQ=$(lscpu | grep "CPU max MHz" | sed 's/CPU max MHz: *//g')
-	[[ -z "$CPU_FREQ" ]] && CPU_FREQ="???"
-	CPU_FREQ="${CPU_FREQ} MHz"
-else
-	CPU_CORES=$(awk -F: '/model name/ {core++} END {print core}' /proc/cpuinfo)
-	CPU_FREQ=$(awk -F: ' /cpu MHz/ {freq=$2} END {print freq " MHz"}' /proc/cpuinfo | sed 's/^[ \t]*//;s/[ \t]*$//')
-fi
 echo -e "CPU cores  : $CPU_CORES @ $CPU_FREQ"
-CPU_AES=$(grep aes /proc/cpuinfo)
-[[ -z "$CPU_AES" ]] && CPU_AES="\xE2\x9D\x8C Disabled" || CPU_AES="\xE2\x9C\x94 Enabled"
 echo -e "AES-NI     : $CPU_AES"
-CPU_VIRT=$(grep 'vmx\|svm' /proc/cpuinfo)
-[[ -z "$CPU_VIRT" ]] && CPU_VIRT="\xE2\x9D\x8C Disabled" || CPU_VIRT="\xE2\x9C\x94 Enabled"
 echo -e "VM-x/AMD-V : $CPU_VIRT"
-TOTAL_RAM_RAW=$(free | awk 'NR==2 {print $2}')
-TOTAL_RAM=$(format_size "$TOTAL_RAM_RAW")
 echo -e "RAM        : $TOTAL_RAM"
-TOTAL_SWAP_RAW=$(free | grep Swap | awk '{ print $2 }')
-TOTAL_SWAP=$(format_size "$TOTAL_SWAP_RAW")
 echo -e "Swap       : $TOTAL_SWAP"
-# total disk size is calculated by adding all partitions of the types listed below (after the -t flags)
-TOTAL_DISK_RAW=$(df -t simfs -t ext2 -t ext3 -t ext4 -t btrfs -t xfs -t vfat -t exfat -t ntfs -t swap --total 2>/dev/null | grep total | awk '{ print $2 }')
-TOTAL_DISK=$(format_size "$TOTAL_DISK_RAW")
 echo -e "Disk       : $TOTAL_DISK"
-DISTRO=$(grep 'PRETTY_NAME' /etc/os-release | cut -d '"' -f 2 )
 echo -e "Distro     : $DISTRO"
-KERNEL=$(uname -r)
 echo -e "Kernel     : $KERNEL"
-VIRT=$(systemd-detect-virt 2>/dev/null)
-VIRT=${VIRT^^} || VIRT="UNKNOWN"
 echo -e "VM Type    : $VIRT"
 [[ -z "$IPV4_CHECK" ]] && ONLINE="\xE2\x9D\x8C Offline / " || ONLINE="\xE2\x9C\x94 Online / "
 [[ -z "$IPV6_CHECK" ]] && ONLINE+="\xE2\x9D\x8C Offline" || ONLINE+="\xE2\x9C\x94 Online"
 echo -e "IPv4/IPv6  : $ONLINE"
 
-# Function to get information from IP Address using ip-api.com free API
-function ip_info() {
+# ip_lookup
+# Purpose: Get information from IP Address using ip-api.com free API
+# Parameters:
+#          - (none)
+# Returns:
+#          1 if the lookup failed (NET_* variables are left unchanged)
+function ip_lookup {
 	# check for curl vs wget
-	[[ -n $LOCAL_CURL ]] && DL_CMD="curl -s" || DL_CMD="wget -qO-"
+	[[ -n $LOCAL_CURL ]] && DL_CMD="curl -s -m $FACTS_TIMEOUT" || DL_CMD="wget -qO- -T $FACTS_TIMEOUT -t 1"
 
 	# declare local vars
-	local ip6me_resp net_type net_ip response country region region_code city isp org as
+	local ip6me_resp net_ip response
  
 	ip6me_resp="$($DL_CMD http://ip6.me/api/)"
-	net_type="$(echo "$ip6me_resp" | cut -d, -f1)"
 	net_ip="$(echo "$ip6me_resp" | cut -d, -f2)"
 
 	response=$($DL_CMD http://ip-api.com/json/"$net_ip")
 
 	# if no response, skip output
 	if [[ -z $response ]]; then
+		return 1
+	fi
+
+	NET_TYPE="$(echo "$ip6me_resp" | cut -d, -f1)"
+	NET_COUNTRY=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^country/ {print $2}' | head -1 | sed 's/^"\(.*\)"$/\1/')
+	NET_REGION=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^regionName/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
+	NET_REGION_CODE=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^region/ {print $2}' | head -1 | sed 's/^"\(.*\)"$/\1/')
+	NET_CITY=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^city/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
+	NET_ISP=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^isp/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
+	NET_ORG=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^org/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
+	NET_AS=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^as/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
+}
+
+# Function to print the network information of the host (from the facts cache when available)
+function ip_info() {
+	local NETWORK_FACTS=(NET_TYPE NET_COUNTRY NET_REGION NET_REGION_CODE NET_CITY NET_ISP NET_ORG NET_AS)
+	unset "${NETWORK_FACTS[@]}"
+
+	facts_load network "$FACTS_TTL_NETWORK" "${NETWORK_FACTS[@]}"
+	case $? in
+		1) facts_refresh network ip_lookup "${NETWORK_FACTS[@]}" ;;
+		2) ip_lookup && facts_save network "${NETWORK_FACTS[@]}" ;;
+	esac
+
+	# if no response, skip output
+	if [[ -z $NET_TYPE ]]; then
 		return
 	fi
 
-	country=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^country/ {print $2}' | head -1 | sed 's/^"\(.*\)"$/\1/')
-	region=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^regionName/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
-	region_code=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^region/ {print $2}' | head -1 | sed 's/^"\(.*\)"$/\1/')
-	city=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^city/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
-	isp=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^isp/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
-	org=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^org/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
-	as=$(echo "$response" | sed -e 's/[{}]/''/g' | awk -v RS=',"' -F: '/^as/ {print $2}' | sed 's/^"\(.*\)"$/\1/')
-	
+	local net_type=$NET_TYPE country=$NET_COUNTRY region=$NET_REGION region_code=$NET_REGION_CODE
+	local city=$NET_CITY isp=$NET_ISP org=$NET_ORG as=$NET_AS
+
 	echo
 	echo "$net_type Network Information:"
 	echo "---------------------------------"
@@ -347,7 +478,9 @@ if [[ -n $JSON ]]; then
 fi
 
 if [ -z $SKIP_NET ]; then
+	trace_begin "yabs.ip_info" "setup"
 	ip_info
+	trace_end
 fi
 
 # create a directory in the same location that the script is being run to temporarily store YABS-related files
@@ -376,6 +509,88 @@ function catch_abort() {
 	exit 0
 }
 
+# optional caching and checkpointing (e.g. performance_test_suite.sh, which sets both):
+#   YABS_CACHE_DIR      - downloaded binaries, Geekbench tarballs and the fio test file are kept
+#                         here across runs; downloads are verified against the SHA-256 recorded
+#                         when they were stored and fetched again if they no longer match
+#   YABS_CHECKPOINT_DIR - each completed fio block size, iperf location and Geekbench run is
+#                         saved here, so a re-run after an interruption only runs what is missing
+
+# sha256_of
+# Purpose: Print the SHA-256 checksum of a file
+# Parameters:
+#          1. FILE - the file to checksum
+function sha256_of {
+	if command -v sha256sum >/dev/null 2>&1; then
+		sha256sum "$1" | awk '{ print $1 }'
+	else
+		shasum -a 256 "$1" | awk '{ print $1 }'
+	fi
+}
+
+# cache_fetch
+# Purpose: Make sure a verified copy of a download exists in $YABS_CACHE_DIR, downloading it when
+#          it is missing or its checksum no longer matches. Sets CACHED_FILE to its path.
+# Parameters:
+#          1. URL - the file to download
+# Returns:
+#          0 if CACHED_FILE is usable, 1 if the download failed
+function cache_fetch {
+	CACHED_FILE="$YABS_CACHE_DIR/downloads/$(basename "$1")"
+	if [[ -f "$CACHED_FILE" && -f "$CACHED_FILE.sha256" && "$(sha256_of "$CACHED_FILE")" == "$(cat "$CACHED_FILE.sha256")" ]]; then
+		return 0
+	fi
+
+	mkdir -p "$YABS_CACHE_DIR/downloads"
+	rm -f "$CACHED_FILE" "$CACHED_FILE.sha256"
+	if [[ -n $LOCAL_CURL ]]; then
+		curl -sf --connect-timeout 5 --retry 5 --retry-delay 0 "$1" -o "$CACHED_FILE.part"
+	else
+		wget -q -T 5 -t 5 -w 0 "$1" -O "$CACHED_FILE.part"
+	fi
+	if [[ $? -ne 0 || ! -s "$CACHED_FILE.part" ]]; then
+		rm -f "$CACHED_FILE.part"
+		return 1
+	fi
+	# rename last so an interrupted download is never mistaken for a complete one
+	sha256_of "$CACHED_FILE.part" > "$CACHED_FILE.sha256"
+	mv "$CACHED_FILE.part" "$CACHED_FILE"
+}
+
+# download_binary
+# Purpose: Download a helper binary (fio, iperf3), through $YABS_CACHE_DIR when it is set
+# Parameters:
+#          1. URL - the binary to download
+#          2. DEST - where to place it
+function download_binary {
+	if [[ -n $YABS_CACHE_DIR ]]; then
+		cache_fetch "$1" && cp "$CACHED_FILE" "$2"
+	elif [[ -n $LOCAL_CURL ]]; then
+		curl -s --connect-timeout 5 --retry 5 --retry-delay 0 "$1" -o "$2"
+	else
+		wget -q -T 5 -t 5 -w 0 "$1" -O "$2"
+	fi
+}
+
+# checkpoint_save
+# Purpose: Atomically record the result of a completed test in $YABS_CHECKPOINT_DIR (no-op if unset)
+# Parameters:
+#          1. NAME - checkpoint name
+#          2. CONTENT - result lines to store
+function checkpoint_save {
+	[[ -z $YABS_CHECKPOINT_DIR ]] && return 0
+	mkdir -p "$YABS_CHECKPOINT_DIR"
+	echo -e "$2" > "$YABS_CHECKPOINT_DIR/$1.tmp" && mv "$YABS_CHECKPOINT_DIR/$1.tmp" "$YABS_CHECKPOINT_DIR/$1"
+}
+
+# checkpoint_exists
+# Purpose: Check whether a test result was checkpointed by an earlier (interrupted) run
+# Parameters:
+#          1. NAME - checkpoint name
+function checkpoint_exists {
+	[[ -n $YABS_CHECKPOINT_DIR && -s "$YABS_CHECKPOINT_DIR/$1" ]]
+}
+
 # format_speed
 # Purpose: This method is a convenience function to format the output of the fio disk tests which
 #          always returns a result in KB/s. If result is >= 1 GB/s, use GB/s. If result is < 1 GB/s
@@ -455,24 +670,58 @@ function disk_test {
 		FIO_SIZE=2G
 	fi
 
-	# run a quick test to generate the fio test file to be used by the actual tests
-	echo -en "Generating fio test file..."
-	$FIO_CMD --name=setup --ioengine=libaio --rw=read --bs=64k --iodepth=64 --numjobs=2 --size=$FIO_SIZE --runtime=1 --gtod_reduce=1 --filename="$DISK_PATH/test.fio" --direct=1 --minimal &> /dev/null
-	echo -en "\r\033[0K"
-
 	# get array of block sizes to evaluate
 	BLOCK_SIZES=("$@")
 
+	# keep the fio test file in the cache when it is on the partition under test, so it is only
+	# generated once; the .ready marker is written after generation finished
+	FIO_FILE="$DISK_PATH/test.fio"
+	if [[ -n $YABS_CACHE_DIR ]] && mkdir -p "$YABS_CACHE_DIR/fio" && \
+		[[ "$(df -P "$YABS_CACHE_DIR/fio" | awk 'NR==2{print $1}')" == "$(df -P "$DISK_PATH" | awk 'NR==2{print $1}')" ]]; then
+		FIO_FILE="$YABS_CACHE_DIR/fio/test_$FIO_SIZE.fio"
+	fi
+
+	FIO_PENDING=0
+	for BS in "${BLOCK_SIZES[@]}"; do
+		checkpoint_exists "fio_${FIO_SIZE}_$BS" || FIO_PENDING=1
+	done
+
+	if [[ $FIO_PENDING -eq 0 ]]; then
+		: # every block size was checkpointed, no test file needed
+	elif [[ -f "$FIO_FILE.ready" && -f "$FIO_FILE" ]]; then
+		echo -en "Using cached fio test file..."
+	else
+		# run a quick test to generate the fio test file to be used by the actual tests
+		echo -en "Generating fio test file..."
+		rm -f "$FIO_FILE.ready"
+		trace_begin "yabs.fio_prepare" "setup"
+		$FIO_CMD --name=setup --ioengine=libaio --rw=read --bs=64k --iodepth=64 --numjobs=2 --size=$FIO_SIZE --runtime=1 --gtod_reduce=1 --filename="$FIO_FILE" --direct=1 --minimal &> /dev/null \
+			&& [[ "$FIO_FILE" != "$DISK_PATH/test.fio" ]] && touch "$FIO_FILE.ready"
+		trace_end
+	fi
+	echo -en "\r\033[0K"
+
 	for BS in "${BLOCK_SIZES[@]}"; do
-		# run rand read/write mixed fio test with block size = $BS
-		echo -en "Running fio random mixed R+W disk test with $BS block size..."
-		DISK_TEST=$(timeout 35 "$FIO_CMD" --name=rand_rw_"$BS" --ioengine=libaio --rw=randrw --rwmixread=50 --bs="$BS" --iodepth=64 --numjobs=2 --size="$FIO_SIZE" --runtime=30 --gtod_reduce=1 --direct=1 --filename="$DISK_PATH/test.fio" --group_reporting --minimal 2> /dev/null | grep rand_rw_"$BS")
-		DISK_IOPS_R=$(echo "$DISK_TEST" | awk -F';' '{print $8}')
-		DISK_IOPS_W=$(echo "$DISK_TEST" | awk -F';' '{print $49}')
-		DISK_IOPS=$(awk -v a="$DISK_IOPS_R" -v b="$DISK_IOPS_W" 'BEGIN { print a + b }')
-		DISK_TEST_R=$(echo "$DISK_TEST" | awk -F';' '{print $7}')
-		DISK_TEST_W=$(echo "$DISK_TEST" | awk -F';' '{print $48}')
-		DISK_TEST=$(awk -v a="$DISK_TEST_R" -v b="$DISK_TEST_W" 'BEGIN { print a + b }')
+		if checkpoint_exists "fio_${FIO_SIZE}_$BS"; then
+			# result saved by an earlier, interrupted run
+			trace_begin "yabs.fio_parse" "parse"
+			read -r DISK_TEST DISK_TEST_R DISK_TEST_W DISK_IOPS DISK_IOPS_R DISK_IOPS_W < "$YABS_CHECKPOINT_DIR/fio_${FIO_SIZE}_$BS"
+		else
+			# run rand read/write mixed fio test with block size = $BS
+			echo -en "Running fio random mixed R+W disk test with $BS block size..."
+			trace_begin "yabs.fio_$BS" "measure"
+			DISK_TEST=$(timeout 35 "$FIO_CMD" --name=rand_rw_"$BS" --ioengine=libaio --rw=randrw --rwmixread=50 --bs="$BS" --iodepth=64 --numjobs=2 --size="$FIO_SIZE" --runtime=30 --gtod_reduce=1 --direct=1 --filename="$FIO_FILE" --group_reporting --minimal 2> /dev/null | grep rand_rw_"$BS")
+			trace_end
+			trace_begin "yabs.fio_parse" "parse"
+			DISK_IOPS_R=$(echo "$DISK_TEST" | awk -F';' '{print $8}')
+			DISK_IOPS_W=$(echo "$DISK_TEST" | awk -F';' '{print $49}')
+			DISK_IOPS=$(awk -v a="$DISK_IOPS_R" -v b="$DISK_IOPS_W" 'BEGIN { print a + b }')
+			DISK_TEST_R=$(echo "$DISK_TEST" | awk -F';' '{print $7}')
+			DISK_TEST_W=$(echo "$DISK_TEST" | awk -F';' '{print $48}')
+			DISK_TEST=$(awk -v a="$DISK_TEST_R" -v b="$DISK_TEST_W" 'BEGIN { print a + b }')
+			[[ -n "$DISK_TEST_R" && -n "$DISK_TEST_W" ]] && checkpoint_save "fio_${FIO_SIZE}_$BS" \
+				"$DISK_TEST $DISK_TEST_R $DISK_TEST_W $DISK_IOPS $DISK_IOPS_R $DISK_IOPS_W"
+		fi
 		DISK_RESULTS_RAW+=( "$DISK_TEST" "$DISK_TEST_R" "$DISK_TEST_W" "$DISK_IOPS" "$DISK_IOPS_R" "$DISK_IOPS_W" )
 
 		DISK_IOPS=$(format_iops "$DISK_IOPS")
@@ -483,6 +732,7 @@ function disk_test {
 		DISK_TEST_W=$(format_speed "$DISK_TEST_W")
 
 		DISK_RESULTS+=( "$DISK_TEST" "$DISK_TEST_R" "$DISK_TEST_W" "$DISK_IOPS" "$DISK_IOPS_R" "$DISK_IOPS_W" )
+		trace_end
 		echo -en "\r\033[0K"
 	done
 }
@@ -632,15 +882,12 @@ fi
 	DISK_PATH=$YABS_PATH/disk
 	mkdir -p "$DISK_PATH"
 
+	trace_begin "yabs.fio_download" "setup"
 	if [[ -z "$PREFER_BIN" && -n "$LOCAL_FIO" ]]; then # local fio has been detected, use instead of pre-compiled binary
 		FIO_CMD=fio
 	else
 		# download fio binary
-		if [[ -n $LOCAL_CURL ]]; then
-			curl -s --connect-timeout 5 --retry 5 --retry-delay 0 https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/fio/fio_$ARCH -o "$DISK_PATH/fio"
-		else
-			wget -q -T 5 -t 5 -w 0 https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/fio/fio_$ARCH -O "$DISK_PATH/fio"
-		fi
+		download_binary https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/fio/fio_$ARCH "$DISK_PATH/fio"
 
 		if [ ! -f "$DISK_PATH/fio" ]; then # ensure fio binary download successfully
 			echo -en "\r\033[0K"
@@ -651,6 +898,7 @@ fi
 			FIO_CMD=$DISK_PATH/fio
 		fi
 	fi
+	trace_end
 
 	if [ -z "$DD_FALLBACK" ]; then # if not falling back on dd tests, run fio test
 		echo -en "\r\033[0K"
@@ -669,7 +917,9 @@ fi
 			echo -e "fio disk speed tests failed. Run manually to determine cause.\nRunning dd test as fallback..."
 		fi
 
+		trace_begin "yabs.dd" "measure"
 		dd_test
+		trace_end
 
 		# format the speed averages by converting to GB/s if > 1000 MB/s
 		if [ "$(echo "$DISK_WRITE_TEST_AVG" | cut -d "." -f 1)" -ge 1000 ]; then
@@ -822,8 +1072,17 @@ function launch_iperf {
 	for (( i = 0; i < IPERF_LOCS_NUM; i++ )); do
 		# test if the current iperf location supports the network mode being tested (IPv4/IPv6)
 		if [[ "${IPERF_LOCS[i*5+4]}" == *"$MODE"* ]]; then
-			# call the iperf_test function passing the required parameters
-			iperf_test "${IPERF_LOCS[i*5]}" "${IPERF_LOCS[i*5+1]}" "${IPERF_LOCS[i*5+2]}" "$IPERF_FLAGS"
+			IPERF_CHECKPOINT="iperf_${MODE}_$(echo "${IPERF_LOCS[i*5]}" | tr -c 'a-zA-Z0-9.\n' '_')"
+			if checkpoint_exists "$IPERF_CHECKPOINT"; then
+				# result saved by an earlier, interrupted run
+				{ read -r IPERF_SENDRESULT; read -r IPERF_RECVRESULT; read -r LATENCY_RESULT; } < "$YABS_CHECKPOINT_DIR/$IPERF_CHECKPOINT"
+			else
+				# call the iperf_test function passing the required parameters
+				iperf_test "${IPERF_LOCS[i*5]}" "${IPERF_LOCS[i*5+1]}" "${IPERF_LOCS[i*5+2]}" "$IPERF_FLAGS"
+				# busy servers are retried on the next run
+				[[ -n $IPERF_SENDRESULT && -n $IPERF_RECVRESULT ]] && \
+					checkpoint_save "$IPERF_CHECKPOINT" "$IPERF_SENDRESULT\n$IPERF_RECVRESULT\n$LATENCY_RESULT"
+			fi
 			# parse the send and receive speed results
 			IPERF_SENDRESULT_VAL=$(echo "$IPERF_SENDRESULT" | awk '{ print $6 }')
 			IPERF_SENDRESULT_UNIT=$(echo "$IPERF_SENDRESULT" | awk '{ print $7 }')
@@ -846,6 +1105,7 @@ function launch_iperf {
 # if the skip iperf flag was set, skip the network performance test, otherwise test network performance
 if [ -z "$SKIP_IPERF" ]; then
 
+	trace_begin "yabs.iperf_download" "setup"
 	if [[ -z "$PREFER_BIN" && -n "$LOCAL_IPERF" ]]; then # local iperf has been detected, use instead of pre-compiled binary
 		IPERF_CMD=iperf3
 	else
@@ -854,11 +1114,7 @@ if [ -z "$SKIP_IPERF" ]; then
 		mkdir -p "$IPERF_PATH"
 
 		# download iperf3 binary
-		if [[ -n $LOCAL_CURL ]]; then
-			curl -s --connect-timeout 5 --retry 5 --retry-delay 0 https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/iperf/iperf3_$ARCH -o "$IPERF_PATH/iperf3"
-		else
-			wget -q -T 5 -t 5 -w 0 https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/iperf/iperf3_$ARCH -O "$IPERF_PATH/iperf3"
-		fi
+		download_binary https://raw.githubusercontent.com/masonr/yet-another-bench-script/master/bin/iperf/iperf3_$ARCH "$IPERF_PATH/iperf3"
 
 		if [ ! -f "$IPERF_PATH/iperf3" ]; then # ensure iperf3 binary downloaded successfully
 			IPERF_DL_FAIL=True
@@ -867,6 +1123,7 @@ if [ -z "$SKIP_IPERF" ]; then
 			IPERF_CMD=$IPERF_PATH/iperf3
 		fi
 	fi
+	trace_end
 	
 	# array containing all currently available iperf3 public servers to use for the network test
 	# format: "1" "2" "3" "4" "5" \
@@ -903,10 +1160,12 @@ if [ -z "$SKIP_IPERF" ]; then
 	
 	if [ -z "$IPERF_DL_FAIL" ]; then
 		[[ -n $JSON ]] && JSON_RESULT+=',"iperf":['
+		trace_begin "yabs.iperf" "measure"
 		# check if the host has IPv4 connectivity, if so, run iperf3 IPv4 tests
 		[ -n "$IPV4_CHECK" ] && launch_iperf "IPv4"
 		# check if the host has IPv6 connectivity, if so, run iperf3 IPv6 tests
 		[ -n "$IPV6_CHECK" ] && launch_iperf "IPv6"
+		trace_end
 		[[ -n $JSON ]] && JSON_RESULT=${JSON_RESULT::${#JSON_RESULT}-1} && JSON_RESULT+=']'
 	else
 		echo -e "\niperf3 binary download failed. Skipping iperf network tests..."
@@ -957,12 +1216,20 @@ function launch_geekbench {
 		fi
 	fi
 
-	if [[ $GB_RUN == *True* ]]; then # run GB test
+	GB_DONE=""
+	if [[ $GB_RUN == *True* ]] && checkpoint_exists "geekbench_$VERSION"; then
+		# scores saved by an earlier, interrupted run
+		{ read -r GEEKBENCH_SCORES_SINGLE; read -r GEEKBENCH_SCORES_MULTI; read -r GEEKBENCH_URL; } < "$YABS_CHECKPOINT_DIR/geekbench_$VERSION"
+		GB_DONE=True
+	elif [[ $GB_RUN == *True* ]]; then # run GB test
 		echo -en "\nRunning GB$VERSION benchmark test... *cue elevator music*"
 
 		# check for local geekbench installed
 		if command -v "$GB_CMD" &>/dev/null; then
 			GEEKBENCH_PATH=$(dirname "$(command -v "$GB_CMD")")
+		elif [[ -n $YABS_CACHE_DIR ]]; then
+			# extract the cached (or freshly downloaded) Geekbench tarball to geekbench temp directory
+			cache_fetch "$GB_URL" && tar xzf "$CACHED_FILE" --strip-components=1 -C "$GEEKBENCH_PATH" &>/dev/null
 		else
 			# download the desired Geekbench tarball and extract to geekbench temp directory
 			$DL_CMD $GB_URL | tar xz --strip-components=1 -C "$GEEKBENCH_PATH" &>/dev/null
@@ -1003,40 +1270,51 @@ function launch_geekbench {
 			GEEKBENCH_SCORES_SINGLE=$(echo "$GEEKBENCH_SCORES" | awk -v FS="(>|<)" '{ print $3 }' | head -n 1)
 			GEEKBENCH_SCORES_MULTI=$(echo "$GEEKBENCH_SCORES" | awk -v FS="(>|<)" '{ print $3 }' | tail -n 1)
 		
-			# print the Geekbench results
-			echo -en "\r\033[0K"
-			echo -e "Geekbench $VERSION Benchmark Test:"
-			echo -e "---------------------------------"
-			printf "%-15s | %-30s\n" "Test" "Value"
-			printf "%-15s | %-30s\n" "" ""
-			printf "%-15s | %-30s\n" "Single Core" "$GEEKBENCH_SCORES_SINGLE"
-			printf "%-15s | %-30s\n" "Multi Core" "$GEEKBENCH_SCORES_MULTI"
-			printf "%-15s | %-30s\n" "Full Test" "$GEEKBENCH_URL"
-
-			if [[ -n $JSON ]]; then
-				JSON_RESULT+='{"version":'$VERSION',"single":'$GEEKBENCH_SCORES_SINGLE',"multi":'$GEEKBENCH_SCORES_MULTI
-				JSON_RESULT+=',"url":"'$GEEKBENCH_URL'"},'
-			fi
+			[[ -n "$GEEKBENCH_SCORES_SINGLE" ]] && checkpoint_save "geekbench_$VERSION" "$GEEKBENCH_SCORES_SINGLE\n$GEEKBENCH_SCORES_MULTI\n$GEEKBENCH_URL"
+			GB_DONE=True
 
 			# write the geekbench claim URL to a file so the user can add the results to their profile (if desired)
 			[ -n "$GEEKBENCH_URL_CLAIM" ] && echo -e "$GEEKBENCH_URL_CLAIM" >> geekbench_claim.url 2> /dev/null
 		fi
 	fi
+
+	if [[ -n $GB_DONE ]]; then
+		# print the Geekbench results
+		echo -en "\r\033[0K"
+		echo -e "Geekbench $VERSION Benchmark Test:"
+		echo -e "---------------------------------"
+		printf "%-15s | %-30s\n" "Test" "Value"
+		printf "%-15s | %-30s\n" "" ""
+		printf "%-15s | %-30s\n" "Single Core" "$GEEKBENCH_SCORES_SINGLE"
+		printf "%-15s | %-30s\n" "Multi Core" "$GEEKBENCH_SCORES_MULTI"
+		printf "%-15s | %-30s\n" "Full Test" "$GEEKBENCH_URL"
+
+		if [[ -n $JSON ]]; then
+			JSON_RESULT+='{"version":'$VERSION',"single":'$GEEKBENCH_SCORES_SINGLE',"multi":'$GEEKBENCH_SCORES_MULTI
+			JSON_RESULT+=',"url":"'$GEEKBENCH_URL'"},'
+		fi
+	fi
 }
 
 # if the skip geekbench flag was set, skip the system performance test, otherwise test system performance
 if [ -z "$SKIP_GEEKBENCH" ]; then
 	[[ -n $JSON ]] && JSON_RESULT+=",\"geekbench\":["
 	if [[ $GEEKBENCH_4 == *True* ]]; then
+		trace_begin "yabs.geekbench_4" "measure"
 		launch_geekbench 4
+		trace_end
 	fi
 
 	if [[ $GEEKBENCH_5 == *True* ]]; then
+		trace_begin "yabs.geekbench_5" "measure"
 		launch_geekbench 5
+		trace_end
 	fi
 
 	if [[ $GEEKBENCH_6 == *True* ]]; then
+		trace_begin "yabs.geekbench_6" "measure"
 		launch_geekbench 6
+		trace_end
 	fi
 	[[ -n $JSON ]] && [[ "${JSON_RESULT: -1}" == ',' ]] && JSON_RESULT="${JSON_RESULT%,}"
 	[[ -n $JSON ]] && JSON_RESULT+="]"
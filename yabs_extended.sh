@@ -11,6 +11,12 @@ if [ -f "$SCRIPT_DIR/lib/common_functions.sh" ]; then
     source "$SCRIPT_DIR/lib/common_functions.sh"
 fi
 
+# Span tracing comes from common functions; no-ops without them
+if ! declare -F trace_begin > /dev/null; then
+    trace_begin() { :; }
+    trace_end() { :; }
+fi
+
 # Colors
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -26,6 +32,9 @@ RUN_TRACE=true
 RUN_NETINFO=true
 TEST_PHASE="test"
 YABS_ARGS=""
+# Host facts and downloads cache shared with performance_test_suite.sh; an
+# empty YABS_CACHE_DIR (as exported by the suite's --no-cache) disables it
+export YABS_CACHE_DIR="${YABS_CACHE_DIR-$SCRIPT_DIR/results/.cache}"
 
 # Parse arguments
 while getopts 'hYNDTIp:y:' flag; do
@@ -165,7 +174,9 @@ if [ "$RUN_YABS" = true ]; then
         # Check if yabs.sh exists
         if [ -f "./yabs.sh" ]; then
             # Run YABS and capture output
+            trace_begin "yabs_extended.yabs"
             ./yabs.sh $YABS_ARGS 2>&1 | tee "$RESULTS_DIR/yabs_output.txt"
+            trace_end
             echo ""
             echo -e "${GREEN}✓ YABS tests completed${NC}"
         else